@@ -0,0 +1,347 @@
+"""Build/snap/matrix pipeline benchmarks. Each public stage -- ``Network(...)``,
+``simplify_network``, ``cost_matrix``, ``Observations``, ``obs2obs_cost_matrix``
+and ``calc_net_stats`` -- is benchmarked on small synthetic lattice and (tiled)
+sine networks, on generated (perturbed grid) networks of about 10^2 to 10^5
+segments, and on the Leon County, FL TIGER/Line edges in ``test_data`` when
+they are available. All node pairs do not fit in memory for the largest
+networks, so the generated networks use a cutoff (sparse) cost matrix.
+
+Runs with ``asv`` (``time_*`` and ``peakmem_*``) or standalone, in which case
+every stage is profiled with ``utils.BuildProfile`` (wall time, CPU time and
+peak traced memory), scaling exponents are fit against the input size, and
+the results are written as JSON for comparing runs::
+
+    python benchmarks/bench_pipeline.py --output pipeline.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import sys
+import warnings
+
+import geopandas
+import numpy
+import pandas
+import shapely
+from shapely import affinity
+
+import tigernet
+from tigernet import utils
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "test_data")
+
+# input sizes -- lattice lines per axis, sine tiles per axis, and generated
+# intersections per axis (about 2 * size ** 2 segments)
+SIZES = {
+    "lattice": [3, 6, 12],
+    "sine": [1, 2, 4],
+    "generated": [8, 25, 80, 250],
+    "leon": [None],
+}
+
+# network distance cutoff of the (sparse) cost matrix by dataset -- datasets
+# not listed calculate all node pairs
+CUTOFFS = {"generated": 5.0}
+
+# upper bound on the number of (random) observations snapped to a network
+MAX_OBS = 500
+
+
+def _lattice_segments(n_lines):
+    """A lattice with an outer bounding box and ``n_lines`` lines per axis."""
+    kws = {"n_hori_lines": n_lines, "n_vert_lines": n_lines, "wbox": True}
+    lattice = tigernet.generate_lattice(bounds=[0, 0, 100, 100], **kws)
+    return lattice, {}
+
+
+def _sine_segments(n_tiles):
+    """``n_tiles`` x ``n_tiles`` disjoint copies of the sine network."""
+    sine = tigernet.generate_sine_lines()
+    tiles = []
+    for i in range(n_tiles):
+        for j in range(n_tiles):
+            tile = sine.copy()
+            tile["geometry"] = tile.geometry.apply(
+                affinity.translate, xoff=16.0 * i, yoff=12.0 * j
+            )
+            tiles.append(tile)
+    sines = geopandas.GeoDataFrame(pandas.concat(tiles, ignore_index=True))
+    sines["SegID"] = sines.index
+    return sines, {}
+
+
+def _generated_segments(size):
+    """A perturbed grid of ``size`` x ``size`` intersections with cul-de-sacs."""
+    kws = {"kind": "perturbed", "size": size, "culdesacs": 0.1, "seed": 0}
+    return tigernet.generate_network(**kws), {}
+
+
+def _leon_segments(size=None):
+    """Road segments of the Leon County, FL TIGER/Line edges."""
+    path = os.path.join(DATA_DIR, "Edges_Leon_FL_2010.zip")
+    if not os.path.exists(path):
+        raise NotImplementedError("The Leon County, FL edges are not available.")
+    gdf = tigernet.testing_data("Edges_Leon_FL_2010", direc=DATA_DIR)
+    roads = gdf[gdf["MTFCC"].str.startswith("S")].copy()
+    kws = {"from_raw": True, "attr1": "MTFCC", "attr2": "TLID", "calc_len": True}
+    kws.update({"skip_restr": True, "mtfcc_split": "S1100", "mtfcc_intrst": "S1100"})
+    kws.update({"mtfcc_split_grp": "FULLNAME", "mtfcc_ramp": "S1630"})
+    kws.update({"mtfcc_split_by": ["S1630", "S1640"], "mtfcc_serv": "S1640"})
+    kws.update({"record_components": True, "largest_component": True})
+    return roads, kws
+
+
+DATASETS = {
+    "lattice": _lattice_segments,
+    "sine": _sine_segments,
+    "generated": _generated_segments,
+    "leon": _leon_segments,
+}
+
+
+def _observations(graph):
+    """Random observations near the network, reproducible by seed."""
+    n_obs = min(graph.n_segm, MAX_OBS)
+    obs = tigernet.generate_obs(n_obs, graph.s_data, seed=0)
+    obs["obs_id"] = numpy.arange(n_obs)
+    return obs
+
+
+def run_pipeline(segments, kws, stage, cutoff=None):
+    """Run every stage of the pipeline, each within ``stage(name)``.
+
+    Parameters
+    ----------
+    segments : geopandas.GeoDataFrame
+        Network line segments.
+    kws : dict
+        Additional ``Network`` keyword arguments.
+    stage : callable
+        Returns a context manager given a stage name, e.g. ``BuildProfile.stage``.
+    cutoff : float
+        Calculate a sparse cost matrix of the node pairs within this network
+        distance. Default is ``None``, which calculates all node pairs.
+
+    Returns
+    -------
+    objs : dict
+        The network, simplified graph, and observations keyed by name.
+
+    """
+
+    with stage("Network"):
+        network = tigernet.Network(segments.copy(), record_geom=True, **kws)
+    with stage("simplify_network"):
+        graph = network.simplify_network(record_geom=True)
+    with stage("cost_matrix"):
+        graph.cost_matrix(cutoff=cutoff, sparse=cutoff is not None)
+    obs = _observations(graph)
+    with stage("Observations"):
+        kws = {"df_name": "obs", "df_key": "obs_id"}
+        net_obs = tigernet.Observations(graph, obs, **kws)
+    with stage("obs2obs_cost_matrix"):
+        tigernet.obs2obs_cost_matrix(net_obs, graph)
+    with stage("calc_net_stats"), warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        graph.calc_net_stats()
+
+    objs = {"network": network, "graph": graph, "net_obs": net_obs}
+
+    return objs
+
+
+def _unprofiled(name):
+    """Stand-in for a profiled stage."""
+    return contextlib.nullcontext()
+
+
+class _PipelineStages:
+    """Time the pipeline stages (from the outputs of the preceding stages)."""
+
+    def _setup(self, dataset, size):
+        self.segments, self.kws = DATASETS[dataset](size)
+        self.cutoff = CUTOFFS.get(dataset)
+        objs = run_pipeline(self.segments, self.kws, _unprofiled, self.cutoff)
+        self.network, self.graph = objs["network"], objs["graph"]
+        self.net_obs = objs["net_obs"]
+        self.obs = _observations(self.graph)
+
+    def time_network(self, *args):
+        tigernet.Network(self.segments.copy(), record_geom=True, **self.kws)
+
+    def time_simplify_network(self, *args):
+        self.network.simplify_network(record_geom=True)
+
+    def time_cost_matrix(self, *args):
+        kws = {"cutoff": self.cutoff, "sparse": self.cutoff is not None}
+        self.graph.cost_matrix(asattr=False, **kws)
+
+    def time_observations(self, *args):
+        kws = {"df_name": "obs", "df_key": "obs_id"}
+        tigernet.Observations(self.graph, self.obs, **kws)
+
+    def time_obs2obs_cost_matrix(self, *args):
+        tigernet.obs2obs_cost_matrix(self.net_obs, self.graph)
+
+    def time_calc_net_stats(self, *args):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            self.graph.calc_net_stats()
+
+    def peakmem_pipeline(self, *args):
+        run_pipeline(self.segments, self.kws, _unprofiled, self.cutoff)
+
+
+class SyntheticPipeline(_PipelineStages):
+    """Pipeline stages on synthetic networks of increasing size."""
+
+    params = (["lattice", "sine"], [0, 1, 2])
+    param_names = ["dataset", "size"]
+    timeout = 600
+
+    def setup(self, dataset, size):
+        self._setup(dataset, SIZES[dataset][size])
+
+
+class GeneratedPipeline(_PipelineStages):
+    """Pipeline stages on generated networks of about 10^2 to 10^5 segments."""
+
+    params = [0, 1, 2, 3]
+    param_names = ["size"]
+    timeout = 14400
+
+    def setup(self, size):
+        self._setup("generated", SIZES["generated"][size])
+
+
+class LeonPipeline(_PipelineStages):
+    """Pipeline stages on the Leon County, FL TIGER/Line edges."""
+
+    timeout = 3600
+
+    def setup(self):
+        self._setup("leon", None)
+
+
+def profile_pipeline(dataset, size):
+    """Profile every pipeline stage for one dataset and size.
+
+    Returns
+    -------
+    records : list
+        Stage records (see ``utils.BuildProfile``) extended with the
+        ``dataset``, ``size`` and the element counts of the input segments,
+        the simplified network and the observations.
+
+    """
+
+    segments, kws = DATASETS[dataset](size)
+    profiler = utils.BuildProfile()
+    objs = run_pipeline(segments, kws, profiler.stage, CUTOFFS.get(dataset))
+
+    counts = {
+        "dataset": dataset,
+        "size": size,
+        "n_input": segments.shape[0],
+        "n_segm": objs["graph"].n_segm,
+        "n_node": objs["graph"].n_node,
+        "n_obs": objs["net_obs"].snapped_points.shape[0],
+    }
+    records = [dict(record, **counts) for record in profiler.records]
+
+    return records
+
+
+def scaling_exponents(records):
+    """Fit ``metric ~ n_input ** exponent`` for every dataset and stage.
+
+    Parameters
+    ----------
+    records : list
+        Stage records from ``profile_pipeline()``.
+
+    Returns
+    -------
+    exponents : list
+        Records of the wall time, CPU time and peak memory exponents of each
+        dataset and stage profiled at two or more sizes.
+
+    """
+
+    frame = pandas.DataFrame(records)
+    exponents = []
+    for (dataset, stage), group in frame.groupby(["dataset", "stage"], sort=False):
+        if group["n_input"].nunique() < 2:
+            continue
+        log_n = numpy.log(group["n_input"].astype(float))
+        exponent = {"dataset": dataset, "stage": stage}
+        for metric in ["wall_time", "cpu_time", "peak_memory"]:
+            values = numpy.log(numpy.maximum(group[metric].astype(float), 1e-9))
+            exponent["%s_exponent" % metric] = numpy.polyfit(log_n, values, 1)[0]
+        exponents.append(exponent)
+
+    return exponents
+
+
+def _metadata():
+    """Software and platform versions of a run."""
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "platform": platform.platform(),
+        "python": sys.version.split()[0],
+        "tigernet": tigernet.__version__,
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "geopandas": geopandas.__version__,
+        "shapely": shapely.__version__,
+    }
+
+
+def _jsonable(value):
+    """Convert numpy scalars for ``json``."""
+    if isinstance(value, numpy.generic):
+        return value.item()
+    raise TypeError("%r is not JSON serializable" % value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", help="JSON results file.", default=None)
+    parser.add_argument(
+        "--datasets", nargs="+", default=list(SIZES), choices=list(SIZES)
+    )
+    args = parser.parse_args(argv)
+
+    records = []
+    for dataset in args.datasets:
+        for size in SIZES[dataset]:
+            try:
+                records += profile_pipeline(dataset, size)
+            except NotImplementedError as e:
+                print("skipping %s: %s" % (dataset, e))
+                break
+
+    results = {
+        "metadata": _metadata(),
+        "records": records,
+        "scaling": scaling_exponents(records) if records else [],
+    }
+
+    cols = ["dataset", "size", "n_input", "stage", "wall_time", "peak_memory"]
+    print(pandas.DataFrame(records, columns=cols).to_string(index=False))
+    print(pandas.DataFrame(results["scaling"]).to_string(index=False))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=1, default=_jsonable)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
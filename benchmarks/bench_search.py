@@ -0,0 +1,69 @@
+"""Point-to-point search benchmarks. Besides timing, the number of nodes
+settled by each search method is tracked, which is the hardware independent
+measure of how well goal-directed (A*/ALT) searches prune the network.
+
+Runs with ``asv`` or standalone (``python benchmarks/bench_search.py``).
+"""
+
+import numpy
+
+import tigernet
+from tigernet import utils
+
+
+def _lattice_network(n_lines, seed=0, drop=0.2):
+    """A lattice network with a fraction of its segments removed so that
+    shortest paths have to detour around the gaps.
+    """
+    kws = {"n_hori_lines": n_lines, "n_vert_lines": n_lines, "wbox": True}
+    lattice = tigernet.generate_lattice(bounds=[0, 0, 100, 100], **kws)
+    keep = numpy.random.RandomState(seed).uniform(size=lattice.shape[0]) > drop
+    lattice = lattice[keep].reset_index(drop=True)
+    kws = {"record_components": True, "largest_component": True}
+    network = tigernet.Network(lattice, **kws)
+    return network
+
+
+class SettledNodes:
+    """Mean number of settled nodes (and time) per point-to-point query."""
+
+    params = ([10, 30], ["dijkstra", "bidirectional", "astar", "alt"])
+    param_names = ["n_lines", "method"]
+    n_queries = 50
+
+    def setup(self, n_lines, method):
+        self.network = _lattice_network(n_lines)
+        self.network.build_landmarks(n=8, n_jobs=1)
+        self.adj = utils.adjacency(self.network)
+        nodes = numpy.asarray(self.network.n_ids)
+        rng = numpy.random.RandomState(1)
+        self.pairs = rng.choice(nodes, size=(self.n_queries, 2))
+
+    def _query(self, method, source, target):
+        seeds, goals = [(source, 0.0, None)], [(target, 0.0, None)]
+        if method == "bidirectional":
+            return utils.bidirectional_dijkstra(self.adj, seeds, goals)
+        kws = {"heuristic": method != "dijkstra"}
+        if method == "alt":
+            kws["landmarks"] = self.network.landmark_dists
+        return utils.astar(self.adj, self.network.node2coords, seeds, goals, **kws)
+
+    def track_settled_nodes(self, n_lines, method):
+        settled = [self._query(method, s, t)[-1] for s, t in self.pairs]
+        return float(numpy.mean(settled))
+
+    track_settled_nodes.unit = "nodes"
+
+    def time_queries(self, n_lines, method):
+        for s, t in self.pairs:
+            self._query(method, s, t)
+
+
+if __name__ == "__main__":
+    bench = SettledNodes()
+    print("%8s %14s %14s" % ("n_lines", "method", "settled/query"))
+    for n_lines in SettledNodes.params[0]:
+        for method in SettledNodes.params[1]:
+            bench.setup(n_lines, method)
+            settled = bench.track_settled_nodes(n_lines, method)
+            print("%8s %14s %14.1f" % (n_lines, method, settled))
@@ -3,9 +3,10 @@
 """
 
 from .tigernet import Network, Observations, obs2obs_cost_matrix
+from .tigernet import nearest_destinations, write_cost_blocks
 
 from .generate_data import testing_data, generate_lattice
-from .generate_data import generate_sine_lines, generate_obs
+from .generate_data import generate_sine_lines, generate_obs, generate_network
 
 from .info import get_mtfcc_types, get_discard_mtfcc_by_desc, get_discard_segms
 
@@ -3,8 +3,12 @@
 
 import geopandas
 import numpy
+import pandas
+from scipy.spatial import Delaunay, Voronoi
 from shapely.geometry import Point, LineString
 
+from . import utils
+
 
 __author__ = "James D. Gaboardi <jgaboardi@gmail.com>"
 
@@ -318,7 +322,269 @@ def _get_lat_lines(hspace, vspace, withbox, bounds, hori=True):
     return lines
 
 
-def generate_obs(npts, s_df, near_net=None, restrict=None, seed=0):
+def generate_network(
+    kind="perturbed",
+    size=10,
+    bounds=None,
+    perturb=0.25,
+    n_components=1,
+    culdesacs=0.0,
+    mtfcc_mix=None,
+    sid_name="SegID",
+    mtfcc="MTFCC",
+    seed=0,
+):
+    """Generate a (large) synthetic road network for stress testing. All
+    coordinates are calculated with vectorised ``numpy`` operations and
+    are deterministic given ``seed``.
+
+    Parameters
+    ----------
+    kind : str
+        Either ``'lattice'`` for a regular grid, ``'perturbed'`` for a grid
+        with randomly displaced intersections, ``'delaunay'`` for the Delaunay
+        triangulation of random points, or ``'voronoi'`` for the (clipped)
+        Voronoi ridges of random points. Default is ``'perturbed'``.
+    size : int
+        Intersections per axis for lattices, while the triangulations use
+        ``size ** 2`` random points. Default is ``10``.
+    bounds : list
+        Area bounds of each component in the form of ``[x1,y1,x2,y2]``.
+        Default is ``None``, which spaces intersections one unit apart.
+    perturb : float
+        Maximum displacement of ``'perturbed'`` intersections as a fraction
+        of the grid spacing. Values below ``0.5`` keep the network planar.
+        Default is ``0.25``.
+    n_components : int
+        Number of disconnected copies (each randomised separately)
+        laid out side by side. Default is ``1``.
+    culdesacs : float
+        Fraction of intersections with a cul-de-sac -- a spur ending in a
+        ring road -- attached. Default is ``0.0``.
+    mtfcc_mix : dict
+        Feature class codes and their proportions in the form
+        ``{mtfcc_label: proportion}``, which are randomly assigned to the
+        segments. Default is ``None``, which labels all segments ``'S1400'``.
+    sid_name : str
+        Segment column name. Default is ``'SegID'``.
+    mtfcc : str
+        MTFCC dataframe column name. Default is ``'MTFCC'``.
+    seed : int
+        The random seed. Default is ``0``.
+
+    Returns
+    -------
+    net_arcs : geopandas.GeoDataFrame
+        The segments comprising the synthetic network.
+
+    Examples
+    --------
+
+    >>> import tigernet
+    >>> arcs = tigernet.generate_network(kind="lattice", size=3)
+    >>> arcs.shape[0]
+    12
+
+    """
+
+    valid_kinds = ["lattice", "perturbed", "delaunay", "voronoi"]
+    if kind not in valid_kinds:
+        msg = "The 'kind' parameter is set to '%s'. " % kind
+        msg += "Valid values are: %s." % valid_kinds
+        raise ValueError(msg)
+
+    if not bounds:
+        bounds = [0.0, 0.0, float(size - 1), float(size - 1)]
+    x1, y1, x2, y2 = bounds
+    width = x2 - x1
+
+    rng = numpy.random.RandomState(seed)
+
+    lines, rings = [], []
+    for component in range(n_components):
+        if kind in ["lattice", "perturbed"]:
+            nodes, edges = _grid_edges(
+                size, bounds, perturb * (kind == "perturbed"), rng
+            )
+        else:
+            nodes, edges = _random_planar_edges(size**2, bounds, kind, rng)
+
+        # lay out components side by side with a gap
+        nodes[:, 0] += component * width * 1.25
+        segms = geopandas.GeoSeries(utils._linestrings(nodes[edges]))
+        lines.append(segms)
+
+        if culdesacs:
+            rings.append(_culdesacs(nodes, edges, segms, culdesacs, rng))
+
+    if rings:
+        spurs = numpy.concatenate([spur for spur, ring in rings])
+        loops = numpy.concatenate([ring for spur, ring in rings])
+        lines += [geopandas.GeoSeries(utils._linestrings(spurs))]
+        lines += [geopandas.GeoSeries(utils._linestrings(loops))]
+
+    geoms = pandas.concat(lines, ignore_index=True)
+    net_arcs = geopandas.GeoDataFrame(geometry=geoms)
+    net_arcs[sid_name] = net_arcs.index
+
+    if not mtfcc_mix:
+        mtfcc_mix = {"S1400": 1.0}
+    labels = list(mtfcc_mix.keys())
+    probs = numpy.array(list(mtfcc_mix.values()), dtype=float)
+    choice = rng.choice(len(labels), size=net_arcs.shape[0], p=probs / probs.sum())
+    net_arcs[mtfcc] = numpy.array(labels, dtype=object)[choice]
+
+    return net_arcs
+
+
+def _grid_edges(size, bounds, perturb, rng):
+    """Intersections and edges of a (perturbed) ``size`` x ``size`` grid.
+
+    Returns
+    -------
+    nodes : numpy.ndarray
+        Intersection coordinates in the form ``[[x, y], ...]``.
+    edges : numpy.ndarray
+        Pairs of node indices.
+
+    """
+
+    x1, y1, x2, y2 = bounds
+    xs, ys = numpy.linspace(x1, x2, size), numpy.linspace(y1, y2, size)
+    gx, gy = numpy.meshgrid(xs, ys, indexing="ij")
+    nodes = numpy.column_stack([gx.ravel(), gy.ravel()])
+    if perturb:
+        spacing = numpy.array([(x2 - x1), (y2 - y1)]) / (size - 1)
+        nodes += rng.uniform(-perturb, perturb, size=nodes.shape) * spacing
+
+    idx = numpy.arange(size * size).reshape(size, size)
+    horis = numpy.column_stack([idx[:-1, :].ravel(), idx[1:, :].ravel()])
+    verts = numpy.column_stack([idx[:, :-1].ravel(), idx[:, 1:].ravel()])
+    edges = numpy.concatenate([verts, horis])
+
+    return nodes, edges
+
+
+def _random_planar_edges(npts, bounds, kind, rng):
+    """Intersections and edges of a random planar network derived from
+    the Delaunay triangulation or Voronoi diagram of ``npts`` random points.
+
+    Returns
+    -------
+    nodes : numpy.ndarray
+        Intersection coordinates in the form ``[[x, y], ...]``.
+    edges : numpy.ndarray
+        Pairs of node indices.
+
+    """
+
+    x1, y1, x2, y2 = bounds
+    points = rng.uniform([x1, y1], [x2, y2], size=(npts, 2))
+
+    if kind == "delaunay":
+        simplices = Delaunay(points).simplices
+        edges = numpy.concatenate(
+            [simplices[:, [0, 1]], simplices[:, [1, 2]], simplices[:, [0, 2]]]
+        )
+        nodes = points
+    else:
+        vor = Voronoi(points)
+        edges = numpy.array(vor.ridge_vertices)
+        edges = edges[(edges >= 0).all(axis=1)]
+
+        # drop ridges reaching outside of the bounds
+        nodes = vor.vertices
+        inside = (nodes >= [x1, y1]).all(axis=1) & (nodes <= [x2, y2]).all(axis=1)
+        edges = edges[inside[edges].all(axis=1)]
+
+    # unique undirected edges
+    edges = numpy.unique(numpy.sort(edges, axis=1), axis=0)
+
+    # drop unused nodes and renumber
+    used, edges = numpy.unique(edges, return_inverse=True)
+    nodes, edges = nodes[used].copy(), edges.reshape(-1, 2)
+
+    return nodes, edges
+
+
+def _culdesacs(nodes, edges, segms, fraction, rng, n_vertices=8):
+    """Cul-de-sacs (a spur and a ring of two segments) attached to a random subset
+    of nodes, pointing into the widest gap between the incident edges.
+
+    Returns
+    -------
+    spurs : numpy.ndarray
+        Spur coordinates in the form ``[[[x1, y1], [x2, y2]], ...]``.
+    rings : numpy.ndarray
+        Ring halves, both running from the spur end to the far side of the ring.
+
+    """
+
+    n_nodes = nodes.shape[0]
+    picked = rng.choice(n_nodes, size=int(round(fraction * n_nodes)), replace=False)
+
+    # incident edge directions of every node, sorted by angle within each node
+    src = numpy.concatenate([edges[:, 0], edges[:, 1]])
+    dst = numpy.concatenate([edges[:, 1], edges[:, 0]])
+    vec = nodes[dst] - nodes[src]
+    angles, lengths = numpy.arctan2(vec[:, 1], vec[:, 0]), numpy.hypot(*vec.T)
+    order = numpy.lexsort((angles, src))
+    src, angles, lengths = src[order], angles[order], lengths[order]
+
+    # angular gap to the next edge (wrapping around to the first edge)
+    first = numpy.r_[True, src[1:] != src[:-1]]
+    group_start = numpy.maximum.accumulate(
+        numpy.where(first, numpy.arange(src.size), 0)
+    )
+    last = numpy.r_[src[1:] != src[:-1], True]
+    nxt = numpy.where(last, group_start, numpy.arange(src.size) + 1)
+    gaps = numpy.where(last, 2 * numpy.pi, 0.0) + angles[nxt] - angles
+
+    # spurs bisect the widest gap and scale with the shortest incident edge
+    widest = numpy.zeros(n_nodes, dtype=int)
+    by_gap = numpy.lexsort((gaps, src))
+    widest[src[by_gap]] = by_gap
+    shortest = numpy.full(n_nodes, numpy.inf)
+    numpy.minimum.at(shortest, src, lengths)
+    angle = angles[widest[picked]] + gaps[widest[picked]] / 2.0
+    scale = shortest[picked] / 4.0
+
+    direction = numpy.column_stack([numpy.cos(angle), numpy.sin(angle)])
+    ends = nodes[picked] + direction * scale[:, None]
+    spurs = numpy.stack([nodes[picked], ends], axis=1)
+
+    # rings are regular polygons beyond the spur end, closed on the spur end
+    radius = scale[:, None] / 3.0
+    centers = ends + direction * radius
+    theta = angle[:, None] + numpy.pi + numpy.linspace(0, 2 * numpy.pi, n_vertices + 1)
+    rings = numpy.stack(
+        [
+            centers[:, 0:1] + radius * numpy.cos(theta),
+            centers[:, 1:2] + radius * numpy.sin(theta),
+        ],
+        axis=2,
+    )
+    rings[:, 0], rings[:, -1] = ends, ends
+
+    # drop cul-de-sacs crossing segments not incident to their node or each other
+    paths = geopandas.GeoSeries(
+        utils._linestrings(numpy.concatenate([spurs[:, :1], rings], 1))
+    )
+    i, j = segms.sindex.query_bulk(paths, predicate="intersects")
+    crossing = i[(edges[j] != picked[i, None]).all(axis=1)]
+    i, j = paths.sindex.query_bulk(paths, predicate="intersects")
+    crossing = numpy.union1d(crossing, i[i != j])
+    keep = numpy.setdiff1d(numpy.arange(picked.shape[0]), crossing)
+    spurs, rings = spurs[keep], rings[keep]
+
+    # split into two halves since segments need two distinct endpoints
+    half = n_vertices // 2
+    rings = numpy.concatenate([rings[:, : half + 1], rings[:, half:][:, ::-1]])
+
+    return spurs, rings
+
+
+def generate_obs(npts, s_df, near_net=None, restrict=None, seed=0, along_network=False):
     """Generate random point observations.
 
     Parameters
@@ -334,6 +600,10 @@ def generate_obs(npts, s_df, near_net=None, restrict=None, seed=0):
         Do not generate points along these MTFCC types. Default is ``None``.
     seed : int
         The random seed for point generation. Default is ``0``
+    along_network : bool
+        Generate points directly on the network segments, choosing segments
+        with a probability proportional to their length and locations
+        uniformly along them. ``near_net`` is ignored. Default is ``False``.
 
     Returns
     -------
@@ -349,29 +619,44 @@ def generate_obs(npts, s_df, near_net=None, restrict=None, seed=0):
     numpy.random.seed(seed)
     nru = numpy.random.uniform
 
-    # declare anonymous function for point generation
-    rand_pt = lambda xy: Point(nru(minx, maxx), nru(miny, maxy))
+    # declare anonymous function for (a batch of) point generation, drawing
+    # x and y alternately as single points would
+    rand_xy = lambda n: nru([minx, miny], [maxx, maxy], size=(n, 2))
+
+    if (near_net or along_network) and restrict:
+        # remove restricted segments from consideration
+        segms = s_df[~s_df[restrict[0]].isin(restrict[1])].copy()
+    else:
+        segms = s_df.copy()
+
+    # generate points along the network segments -- no rejection needed
+    if along_network:
+        lengths = segms.length.values
+        choice = numpy.random.choice(lengths.shape[0], npts, p=lengths / lengths.sum())
+        position = nru(size=npts) * lengths[choice]
+        rand_pts = segms.geometry.iloc[choice].reset_index(drop=True)
+        rand_pts = list(rand_pts.interpolate(position))
 
     # generate point within a specified proximity to the network
-    if near_net:
-        if restrict:
-            # remove restricted segments from consideration
-            segms = s_df[~s_df[restrict[0]].isin(restrict[1])].copy()
-        else:
-            segms = s_df.copy()
-        # union of network line segments buffer
-        in_space = segms.buffer(near_net).unary_union
-        # intersection checker
-        intersector = lambda pt: pt.intersects(in_space)
-        rand_pts = []
-        while len(rand_pts) != npts:
-            point = rand_pt(0)
-            if intersector(point):
-                rand_pts.append(point)
+    elif near_net:
+        # network line segments buffers (as a spatial index)
+        in_space = geopandas.GeoSeries(segms.buffer(near_net).values)
+        # rejection sample in batches sized by the acceptance rate so far,
+        # keeping accepted points in the order they were drawn
+        xys, n_drawn, n_accepted = [], 0, 0
+        while n_accepted < npts:
+            rate = max(n_accepted / n_drawn, 0.01) if n_drawn else 0.5
+            batch = min(int((npts - n_accepted) / rate * 1.25) + 1, 2**20)
+            xy = rand_xy(batch)
+            candidates = geopandas.GeoSeries(geopandas.points_from_xy(*xy.T))
+            hits = in_space.sindex.query_bulk(candidates, predicate="intersects")
+            xys.append(xy[numpy.unique(hits[0])])
+            n_drawn, n_accepted = n_drawn + batch, n_accepted + xys[-1].shape[0]
+        rand_pts = list(geopandas.points_from_xy(*numpy.concatenate(xys)[:npts].T))
 
     # generate points with the total segment bounds
     else:
-        rand_pts = [rand_pt(pt) for pt in range(npts)]
+        rand_pts = list(geopandas.points_from_xy(*rand_xy(npts).T))
 
     # instantiate as a GeoDataFrame
     rand_obs = geopandas.GeoDataFrame(geometry=rand_pts)
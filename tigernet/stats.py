@@ -3,7 +3,9 @@
 
 from . import utils
 import numpy
+from scipy.sparse.csgraph import connected_components, dijkstra
 from scipy.spatial import distance_matrix
+from scipy.stats import norm
 
 
 def calc_sinuosity(net):
@@ -131,7 +133,7 @@ def connectivity(net, measure="alpha"):
     return con
 
 
-def entropies(ent_col, frame, n_elems):
+def entropies(ent_col, frame, n_elems, by=None):
     """Entropy.
 
     Levinson D. (2012) Network Structure and City Size.
@@ -144,27 +146,45 @@ def entropies(ent_col, frame, n_elems):
     Parameters
     ----------
 
-    ent_col : str
-        Column on with to calculate entropy.
+    ent_col : {str, list}
+        Column(s) on with to calculate entropy.
     frame : geopandas.GeoDataFrame
         Full network dataframe.
     n_elems : int
         Number of dataframe records.
+    by : str
+        Calculate entropies within each group of this column (e.g. ``'CC'``
+        for connected components), where the proportions are relative to
+        the group size rather than ``n_elems``. Default is ``None``.
 
     Returns
     -------
     indiv_entropies : dict
-        Individual entropies of MTFCC categories.
+        Individual entropies of MTFCC categories. When ``ent_col`` is a
+        ``list`` these are keyed by column, and when ``by`` is set they are
+        further keyed by group in the form ``{group: {category: entropy}}``.
 
     """
 
-    indiv_entropies = {}
+    if not isinstance(ent_col, str):
+        return {col: entropies(col, frame, n_elems, by=by) for col in ent_col}
 
-    for value in frame[ent_col].unique():
-        subset = frame[frame[ent_col] == value].shape[0]
-        subset_proportion = float(subset) / float(n_elems)
-        entropy = subset_proportion * numpy.log2(subset_proportion)
-        indiv_entropies[value] = entropy
+    # category counts for all values (and groups) in a single pass
+    if by:
+        counts = frame.groupby([by, ent_col], sort=False).size()
+        sizes = counts.groupby(level=0, sort=False).transform("sum")
+        proportions = counts / sizes
+    else:
+        proportions = frame[ent_col].value_counts(sort=False) / float(n_elems)
+
+    values = proportions * numpy.log2(proportions)
+
+    if by:
+        indiv_entropies = {}
+        for (group, value), entropy in values.items():
+            indiv_entropies.setdefault(group, {})[value] = entropy
+    else:
+        indiv_entropies = values.to_dict()
 
     return indiv_entropies
 
@@ -174,7 +194,7 @@ def dist_metric(mtx, stat):
 
     Parameters
     ----------
-    mtx : numpy.ndarray
+    mtx : {numpy.ndarray, utils.TriangularMatrix}
         Cost matrix.
     stat : str
         ``'min'`` or ``'max'``. Default is ``'max'``.
@@ -186,12 +206,19 @@ def dist_metric(mtx, stat):
 
     """
 
+    # values of a packed triangular matrix are searched directly
+    packed = isinstance(mtx, utils.TriangularMatrix)
+    values = mtx.data if packed else mtx
+
     if stat == "max":
-        value = mtx.max()
+        value = values.max()
     else:
-        value = mtx[mtx != 0.0].min()
+        value = values[values != 0.0].min()
 
-    idx = tuple(numpy.where(mtx == value))
+    if packed:
+        idx = mtx.where(value)
+    else:
+        idx = tuple(numpy.where(mtx == value))
 
     if len(idx[0]) > 1:
         idx = tuple(idx[0])
@@ -203,22 +230,194 @@ def dist_metric(mtx, stat):
     return idx_val
 
 
-def circuity(net):
-    """Calculate network circuity.
+def eccentricity_radius(mtx):
+    """Get the (eccentricity-based) radius of a network from a cost matrix.
 
     Parameters
     ----------
-    net : tigernet.Network
-    mtx : numpy.ndarray
+    mtx : {numpy.ndarray, utils.TriangularMatrix}
         Cost matrix.
 
+    Returns
+    -------
+    radius : list
+        Radius in the form ``[center_node, value]``, where the radius is the
+        minimum node eccentricity (its maximum shortest path length).
+
     """
 
-    # all network shortest paths
+    ecc = mtx.max(axis=1)
+    center = int(ecc.argmin())
+    radius = [center, ecc[center]]
+
+    return radius
+
+
+def circuity(net, chunksize=None):
+    """Calculate network circuity. The Euclidean node-to-node distances are
+    summed in blocks of rows so the full matrix is never held in memory.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+    chunksize : int
+        Number of rows of the Euclidean distance matrix to compute at once.
+        Default is ``None``, which sizes blocks at roughly one million elements.
+
+    """
+
+    # all network shortest paths (``TriangularMatrix.sum()`` covers both triangles)
     net.d_net = net.n2n_matrix.sum()
-    coords = [v[0] for (k, v) in net.node2coords.items()]
-    n2n_euclidean = distance_matrix(coords, coords)
+    coords = numpy.array([v[0] for (k, v) in net.node2coords.items()])
+    if not chunksize:
+        chunksize = max(1, 2**20 // coords.shape[0])
 
     # all euclidean shortest paths
-    net.d_euc = n2n_euclidean.sum()
+    net.d_euc = 0.0
+    for start in range(0, coords.shape[0], chunksize):
+        block = coords[start : start + chunksize]
+        net.d_euc += distance_matrix(block, coords).sum()
     net.circuity = net.d_net / net.d_euc
+
+
+def sampled_circuity(net, n_sources=100, ci=0.95, seed=0):
+    """Estimate network circuity from the shortest paths of a random subset of
+    source nodes to all other nodes, without a node-to-node cost matrix.
+    The estimate is the ratio of the sampled network and Euclidean sums,
+    with a normal confidence interval from the ratio estimator variance.
+    Unreachable node pairs are excluded from both sums.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+    n_sources : int
+        Number of source nodes to sample. If greater than or equal to the number
+        of nodes all nodes are used and the estimate is exact. Default is ``100``.
+    ci : float
+        Confidence level of the interval. Default is ``0.95``.
+    seed : int
+        The random seed for source selection. Default is ``0``.
+
+    Returns
+    -------
+    estimate : list
+        Circuity in the form ``[value, (lower, upper)]``.
+
+    """
+
+    ids = numpy.asarray(net.n_ids)
+    coords = numpy.array([net.node2coords[n][0] for n in ids])
+    n_sources = min(n_sources, ids.shape[0])
+    sample = numpy.random.RandomState(seed).choice(
+        ids.shape[0], n_sources, replace=False
+    )
+
+    graph = utils.csgraph(net)
+    dists = dijkstra(graph, directed=False, indices=ids[sample])[:, ids]
+    eucs = distance_matrix(coords[sample], coords)
+    reachable = numpy.isfinite(dists)
+    d_net = numpy.where(reachable, dists, 0.0).sum(axis=1)
+    d_euc = numpy.where(reachable, eucs, 0.0).sum(axis=1)
+    value = d_net.sum() / d_euc.sum()
+
+    # ratio estimator variance with a finite population correction
+    if n_sources > 1:
+        fpc = 1.0 - n_sources / ids.shape[0]
+        resid = d_net - value * d_euc
+        var = fpc * resid.var(ddof=1) / (n_sources * d_euc.mean() ** 2)
+        half = norm.ppf(0.5 + ci / 2.0) * numpy.sqrt(var)
+    else:
+        half = numpy.inf
+
+    estimate = [value, (value - half, value + half)]
+
+    return estimate
+
+
+def bounding_diameter(net, tol=1e-9):
+    """Exact network diameter and (eccentricity-based) radius from a handful
+    of single source searches with the BoundingDiameters algorithm, which
+    alternately searches from the nodes with the highest upper and lowest
+    lower eccentricity bounds, tightening the bounds of all other nodes,
+    until both the diameter and radius bounds meet. Disconnected networks
+    are evaluated on their largest connected component.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+    tol : float
+        Relative tolerance for the bounds to meet. Default is ``1e-9``.
+
+    Returns
+    -------
+    diameter : list
+        Diameter in the form ``[(node1, node2), value]``.
+    radius : list
+        Radius in the form ``[center_node, value]``, where the radius is the
+        minimum node eccentricity (its maximum shortest path length).
+    n_searches : int
+        The number of single source searches performed.
+
+    Notes
+    -----
+    Takes, F. W., & Kosters, W. A. (2011). Determining the diameter of small
+                world networks. In Proceedings of the 20th ACM international
+                conference on Information and knowledge management (pp. 1191-1196).
+
+    """
+
+    graph = utils.csgraph(net)
+
+    # restrict to the largest connected component
+    ids = numpy.asarray(net.n_ids)
+    _, labels = connected_components(graph, directed=False)
+    comp_labels = labels[ids]
+    largest = numpy.bincount(comp_labels).argmax()
+    nodes = ids[comp_labels == largest]
+
+    ecc_lower = numpy.zeros(nodes.shape[0])
+    ecc_upper = numpy.full(nodes.shape[0], numpy.inf)
+    candidates = numpy.ones(nodes.shape[0], dtype=bool)
+    diam_lower, diam_upper, diam_pair = 0.0, numpy.inf, (nodes[0], nodes[0])
+    rad_lower, rad_upper, center = 0.0, numpy.inf, nodes[0]
+
+    n_searches, high = 0, True
+    while candidates.any():
+
+        # alternate between the highest upper and lowest lower bounds
+        pool = numpy.nonzero(candidates)[0]
+        if high:
+            pos = pool[ecc_upper[pool].argmax()]
+        else:
+            pos = pool[ecc_lower[pool].argmin()]
+        high = not high
+
+        dist = dijkstra(graph, directed=False, indices=nodes[pos])[nodes]
+        n_searches += 1
+        ecc = dist.max()
+
+        if ecc > diam_lower:
+            diam_lower, diam_pair = ecc, (nodes[pos], nodes[dist.argmax()])
+        if ecc < rad_upper:
+            rad_upper, center = ecc, nodes[pos]
+
+        # tighten the eccentricity bounds of all nodes
+        ecc_lower = numpy.maximum(ecc_lower, numpy.maximum(ecc - dist, dist))
+        ecc_upper = numpy.minimum(ecc_upper, ecc + dist)
+        ecc_lower[pos] = ecc_upper[pos] = ecc
+        candidates[pos] = False
+
+        diam_upper = ecc_upper[candidates].max(initial=diam_lower)
+        rad_lower = ecc_lower[candidates].min(initial=rad_upper)
+        eps = tol * max(1.0, diam_upper)
+        if diam_upper - diam_lower <= eps and rad_upper - rad_lower <= eps:
+            break
+
+        # discard nodes that cannot affect either the diameter or the radius
+        irrelevant = (ecc_upper <= diam_lower + eps) & (ecc_lower >= rad_upper - eps)
+        candidates &= ~irrelevant
+
+    diameter = [tuple(int(n) for n in diam_pair), diam_lower]
+    radius = [int(center), rad_upper]
+
+    return diameter, radius, n_searches
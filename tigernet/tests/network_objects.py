@@ -17,6 +17,7 @@ import tigernet
 #       - test_errors.TestObservationsErrors
 #       - test_errors.TestUtilsErrors
 #       - test_errors.TestStatsErrors
+#       - test_utils.TestUtilArrayLookup
 h1v1 = {"n_hori_lines": 1, "n_vert_lines": 1}
 lattice = tigernet.generate_lattice(**h1v1)
 network_lattice_1x1_no_args = tigernet.Network(lattice)
@@ -60,6 +61,7 @@ network_lattice_2x1x1_largest = tigernet.Network(lattice, **kws)
 #       - test_tigernet_synthetic.TestNetworkAssociationsLattice1x1
 #       - test_tigernet_synthetic.TestNetworkDefineGraphElementsLattice1x1
 #       - test_kdtree.TestKDTreeLattice1x1
+#       - test_kdtree.TestSpatialIndexCacheLattice1x1
 #       - test_errors.TestObservationsErrors
 #       - test_observations_synthetic.TestSyntheticObservationsSegmentRandomLattice1x1
 #       - test_observations_synthetic.TestSyntheticObservationsNodeRandomLattice1x1
@@ -84,11 +86,26 @@ _, network_lattice_1x1_wpaths_var = copy.deepcopy(
     network_lattice_1x1_no_args
 ).cost_matrix(wpaths=True, asattr=False)
 
+# --------------------------------------------------------------------------
+# One 1x1 lattice network with a calculated cost matrix (and predecessors)
+#   used in:
+#       - test_cost_matrix.TestNetworkPredecessorsLattice1x1
+network_lattice_1x1_wpreds_attr = copy.deepcopy(network_lattice_1x1_no_args)
+network_lattice_1x1_wpreds_attr.cost_matrix(wpreds=True, path_cache_size=2)
+
+# --------------------------------------------------------------------------
+# One 1x1 lattice network with a packed triangular, single-precision cost matrix
+#   used in:
+#       - test_cost_matrix.TestNetworkTriangularCostMatrixLattice1x1
+network_lattice_1x1_triangular_attr = copy.deepcopy(network_lattice_1x1_no_args)
+network_lattice_1x1_triangular_attr.cost_matrix(dtype="float32", storage="triangular")
+
 # --------------------------------------------------------------------------
 # Copied and simplified inplace barb network
 # (with recorded components, recorded geometry and defined graph elements)
 #   used in:
 #       - test_tigernet_synthetic.TestNetworkSimplifyBarb
+#       - test_tigernet_synthetic.TestNetworkExportBarb
 barb = tigernet.generate_lattice(wbox=True, **h1v1)
 barb = barb[~barb["SegID"].isin([1, 2, 5, 7, 9, 10])]
 kws.update({"record_components": True})
@@ -102,6 +119,7 @@ network_barb.simplify_network(inplace=True, **kws)
 # Copied and simplified inplace barb network with a calculated cost matrix (and paths)
 #   used in:
 #       - test_cost_matrix.TestNetworkCostMatrixSimplifyBarb
+#       - test_cost_matrix.TestNetworkPredecessorsSimplifyBarb
 graph_barb_wcm_copy_attr = copy.deepcopy(graph_barb)
 graph_barb_wcm_copy_attr.cost_matrix()
 graph_barb_wpaths_copy_attr = copy.deepcopy(graph_barb)
@@ -110,6 +128,8 @@ graph_barb_wcm_copy_var = copy.deepcopy(graph_barb).cost_matrix(asattr=False)
 _, graph_barb_wpaths_copy_var = copy.deepcopy(graph_barb).cost_matrix(
     wpaths=True, asattr=False
 )
+graph_barb_wpreds_copy_attr = copy.deepcopy(graph_barb)
+graph_barb_wpreds_copy_attr.cost_matrix(wpreds=True)
 
 network_barb_wcm_inplace_attr = copy.deepcopy(network_barb)
 network_barb_wcm_inplace_attr.cost_matrix()
@@ -127,11 +147,26 @@ _, network_barb_wpaths_inplace_var = copy.deepcopy(network_barb).cost_matrix(
 #       - test_obs2obs_synthetic.TestSyntheticObservationsOrigToXXXXNodes
 #       - test_obs2obs_synthetic.TestSyntheticObservationsOrigToDestSegments
 #       - test_obs2obs_synthetic.TestSyntheticObservationsOrigToDestNodes
+#       - test_search.TestNetworkServiceAreaLattice1x1
 h1v1 = {"n_hori_lines": 1, "n_vert_lines": 1}
 lattice = tigernet.generate_lattice(bounds=[0, 0, 4, 4], **h1v1)
 network_lattice_1x1_small = tigernet.Network(lattice, **kws)
 network_lattice_1x1_small.cost_matrix()
 
+# --------------------------------------------------------------------------
+# One 4x4 lattice network with an outer bounding box and a calculated cost matrix
+#   used in:
+#       - test_search.TestNetworkShortestPathLattice4x4
+#       - test_search.TestNetworkContractionHierarchyLattice4x4
+#       - test_search.TestNetworkLandmarksLattice4x4
+#       - test_cost_matrix.TestNetworkCutoffCostMatrixLattice4x4
+#       - test_stats.TestNetworkBoundingDiameterLattice4x4
+#       - test_stats.TestNetworkCircuityLattice4x4
+h4v4 = {"n_hori_lines": 4, "n_vert_lines": 4, "wbox": True}
+lattice = tigernet.generate_lattice(**h4v4)
+network_lattice_4x4_wbox = tigernet.Network(lattice, **kws)
+network_lattice_4x4_wbox.cost_matrix()
+
 
 ###############################################################################
 ############################### Empirical networks ############################
@@ -211,6 +246,7 @@ network_empirical_simplified.simplify_network(inplace=True, **kws)
 #       - test_cost_matrix.TestNetworkCostMatrixEmpircalGDF
 #       - test_observations_empirical.TestEmpiricalObservationsOrigToXXXXSegments
 #       - test_observations_empirical.TestEmpiricalObservationsOrigToXXXXNodes
+#       - test_search.TestNetworkContractionHierarchyEmpirical
 network_empirical_simplified_wcm = copy.deepcopy(network_empirical_simplified)
 network_empirical_simplified_wcm.cost_matrix(wpaths=True)
 
@@ -0,0 +1,75 @@
+"""Build cache testing.
+"""
+
+import os
+import tempfile
+import unittest
+import numpy
+
+import tigernet
+from .. import utils
+
+
+class TestNetworkCacheLattice1x1(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = self.tmp.name
+        self.h1v1 = {"n_hori_lines": 1, "n_vert_lines": 1}
+        self.kws = {"record_geom": True, "cache_dir": self.cache_dir}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_network_cache_miss_then_hit(self):
+        lattice = tigernet.generate_lattice(**self.h1v1)
+        network_1 = tigernet.Network(lattice.copy(), **self.kws)
+        self.assertFalse(network_1.from_cache)
+
+        network_2 = tigernet.Network(lattice.copy(), **self.kws)
+        self.assertTrue(network_2.from_cache)
+        self.assertEqual(network_2.cache_key, network_1.cache_key)
+        self.assertEqual(network_2.segm2node, network_1.segm2node)
+        self.assertEqual(network_2.node2coords, network_1.node2coords)
+
+    def test_network_cache_param_change(self):
+        lattice = tigernet.generate_lattice(**self.h1v1)
+        network_1 = tigernet.Network(lattice.copy(), **self.kws)
+        network_2 = tigernet.Network(lattice.copy(), def_graph_elems=True, **self.kws)
+        self.assertFalse(network_2.from_cache)
+        self.assertNotEqual(network_2.cache_key, network_1.cache_key)
+
+    def test_network_cache_input_change(self):
+        lattice = tigernet.generate_lattice(**self.h1v1)
+        tigernet.Network(lattice.copy(), **self.kws)
+        lattice = tigernet.generate_lattice(bounds=[0, 0, 4, 4], **self.h1v1)
+        network = tigernet.Network(lattice.copy(), **self.kws)
+        self.assertFalse(network.from_cache)
+
+    def test_network_cache_eviction(self):
+        lattice_1 = tigernet.generate_lattice(**self.h1v1)
+        tigernet.Network(lattice_1.copy(), **self.kws)
+        lattice_2 = tigernet.generate_lattice(bounds=[0, 0, 4, 4], **self.h1v1)
+        network = tigernet.Network(lattice_2.copy(), cache_size=1, **self.kws)
+
+        # only the most recent entry survives
+        known_entries = ["%s.network.pkl" % network.cache_key]
+        observed_entries = os.listdir(self.cache_dir)
+        self.assertEqual(observed_entries, known_entries)
+
+    def test_cost_matrix_cache(self):
+        lattice = tigernet.generate_lattice(**self.h1v1)
+        network = tigernet.Network(lattice.copy(), **self.kws)
+        known_matrix, known_paths = network.cost_matrix(wpaths=True, asattr=False)
+
+        key = utils.hash_network(network) + "-wpathsTrue-wpredsFalse-float64-full"
+        cached = utils.read_cache(self.cache_dir, key, kind="cost_matrix")
+        observed_matrix, observed_paths = cached
+        numpy.testing.assert_array_equal(observed_matrix, known_matrix)
+        self.assertEqual(observed_paths, known_paths)
+
+        observed_matrix = network.cost_matrix(asattr=False)
+        numpy.testing.assert_array_equal(observed_matrix, known_matrix)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,9 @@
 import copy
 import unittest
 import numpy
+import scipy.sparse
 
+from .. import utils
 from .network_objects import network_lattice_1x1_wcm_attr
 from .network_objects import network_lattice_1x1_wpaths_attr
 from .network_objects import network_lattice_1x1_wcm_var
@@ -26,6 +28,12 @@ from .network_objects import network_barb_wpaths_inplace_attr
 from .network_objects import network_barb_wcm_inplace_var
 from .network_objects import network_barb_wpaths_inplace_var
 
+from .network_objects import network_lattice_1x1_wpreds_attr
+from .network_objects import graph_barb_wpreds_copy_attr
+
+from .network_objects import network_lattice_1x1_triangular_attr
+from .network_objects import network_lattice_4x4_wbox
+
 from .network_objects import network_empirical_simplified_wcm
 
 
@@ -477,6 +485,235 @@ class TestNetworkCostMatrixSimplifyBarb(unittest.TestCase):
         self.assertEqual(observed_paths, known_paths)
 
 
+class TestNetworkTriangularCostMatrixLattice1x1(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_1x1_triangular_attr)
+        self.known_mtx = network_lattice_1x1_wcm_attr.n2n_matrix
+
+    def test_network_triangular_storage(self):
+        observed_mtx = self.network.n2n_matrix
+        self.assertIsInstance(observed_mtx, utils.TriangularMatrix)
+        self.assertEqual(observed_mtx.shape, (5, 5))
+        self.assertEqual(observed_mtx.dtype, numpy.float32)
+        self.assertEqual(observed_mtx.data.shape, (15,))
+        numpy.testing.assert_array_almost_equal(observed_mtx.toarray(), self.known_mtx)
+
+    def test_network_triangular_scalar_index(self):
+        for i, j in [(0, 3), (3, 0), (2, 2), (-1, 1)]:
+            self.assertAlmostEqual(self.network.n2n_matrix[i, j], self.known_mtx[i, j])
+
+    def test_network_triangular_fancy_index(self):
+        mtx = self.network.n2n_matrix
+        keys = [
+            (1,),
+            (slice(1, 4), slice(None, None, 2)),
+            ([4, 0, 2], [1, 1, 3]),
+            ([4, 0], slice(2, None)),
+            (slice(None), [3, 0]),
+            (numpy.ix_([2, 0], [4, 1, 3])),
+            (numpy.array([True, False, True, False, False]), 0),
+        ]
+        for key in keys:
+            numpy.testing.assert_array_almost_equal(mtx[key], self.known_mtx[key])
+
+    def test_network_triangular_reductions(self):
+        mtx = self.network.n2n_matrix
+        self.assertAlmostEqual(mtx.sum(), self.known_mtx.sum())
+        self.assertAlmostEqual(mtx.max(), self.known_mtx.max())
+        numpy.testing.assert_array_almost_equal(
+            mtx.max(axis=1), self.known_mtx.max(axis=1)
+        )
+        numpy.testing.assert_array_equal(
+            mtx.where(4.5), numpy.where(self.known_mtx == 4.5)
+        )
+
+    def test_network_triangular_int32_positions(self):
+        # a large matrix without allocating the packed data
+        n = 50000
+        data = numpy.broadcast_to(numpy.zeros(1), (n * (n + 1) // 2,))
+        mtx = utils.TriangularMatrix(n, data=data)
+        observed_axis = mtx._axis(numpy.array([49000, -1], dtype=numpy.int32))
+        self.assertEqual(observed_axis.dtype, numpy.int64)
+        self.assertEqual(observed_axis.tolist(), [49000, 49999])
+        self.assertEqual(mtx._offset(numpy.int32(49000)), 1249524500)
+
+        # e.g. the int32 indices of a scipy.sparse (cutoff) matrix
+        i, j = numpy.array([49000, 3], dtype=numpy.int32), numpy.int32(49999)
+        observed_index = mtx._index(i, j)
+        self.assertEqual(observed_index.tolist(), [1249525499, 199993])
+
+    def test_network_triangular_no_implicit_dense(self):
+        with self.assertRaises(TypeError):
+            numpy.asarray(self.network.n2n_matrix)
+
+    def test_network_triangular_bad_storage(self):
+        with self.assertRaises(ValueError):
+            self.network.cost_matrix(storage="diagonal")
+
+
+class TestNetworkCutoffCostMatrixLattice4x4(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_4x4_wbox)
+        self.known_mtx = network_lattice_4x4_wbox.n2n_matrix
+
+    def test_network_sparse_cutoff(self):
+        observed_mtx = self.network.cost_matrix(cutoff=4.0, sparse=True, asattr=False)
+        self.assertTrue(scipy.sparse.isspmatrix_csr(observed_mtx))
+
+        # only the pairs within the cutoff are stored (with a zero diagonal)
+        within = self.known_mtx <= 4.0
+        self.assertEqual(observed_mtx.nnz, within.sum())
+        numpy.testing.assert_array_equal(observed_mtx.diagonal(), numpy.zeros(36))
+        coo = observed_mtx.tocoo()
+        self.assertTrue(within[coo.row, coo.col].all())
+        known_costs = self.known_mtx[coo.row, coo.col]
+        numpy.testing.assert_array_almost_equal(coo.data, known_costs)
+
+    def test_network_sparse_lookup(self):
+        mtx = self.network.cost_matrix(cutoff=4.0, sparse=True, asattr=False)
+        lookup = utils.SparseCosts(mtx)
+        for i, j in [(0, 0), (0, 1), (0, 35), (20, 7)]:
+            known_cost = self.known_mtx[i, j]
+            if known_cost > 4.0:
+                known_cost = inf
+            self.assertAlmostEqual(lookup[i, j], known_cost)
+
+    def test_network_sparse_no_cutoff(self):
+        observed_mtx = self.network.cost_matrix(sparse=True, asattr=False)
+        self.assertEqual(observed_mtx.nnz, 36 * 36)
+        observed_mtx = observed_mtx.toarray()
+        numpy.testing.assert_array_almost_equal(observed_mtx, self.known_mtx)
+
+    def test_network_dense_cutoff(self):
+        observed_mtx = self.network.cost_matrix(cutoff=4.0, asattr=False)
+        known_mtx = numpy.where(self.known_mtx <= 4.0, self.known_mtx, inf)
+        numpy.testing.assert_array_almost_equal(observed_mtx, known_mtx)
+
+        kws = {"cutoff": 4.0, "storage": "triangular", "asattr": False}
+        observed_mtx = self.network.cost_matrix(**kws).toarray()
+        numpy.testing.assert_array_almost_equal(observed_mtx, known_mtx)
+
+    def test_network_sparse_wpaths(self):
+        with self.assertRaises(ValueError):
+            self.network.cost_matrix(cutoff=4.0, sparse=True, wpaths=True)
+
+    def test_network_sparse_stats_warning(self):
+        self.network.cost_matrix(cutoff=4.0, sparse=True)
+        with self.assertWarns(UserWarning):
+            self.network.calc_net_stats()
+
+
+class TestNetworkPredecessorsLattice1x1(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_1x1_wpreds_attr)
+
+    def test_network_preds_attr(self):
+        known_preds = numpy.array(
+            [
+                [-1, 0, 1, 1, 1],
+                [1, -1, 1, 1, 1],
+                [1, 2, -1, 1, 1],
+                [1, 3, 1, -1, 1],
+                [1, 4, 1, 1, -1],
+            ]
+        )
+        observed_preds = self.network.n2n_preds
+        numpy.testing.assert_array_equal(observed_preds, known_preds)
+        self.assertEqual(observed_preds.dtype, numpy.int32)
+
+    def test_network_path_nodes(self):
+        known_path = [0, 1, 2]
+        observed_path = self.network.path(0, 2)
+        self.assertEqual(observed_path, known_path)
+
+        known_path = [3]
+        observed_path = self.network.path(3, 3)
+        self.assertEqual(observed_path, known_path)
+
+    def test_network_path_segments(self):
+        known_path = [2, 3]
+        observed_path = self.network.path(3, 4, segments=True)
+        self.assertEqual(observed_path, known_path)
+
+    def test_network_path_cache(self):
+        self.network.path(0, 2)
+        self.network.path(0, 3)
+        self.network.path(0, 4)
+        known_keys = [(0, 3, False), (0, 4, False)]
+        observed_keys = list(self.network._path_cache.keys())
+        self.assertEqual(observed_keys, known_keys)
+
+        # cached paths are copies
+        path = self.network.path(0, 4)
+        path.append(99)
+        known_path = [0, 1, 4]
+        observed_path = self.network.path(0, 4)
+        self.assertEqual(observed_path, known_path)
+
+    def test_network_path_matches_tree(self):
+        network = copy.deepcopy(network_lattice_1x1_wpaths_attr)
+        for i in network.n_ids:
+            for j in network.n_ids:
+                self.assertEqual(network.path(i, j), self.network.path(i, j))
+
+    def test_network_preds_and_paths(self):
+        with self.assertRaises(ValueError):
+            self.network.cost_matrix(wpaths=True, wpreds=True)
+
+    def test_network_no_paths(self):
+        network = copy.deepcopy(network_lattice_1x1_wcm_attr)
+        with self.assertRaises(AttributeError):
+            network.path(0, 1)
+
+
+class TestNetworkPredecessorsSimplifyBarb(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(graph_barb_wpreds_copy_attr)
+
+    def test_graph_copy_path_nodes(self):
+        known_path = [2, 1, 0]
+        observed_path = self.network.path(2, 0)
+        self.assertEqual(observed_path, known_path)
+
+    def test_graph_copy_path_segments(self):
+        known_path = [2, 0]
+        observed_path = self.network.path(2, 0, segments=True)
+        self.assertEqual(observed_path, known_path)
+
+
+class TestNetworkParallelCostMatrixBarb(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(graph_barb_wcm_copy_attr)
+        self.known_mtx = graph_barb_wcm_copy_attr.n2n_matrix
+
+    def test_network_parallel_cost_matrix(self):
+        observed_mtx = self.network.cost_matrix(asattr=False, n_jobs=2)
+        numpy.testing.assert_array_equal(observed_mtx, self.known_mtx)
+
+    def test_network_parallel_triangular(self):
+        kws = {"asattr": False, "storage": "triangular", "n_jobs": 2}
+        observed_mtx = self.network.cost_matrix(**kws)
+        numpy.testing.assert_array_equal(observed_mtx.toarray(), self.known_mtx)
+
+    def test_network_parallel_predecessors(self):
+        known_preds = graph_barb_wpreds_copy_attr.n2n_preds
+        kws = {"asattr": False, "wpreds": True, "n_jobs": 2}
+        observed_mtx, observed_preds = self.network.cost_matrix(**kws)
+        numpy.testing.assert_array_equal(observed_preds, known_preds)
+
+    def test_network_parallel_paths(self):
+        known_paths = graph_barb_wpaths_copy_attr.n2n_paths
+        kws = {"asattr": False, "wpaths": True, "n_jobs": 2}
+        observed_mtx, observed_paths = self.network.cost_matrix(**kws)
+        self.assertEqual(observed_paths, known_paths)
+
+    def test_network_parallel_cutoff(self):
+        kws = {"asattr": False, "cutoff": 5.0, "sparse": True}
+        known_mtx = self.network.cost_matrix(**kws)
+        observed_mtx = self.network.cost_matrix(n_jobs=2, **kws)
+        numpy.testing.assert_array_equal(observed_mtx.toarray(), known_mtx.toarray())
+
+
 class TestNetworkCostMatrixEmpircalGDF(unittest.TestCase):
     def setUp(self):
         # cost matrix
@@ -534,6 +771,11 @@ class TestNetworkCostMatrixEmpircalGDF(unittest.TestCase):
         observed_path = self.paths[known_src][known_dest]
         self.assertEqual(observed_path, known_path)
 
+    def test_network_path_reconstruction(self):
+        known_path = [19, 18, 98, 99]
+        observed_path = network_empirical_simplified_wcm.path(19, 99)
+        self.assertEqual(observed_path, known_path)
+
 
 if __name__ == "__main__":
     unittest.main()
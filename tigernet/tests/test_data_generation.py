@@ -57,6 +57,45 @@ class TestNetworkDataGenerationCreation(unittest.TestCase):
         self.assertEqual(observed_length, known_length)
 
 
+class TestNetworkDataGenerationScalable(unittest.TestCase):
+    def setUp(self):
+        self.kws = {"size": 5, "n_components": 2, "culdesacs": 0.2, "seed": 1}
+
+    def test_generate_network_lattice(self):
+        arcs = tigernet.generate_network(kind="lattice", size=4, bounds=[0, 0, 9, 9])
+        known_segms, known_length = 24, 72.0
+        self.assertEqual(arcs.shape[0], known_segms)
+        self.assertAlmostEqual(arcs.length.sum(), known_length)
+        self.assertEqual(set(arcs["MTFCC"]), {"S1400"})
+
+    def test_generate_network_deterministic(self):
+        for kind in ["perturbed", "delaunay", "voronoi"]:
+            arcs_1 = tigernet.generate_network(kind=kind, **self.kws)
+            arcs_2 = tigernet.generate_network(kind=kind, **self.kws)
+            self.assertTrue(arcs_1.geometry.geom_equals(arcs_2.geometry).all())
+            arcs_3 = tigernet.generate_network(kind=kind, **dict(self.kws, seed=2))
+            self.assertFalse(arcs_1.geometry.equals(arcs_3.geometry))
+
+    def test_generate_network_components_culdesacs(self):
+        for kind in ["lattice", "perturbed", "delaunay", "voronoi"]:
+            arcs = tigernet.generate_network(kind=kind, **self.kws)
+            network = tigernet.Network(arcs, record_components=True)
+            self.assertEqual(network.n_ccs, 2)
+            graph = network.simplify_network(record_components=True)
+            self.assertEqual(graph.n_ccs, 2)
+
+    def test_generate_network_mtfcc_mix(self):
+        mix = {"S1100": 0.1, "S1200": 0.2, "S1400": 0.7}
+        arcs = tigernet.generate_network(size=30, mtfcc_mix=mix)
+        observed_mix = arcs["MTFCC"].value_counts(normalize=True)
+        for mtfcc, proportion in mix.items():
+            self.assertAlmostEqual(observed_mix[mtfcc], proportion, 1)
+
+    def test_generate_network_bad_kind(self):
+        with self.assertRaises(ValueError):
+            tigernet.generate_network(kind="hexagonal")
+
+
 class TestNetworkDataGenerationRead(unittest.TestCase):
     def setUp(self):
         self.dset = "Edges_Leon_FL_2010"
@@ -116,6 +155,33 @@ class TestObservationDataGenerationSynthetic(unittest.TestCase):
         observed_coords = numpy.array([(p.x, p.y) for p in obs.geometry])
         numpy.testing.assert_array_almost_equal(observed_coords, known_coords)
 
+    def test_generate_observations_along_network(self):
+        n_obs = 50
+        kws = {"along_network": True}
+        obs = tigernet.generate_obs(n_obs, self.network.s_data, **kws)
+        known_n_obs = n_obs
+        observed_n_obs = obs.shape[0]
+        self.assertEqual(observed_n_obs, known_n_obs)
+
+        # every point lies on a segment
+        observed_dists = [self.network.s_data.distance(p).min() for p in obs.geometry]
+        numpy.testing.assert_array_almost_equal(observed_dists, numpy.zeros(n_obs))
+
+        # and the same seed reproduces the same points
+        obs_again = tigernet.generate_obs(n_obs, self.network.s_data, **kws)
+        self.assertTrue(obs.geom_equals(obs_again).all())
+
+    def test_generate_observations_along_network_restrict(self):
+        n_obs = 20
+        s_data = self.network.s_data.copy()
+        s_data["MTFCC"] = ["S1100", "S1400", "S1400", "S1400"]
+        restrict = ("MTFCC", ["S1100"])
+        kws = {"along_network": True, "restrict": restrict}
+        obs = tigernet.generate_obs(n_obs, s_data, **kws)
+        restricted = s_data.geometry.iloc[0]
+        observed_dists = numpy.array([restricted.distance(p) for p in obs.geometry])
+        self.assertTrue((observed_dists > 0).all())
+
 
 class TestObservationDataGenerationEmpirical(unittest.TestCase):
     def setUp(self):
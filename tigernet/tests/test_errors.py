@@ -48,6 +48,29 @@ class TestDataGenerationErrors(unittest.TestCase):
             tigernet.testing_data(self.dset, bbox=[1, 1, 2, 2, 2])
 
 
+class TestNetworkFromArraysErrors(unittest.TestCase):
+    def test_bad_coords_shape(self):
+        with self.assertRaises(ValueError):
+            tigernet.Network.from_arrays([0, 1, 2, 3], [0, 4])
+
+    def test_bad_offsets(self):
+        with self.assertRaises(ValueError):
+            tigernet.Network.from_arrays([[0, 0], [1, 0], [1, 1]], [0, 2])
+
+    def test_single_coordinate_segment(self):
+        with self.assertRaises(ValueError):
+            tigernet.Network.from_arrays([[0, 0], [1, 0], [1, 1]], [0, 2, 3])
+
+    def test_bad_attrs(self):
+        with self.assertRaises(ValueError):
+            kws = {"attrs": {"MTFCC": ["S1400", "S1400"]}}
+            tigernet.Network.from_arrays([[0, 0], [1, 0]], [0, 2], **kws)
+
+    def test_edgelist_bad_node(self):
+        with self.assertRaises(IndexError):
+            tigernet.Network.from_edgelist([0], [2], [1.0], [[0, 0], [1, 0]])
+
+
 class TestInfoErrors(unittest.TestCase):
     def test_get_discard_segms_bad_year(self):
         with self.assertRaises(KeyError):
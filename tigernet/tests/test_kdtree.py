@@ -2,8 +2,12 @@
 """
 
 import copy
+import pickle
 import unittest
 import numpy
+from shapely.geometry import Point
+
+import tigernet
 
 from .network_objects import network_lattice_1x1_geomelem
 from .network_objects import network_empirical_simplified
@@ -82,6 +86,58 @@ class TestKDTreeLattice1x1(unittest.TestCase):
         )
 
 
+class TestSpatialIndexCacheLattice1x1(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_1x1_geomelem)
+
+    def test_nodes_kdtree_cached(self):
+        kdtree = self.network.nodes_kdtree()
+        self.assertIs(self.network.nodes_kdtree(), kdtree)
+
+    def test_segms_sindex(self):
+        sindex = self.network.segms_sindex()
+        self.assertIs(self.network.segms_sindex(), sindex)
+
+        known_segms = [0, 2]
+        observed_segms = sorted(
+            sindex.query(Point(2, 2).buffer(2.6), predicate="intersects")
+        )
+        self.assertEqual(observed_segms, known_segms)
+
+    def test_indexes_invalidated_build_network(self):
+        kdtree, sindex = self.network.nodes_kdtree(), self.network.segms_sindex()
+        self.network.build_network(self.network.s_data, record_geom=True)
+        self.assertIsNot(self.network.nodes_kdtree(), kdtree)
+        self.assertIsNot(self.network.segms_sindex(), sindex)
+
+    def test_indexes_invalidated_simplify_network(self):
+        kdtree = self.network.nodes_kdtree()
+        self.network.simplify_network(record_geom=True, inplace=True)
+        self.assertIsNot(self.network.nodes_kdtree(), kdtree)
+
+    def test_indexes_invalidated_remove_restricted(self):
+        self.network.s_data.loc[0, "MTFCC"] = "S1100"
+        self.network.nodes_kdtree(), self.network.segms_sindex()
+        kws = {"restr": ["S1100"], "col": "MTFCC"}
+        tigernet.utils.remove_restricted(self.network, **kws)
+
+        known_n_nodes, known_n_segms = 4, 3
+        observed_n_nodes = self.network.nodes_kdtree().n
+        self.assertEqual(observed_n_nodes, known_n_nodes)
+        observed_n_segms = len(self.network.segms_sindex())
+        self.assertEqual(observed_n_segms, known_n_segms)
+
+    def test_indexes_pickled(self):
+        self.network.nodes_kdtree(), self.network.segms_sindex()
+        network = pickle.loads(pickle.dumps(self.network))
+        self.assertIsNotNone(network._nodes_kdtree)
+        self.assertIsNotNone(network._segms_sindex)
+
+        known_query = self.network.nodes_kdtree().query([4.5, 0.0], k=3)
+        observed_query = network.nodes_kdtree().query([4.5, 0.0], k=3)
+        numpy.testing.assert_array_equal(observed_query, known_query)
+
+
 class TestKDTreeEmpirical(unittest.TestCase):
     def setUp(self):
         network = copy.deepcopy(network_empirical_simplified)
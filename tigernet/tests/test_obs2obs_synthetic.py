@@ -2,6 +2,8 @@
 """
 
 import copy
+import os
+import tempfile
 import unittest
 import geopandas
 import numpy
@@ -463,5 +465,201 @@ class TestSyntheticObservationsOrigToDestNodes(unittest.TestCase):
         self.assertAlmostEqual(observed_mtx_sum, known_mtx_sum)
 
 
+####################################################################################
+############################## Streamed blocks #####################################
+####################################################################################
+
+
+class TestSyntheticObservationsChunkedBlocks(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_1x1_small)
+
+        # generate synthetic observations
+        pts = [Point(1, 1), Point(3, 1), Point(1, 3), Point(3, 3), Point(2, 0.5)]
+        obs = geopandas.GeoDataFrame({"obs_id": list("abcde")}, geometry=pts)
+
+        # associate observations with the network
+        args = self.network, obs.copy()
+        kwargs = {"df_name": "obs1", "df_key": "obs_id"}
+        self.net_obs = tigernet.Observations(*args, **kwargs)
+
+    def test_chunked_blocks_match_full(self):
+        args = self.net_obs, self.network
+        for distance_type in ["network", "euclidean"]:
+            kws = {"distance_type": distance_type}
+            known_mtx = tigernet.obs2obs_cost_matrix(*args, **kws)
+            blocks = list(tigernet.obs2obs_cost_matrix(*args, chunksize=2, **kws))
+
+            known_slices = [slice(0, 2), slice(2, 4), slice(4, 5)]
+            observed_slices = [rows for rows, block in blocks]
+            self.assertEqual(observed_slices, known_slices)
+
+            observed_mtx = numpy.vstack([block for rows, block in blocks])
+            numpy.testing.assert_array_almost_equal(observed_mtx, known_mtx)
+
+    def test_write_cost_blocks_npz(self):
+        args = self.net_obs, self.network
+        known_mtx = tigernet.obs2obs_cost_matrix(*args)
+        blocks = tigernet.obs2obs_cost_matrix(*args, chunksize=3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "costs.npz")
+            observed_rows = tigernet.write_cost_blocks(blocks, path)
+            self.assertEqual(observed_rows, 5)
+
+            with numpy.load(path) as npz:
+                self.assertEqual(npz.files, ["rows_0_3", "rows_3_5"])
+                observed_mtx = numpy.vstack([npz[f] for f in npz.files])
+        numpy.testing.assert_array_almost_equal(observed_mtx, known_mtx)
+
+    def test_sparse_network_matrix(self):
+        known_mtx = tigernet.obs2obs_cost_matrix(self.net_obs, self.network)
+
+        # a sparse matrix covering all pairs gives the same costs
+        network = copy.deepcopy(self.network)
+        network.cost_matrix(sparse=True)
+        observed_mtx = tigernet.obs2obs_cost_matrix(self.net_obs, network)
+        numpy.testing.assert_array_almost_equal(observed_mtx, known_mtx)
+
+        # all segments meet at the central node (within the cutoff)
+        network.cost_matrix(cutoff=2.0, sparse=True)
+        observed_mtx = tigernet.obs2obs_cost_matrix(self.net_obs, network)
+        numpy.testing.assert_array_almost_equal(observed_mtx, known_mtx)
+
+    def test_write_cost_blocks_bad_format(self):
+        blocks = tigernet.obs2obs_cost_matrix(self.net_obs, self.network, chunksize=3)
+        with self.assertRaises(ValueError):
+            tigernet.write_cost_blocks(blocks, "costs.csv")
+
+
+####################################################################################
+########################### Nearest destinations ###################################
+####################################################################################
+
+
+class TestSyntheticObservationsNearestDestinations(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_1x1_small)
+
+        # generate synthetic origins and destinations
+        obs1 = tigernet.generate_obs(5, self.network.s_data)
+        obs1["obs_id"] = ["a", "b", "c", "d", "e"]
+        obs2 = tigernet.generate_obs(3, self.network.s_data, seed=1)
+        obs2["obs_id"] = ["z", "y", "x"]
+        self.obs1, self.obs2 = obs1, obs2
+
+    def _observations(self, snap_to):
+        kwargs = {"df_key": "obs_id", "snap_to": snap_to}
+        net_obs1 = tigernet.Observations(self.network, self.obs1.copy(), **kwargs)
+        net_obs2 = tigernet.Observations(self.network, self.obs2.copy(), **kwargs)
+        return net_obs1, net_obs2
+
+    def test_nearest_matches_cost_matrix(self):
+        for snap_to in ["segments", "nodes"]:
+            net_obs1, net_obs2 = self._observations(snap_to)
+            for snap_dist in [True, False]:
+                kws = {"destination_observations": net_obs2, "snap_dist": snap_dist}
+                mtx = tigernet.obs2obs_cost_matrix(net_obs1, self.network, **kws)
+                known_indices = numpy.argsort(mtx, axis=1, kind="stable")[:, :2]
+                known_distances = numpy.take_along_axis(mtx, known_indices, axis=1)
+
+                args = net_obs1, self.network, net_obs2
+                kws = {"k": 2, "snap_dist": snap_dist}
+                indices, distances = tigernet.nearest_destinations(*args, **kws)
+                numpy.testing.assert_array_equal(indices, known_indices)
+                numpy.testing.assert_array_almost_equal(distances, known_distances)
+
+    def test_nearest_symmetric(self):
+        net_obs1, _ = self._observations("segments")
+        mtx = tigernet.obs2obs_cost_matrix(net_obs1, self.network)
+        known_distances = numpy.sort(mtx, axis=1)[:, :3]
+
+        args = net_obs1, self.network
+        indices, distances = tigernet.nearest_destinations(
+            *args, k=3, include_self=True
+        )
+        numpy.testing.assert_array_equal(indices[:, 0], numpy.arange(5))
+        numpy.testing.assert_array_almost_equal(distances, known_distances)
+
+    def test_nearest_symmetric_wo_self(self):
+        net_obs1, _ = self._observations("segments")
+        mtx = tigernet.obs2obs_cost_matrix(net_obs1, self.network)
+        numpy.fill_diagonal(mtx, numpy.inf)
+        known_indices = numpy.argsort(mtx, axis=1, kind="stable")[:, :2]
+        known_distances = numpy.take_along_axis(mtx, known_indices, axis=1)
+
+        indices, distances = tigernet.nearest_destinations(net_obs1, self.network, k=2)
+        numpy.testing.assert_array_equal(indices, known_indices)
+        numpy.testing.assert_array_almost_equal(distances, known_distances)
+
+    def test_nearest_max_dist(self):
+        net_obs1, net_obs2 = self._observations("segments")
+        args = net_obs1, self.network, net_obs2
+        indices, distances = tigernet.nearest_destinations(*args, k=3, max_dist=3.7)
+
+        known_indices = numpy.array(
+            [[0, -1, -1], [0, 1, 2], [0, 1, -1], [0, -1, -1], [0, -1, -1]]
+        )
+        numpy.testing.assert_array_equal(indices, known_indices)
+        self.assertTrue(numpy.isinf(distances[indices == -1]).all())
+        self.assertTrue((distances[indices != -1] <= 3.7).all())
+
+    def test_nearest_bad_k(self):
+        net_obs1, net_obs2 = self._observations("segments")
+        with self.assertRaises(ValueError):
+            tigernet.nearest_destinations(net_obs1, self.network, net_obs2, k=0)
+
+
+class TestSyntheticObservationsTriangular(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_1x1_small)
+        self.packed = copy.deepcopy(network_lattice_1x1_small)
+        self.packed.cost_matrix(storage="triangular")
+
+        # generate synthetic observations
+        pts = [Point(1, 1), Point(3, 1), Point(1, 3), Point(2, 0.5)]
+        self.obs = geopandas.GeoDataFrame({"obs_id": list("abcd")}, geometry=pts)
+        self.kwargs = {"df_name": "obs1", "df_key": "obs_id"}
+
+    def test_triangular_obs2obs(self):
+        net_obs = tigernet.Observations(self.network, self.obs.copy(), **self.kwargs)
+        known_mtx = tigernet.obs2obs_cost_matrix(net_obs, self.network)
+        net_obs = tigernet.Observations(self.packed, self.obs.copy(), **self.kwargs)
+        observed_mtx = tigernet.obs2obs_cost_matrix(net_obs, self.packed)
+        numpy.testing.assert_array_almost_equal(observed_mtx, known_mtx)
+
+
+class TestSyntheticObservationsParallel(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_1x1_small)
+
+        # generate synthetic observations
+        pts = [Point(1, 1), Point(3, 1), Point(1, 3), Point(3, 3), Point(2, 0.5)]
+        obs = geopandas.GeoDataFrame({"obs_id": list("abcde")}, geometry=pts)
+        self.obs = obs
+        kwargs = {"df_name": "obs1", "df_key": "obs_id"}
+        self.net_obs = tigernet.Observations(self.network, obs.copy(), **kwargs)
+        self.kwargs = kwargs
+
+    def test_parallel_snapping(self):
+        kwargs = dict(self.kwargs, n_jobs=2)
+        net_obs = tigernet.Observations(self.network, self.obs.copy(), **kwargs)
+        known_points = self.net_obs.snapped_points
+        self.assertTrue(net_obs.snapped_points.equals(known_points))
+        self.assertEqual(net_obs.obs2segm, self.net_obs.obs2segm)
+
+    def test_parallel_obs2obs(self):
+        known_mtx = tigernet.obs2obs_cost_matrix(self.net_obs, self.network)
+        args = self.net_obs, self.network
+        observed_mtx = tigernet.obs2obs_cost_matrix(*args, n_jobs=2)
+        numpy.testing.assert_array_equal(observed_mtx, known_mtx)
+
+        # reuse a handle of the shared network in chunks
+        with self.network.share() as handle:
+            kws = {"n_jobs": 2, "shared": handle, "chunksize": 2}
+            blocks = tigernet.obs2obs_cost_matrix(*args, **kws)
+            observed_mtx = numpy.vstack([block for rows, block in blocks])
+        numpy.testing.assert_array_equal(observed_mtx, known_mtx)
+
+
 if __name__ == "__main__":
     unittest.main()
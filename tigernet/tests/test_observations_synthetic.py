@@ -179,6 +179,7 @@ class TestSyntheticObservationsSegmentRandomLattice1x1Restricted(unittest.TestCa
         kwargs = {"df_name": "obs1", "df_key": "obs_id", "restrict_col": "MTFCC"}
         kwargs.update({"remove_restricted": ["S1100", "S1630", "S1640"]})
         self.net_obs = tigernet.Observations(*args, **kwargs)
+        self.network = network
 
     def test_obs2coords(self):
         known_obs2coords = {
@@ -192,6 +193,25 @@ class TestSyntheticObservationsSegmentRandomLattice1x1Restricted(unittest.TestCa
         for k, v in known_obs2coords.items():
             self.assertAlmostEqual(observed_obs2coords[k], v)
 
+    def test_network_unaltered(self):
+        known_s_ids, known_n_ids = [0, 1, 2, 3], [0, 1, 2, 3, 4]
+        self.assertEqual(self.network.s_ids, known_s_ids)
+        self.assertEqual(self.network.n_ids, known_n_ids)
+        known_node2segm = [0, 1, 2, 3]
+        self.assertEqual(self.network.node2segm[1], known_node2segm)
+
+    def test_restricted_view(self):
+        kws = {"restr": ["S1100", "S1630", "S1640"], "col": "MTFCC"}
+        view = tigernet.utils.restricted_view(self.network, **kws)
+        self.assertIs(tigernet.utils.restricted_view(self.network, **kws), view)
+
+        known_s_ids, known_n_ids = [0, 2], [0, 1, 3]
+        self.assertEqual(view.s_ids, known_s_ids)
+        self.assertEqual(view.n_ids, known_n_ids)
+        known_node2segm = [0, 2]
+        self.assertEqual(view.node2segm[1], known_node2segm)
+        self.assertEqual(view.nodes_kdtree().n, len(known_n_ids))
+
     def test_obs2segm(self):
         known_obs2segm = {"a": 0, "b": 0, "c": 2, "d": 2, "e": 0}
         observed_obs2segm = self.net_obs.obs2segm
@@ -0,0 +1,101 @@
+"""Build profile testing.
+"""
+
+import pickle
+import tracemalloc
+import types
+import unittest
+import geopandas
+from shapely.geometry import Point
+
+import tigernet
+
+
+class TestNetworkBuildProfileLattice1x1(unittest.TestCase):
+    def setUp(self):
+        self.lat = tigernet.generate_lattice(n_hori_lines=1, n_vert_lines=1)
+
+    def test_network_no_profile(self):
+        network = tigernet.Network(s_data=self.lat.copy())
+        self.assertIsNone(network.build_profile)
+
+    def test_network_build_profile(self):
+        kws = {"record_components": True, "def_graph_elems": True, "profile": True}
+        network = tigernet.Network(s_data=self.lat.copy(), **kws)
+        observed_profile = network.build_profile
+
+        known_stages = [
+            "build_network",
+            "build_network.build_base",
+            "build_network.build_topology",
+            "build_network.build_components",
+            "build_network.build_associations",
+            "build_network.define_graph_elements",
+        ]
+        observed_stages = list(
+            observed_profile.loc[observed_profile["depth"] < 2, "stage"]
+        )
+        self.assertEqual(observed_stages, known_stages)
+
+        known_columns = tigernet.utils.BuildProfile.columns
+        self.assertEqual(list(observed_profile.columns), known_columns)
+        self.assertTrue((observed_profile["wall_time"] >= 0.0).all())
+        self.assertTrue((observed_profile["peak_memory"] >= 0).all())
+
+        record = observed_profile.iloc[0]
+        self.assertEqual((record["n_segm"], record["n_node"]), (4, 5))
+
+    def test_network_profile_peak_memory_nests(self):
+        network = tigernet.Network(s_data=self.lat.copy(), profile=True)
+        observed_profile = network.build_profile.set_index("stage")
+        outer = observed_profile.loc["build_network", "peak_memory"]
+        inner = observed_profile.loc["build_network.build_base", "peak_memory"]
+        self.assertGreaterEqual(outer, inner)
+
+    def test_network_profile_wo_reset_peak(self):
+        # ``tracemalloc`` before Python 3.9 has no ``reset_peak()``
+        names = ["start", "stop", "is_tracing", "get_traced_memory"]
+        py38 = types.SimpleNamespace(**{n: getattr(tracemalloc, n) for n in names})
+        utils, tracing = tigernet.utils, tigernet.utils.tracemalloc
+        utils.tracemalloc = py38
+        try:
+            network = tigernet.Network(s_data=self.lat.copy(), profile=True)
+        finally:
+            utils.tracemalloc = tracing
+        observed_profile = network.build_profile
+        self.assertTrue((observed_profile["peak_memory"] >= 0).all())
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_network_profile_hook(self):
+        records = []
+        network = tigernet.Network(s_data=self.lat.copy(), profile=records.append)
+        self.assertEqual(len(records), network.build_profile.shape[0])
+
+        # the hook also receives later stages and is dropped when pickled
+        network.cost_matrix()
+        self.assertEqual(records[-1]["stage"], "cost_matrix")
+        network = pickle.loads(pickle.dumps(network))
+        self.assertIsNone(network._profiler.hook)
+
+    def test_simplify_cost_matrix_profile(self):
+        network = tigernet.Network(s_data=self.lat.copy(), profile=True)
+        graph = network.simplify_network()
+        graph.cost_matrix()
+        observed_stages = list(graph.build_profile["stage"])
+        self.assertIn("simplify_network.simplify", observed_stages)
+        self.assertIn("simplify_network.build_network", observed_stages)
+        self.assertIn("cost_matrix.shortest_path", observed_stages)
+        self.assertNotIn("simplify_network", list(network.build_profile["stage"]))
+
+    def test_observations_profile(self):
+        network = tigernet.Network(s_data=self.lat.copy(), record_geom=True)
+        pts = [Point(1, 1), Point(3, 1), Point(1, 3)]
+        obs = geopandas.GeoDataFrame({"obs_id": ["a", "b", "c"]}, geometry=pts)
+        kws = {"df_name": "obs1", "df_key": "obs_id", "profile": True}
+        net_obs = tigernet.Observations(network, obs, **kws)
+        observed_profile = net_obs.build_profile.set_index("stage")
+        self.assertEqual(observed_profile.loc["snap_to_nearest", "n_obs"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
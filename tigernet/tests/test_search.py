@@ -0,0 +1,279 @@
+"""Network search (point-to-point, service area, etc.) testing.
+"""
+
+import copy
+import unittest
+import geopandas
+import numpy
+from shapely.geometry import Point
+
+import tigernet
+from .network_objects import network_lattice_1x1_small
+from .network_objects import network_lattice_4x4_wbox
+from .network_objects import network_empirical_simplified_wcm
+
+from .. import utils
+
+
+class TestNetworkServiceAreaLattice1x1(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_1x1_small)
+
+        # synthetic observations along the southern and northern segments
+        pts = [Point(2, 0.5), Point(2.1, 3.5)]
+        obs = geopandas.GeoDataFrame({"obs_id": ["a", "b"]}, geometry=pts)
+        args = self.network, obs
+        kwargs = {"df_name": "obs", "df_key": "obs_id"}
+        self.net_obs = tigernet.Observations(*args, **kwargs)
+
+    def test_service_area_node_partial(self):
+        nodes, segms = self.network.service_area([1], 1.0)
+
+        self.assertEqual(list(nodes.index), [1])
+        self.assertEqual(list(nodes["dist"]), [0.0])
+        self.assertEqual(list(nodes["source"]), [1])
+
+        self.assertEqual(list(segms.index), [0, 1, 2, 3])
+        numpy.testing.assert_array_almost_equal(segms["covered"], [1.0] * 4)
+        self.assertFalse(segms["full"].any())
+
+    def test_service_area_node_full(self):
+        nodes, segms = self.network.service_area([0, 2], 3.0)
+
+        self.assertEqual(list(nodes.index), [0, 1, 2])
+        numpy.testing.assert_array_almost_equal(nodes["dist"], [0, 2, 0])
+        self.assertEqual(list(nodes["source"]), [0, 0, 2])
+
+        numpy.testing.assert_array_almost_equal(segms["covered"], [2, 2, 1, 1])
+        self.assertEqual(list(segms["full"]), [True, True, False, False])
+
+    def test_service_area_observations(self):
+        nodes, segms = self.network.service_area(self.net_obs, 1.0)
+
+        # 'a' reaches node 0, 'b' (0.1 off the network) reaches node 2
+        known_nodes = {0: (0.5, "a"), 2: (0.6, "b")}
+        observed_nodes = {n: (d, s) for n, (d, s) in nodes.iterrows()}
+        self.assertEqual(list(observed_nodes), list(known_nodes))
+        for n, (d, s) in known_nodes.items():
+            self.assertAlmostEqual(observed_nodes[n][0], d)
+            self.assertEqual(observed_nodes[n][1], s)
+
+        # partial offsets along the source segments
+        numpy.testing.assert_array_almost_equal(segms["covered"], [1.5, 1.4])
+
+    def test_service_area_bad_source(self):
+        with self.assertRaises(IndexError):
+            self.network.service_area([99], 1.0)
+
+    def test_service_area_bad_cutoff(self):
+        with self.assertRaises(ValueError):
+            self.network.service_area([1], -1.0)
+
+
+class TestNetworkShortestPathLattice4x4(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_4x4_wbox)
+        self.methods = ["astar", "bidirectional", "dijkstra"]
+
+    def test_shortest_path_matches_cost_matrix(self):
+        mtx = self.network.n2n_matrix
+        for method in self.methods:
+            for source in self.network.n_ids:
+                for target in self.network.n_ids[::5]:
+                    args = source, target, method
+                    cost, nodes, segms = self.network.shortest_path(*args)
+                    self.assertAlmostEqual(cost, mtx[source, target])
+                    self.assertEqual(nodes[0], source)
+                    self.assertEqual(nodes[-1], target)
+
+                    # path consistency
+                    self.assertEqual(len(segms), len(nodes) - 1)
+                    lengths = [self.network.segm2len[s] for s in segms]
+                    self.assertAlmostEqual(sum(lengths), cost)
+                    for (n1, n2), s in zip(zip(nodes[:-1], nodes[1:]), segms):
+                        self.assertEqual(self.network.segm2node[s], sorted([n1, n2]))
+
+    def test_shortest_path_same_node(self):
+        for method in self.methods:
+            observed = self.network.shortest_path(7, 7, method=method)
+            self.assertEqual(observed, (0.0, [7], []))
+
+    def test_shortest_path_bad_method(self):
+        with self.assertRaises(ValueError):
+            self.network.shortest_path(0, 1, method="floyd")
+
+    def test_shortest_path_bad_node(self):
+        with self.assertRaises(IndexError):
+            self.network.shortest_path(0, 99)
+
+
+class TestNetworkShortestPathObservationsLattice1x1(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_1x1_small)
+
+        # generate synthetic origins and destinations
+        obs1 = tigernet.generate_obs(5, self.network.s_data)
+        obs1["obs_id"] = ["a", "b", "c", "d", "e"]
+        obs2 = tigernet.generate_obs(3, self.network.s_data, seed=1)
+        obs2["obs_id"] = ["z", "y", "x"]
+        kwargs = {"df_key": "obs_id"}
+        self.net_obs1 = tigernet.Observations(self.network, obs1, **kwargs)
+        self.net_obs2 = tigernet.Observations(self.network, obs2, **kwargs)
+
+    def test_shortest_path_matches_obs2obs(self):
+        args = self.net_obs1, self.network
+        kws = {"destination_observations": self.net_obs2}
+        mtx = tigernet.obs2obs_cost_matrix(*args, **kws)
+        kws["observations"] = self.net_obs1
+        for method in ["astar", "bidirectional", "dijkstra"]:
+            for i in range(5):
+                for j in range(3):
+                    cost, _, _ = self.network.shortest_path(i, j, method, **kws)
+                    self.assertAlmostEqual(cost, mtx[i, j])
+
+    def test_shortest_path_segments(self):
+        kws = {"observations": self.net_obs1}
+        known_segms = [
+            self.net_obs1.snapped_points["assoc_segm"][0],
+            self.net_obs1.snapped_points["assoc_segm"][4],
+        ]
+        for method in ["astar", "bidirectional"]:
+            cost, nodes, segms = self.network.shortest_path(0, 4, method, **kws)
+            self.assertEqual(segms[0], known_segms[0])
+            self.assertEqual(segms[-1], known_segms[1])
+            self.assertEqual(len(segms), len(nodes) + 1)
+
+
+class TestNetworkContractionHierarchyLattice4x4(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_4x4_wbox)
+        self.network.build_contraction_hierarchy()
+        self.ch = self.network.contraction_hierarchy
+
+    def test_ch_query_matches_dijkstra(self):
+        for source in self.network.n_ids:
+            known_dists, _ = utils.dijkstra(self.network, source)
+            for target in self.network.n_ids:
+                observed_dist = self.ch.query(source, target)
+                self.assertAlmostEqual(observed_dist, known_dists[target])
+
+    def test_ch_query_path(self):
+        known_cost = self.network.n2n_matrix[0, 35]
+        observed_cost, observed_nodes = self.ch.query(0, 35, path=True)
+        self.assertAlmostEqual(observed_cost, known_cost)
+        self.assertEqual([observed_nodes[0], observed_nodes[-1]], [0, 35])
+
+        # the unpacked path follows original network segments
+        segms = utils.path_segments(self.network, observed_nodes)
+        self.assertEqual(len(segms), len(observed_nodes) - 1)
+        lengths = [self.network.segm2len[s] for s in segms]
+        self.assertAlmostEqual(sum(lengths), known_cost)
+
+    def test_ch_many_to_many(self):
+        sources, targets = [0, 7, 21, 35], list(self.network.n_ids)
+        known_mtx = self.network.n2n_matrix[sources]
+        observed_mtx = self.ch.many_to_many(sources, targets)
+        numpy.testing.assert_array_almost_equal(observed_mtx, known_mtx)
+
+    def test_ch_persists_with_network(self):
+        network = copy.deepcopy(self.network)
+        observed_mtx = network.contraction_hierarchy.many_to_many([3], [30, 31])
+        known_mtx = self.network.n2n_matrix[[3]][:, [30, 31]]
+        numpy.testing.assert_array_almost_equal(observed_mtx, known_mtx)
+
+    def test_ch_bad_node(self):
+        with self.assertRaises(IndexError):
+            self.ch.query(0, 99)
+
+
+class TestNetworkLandmarksLattice4x4(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_4x4_wbox)
+        self.network.build_landmarks(n=4, n_jobs=1)
+
+    def test_landmarks_farthest(self):
+        known_landmarks = [35, 0, 5, 20]
+        observed_landmarks = list(self.network.landmarks)
+        self.assertEqual(observed_landmarks, known_landmarks)
+
+        observed_dists = self.network.landmark_dists
+        self.assertEqual(observed_dists.shape, (4, 36))
+        self.assertEqual(observed_dists.dtype, numpy.float32)
+        known_dists = self.network.n2n_matrix[known_landmarks]
+        numpy.testing.assert_array_almost_equal(observed_dists, known_dists, 5)
+
+    def test_landmarks_planar(self):
+        self.network.build_landmarks(n=4, strategy="planar", n_jobs=2)
+        observed_landmarks = sorted(self.network.landmarks)
+        self.assertEqual(observed_landmarks, [0, 5, 30, 35])
+        known_dists = self.network.n2n_matrix[self.network.landmarks]
+        observed_dists = self.network.landmark_dists
+        numpy.testing.assert_array_almost_equal(observed_dists, known_dists, 5)
+
+    def test_alt_matches_cost_matrix(self):
+        mtx = self.network.n2n_matrix
+        for source in self.network.n_ids:
+            for target in self.network.n_ids[::3]:
+                cost, nodes, _ = self.network.shortest_path(source, target, "alt")
+                self.assertAlmostEqual(cost, mtx[source, target])
+                self.assertEqual([nodes[0], nodes[-1]], [source, target])
+
+    def test_distance_bounds(self):
+        mtx = self.network.n2n_matrix
+        for source in self.network.n_ids:
+            for target in self.network.n_ids:
+                lower, upper = self.network.distance_bounds(source, target)
+                self.assertLessEqual(lower, mtx[source, target])
+                self.assertGreaterEqual(upper, mtx[source, target] - 1e-5)
+
+    def test_distance_bounds_float32(self):
+        kws = {"kind": "perturbed", "size": 12, "culdesacs": 0.2, "n_components": 2}
+        network = tigernet.Network(tigernet.generate_network(seed=3, **kws))
+        network.cost_matrix()
+        network.build_landmarks()
+        mtx = network.n2n_matrix
+        pairs = numpy.random.default_rng(0).integers(0, network.n_node, (1200, 2))
+        for source, target in pairs:
+            lower, upper = network.distance_bounds(source, target)
+            self.assertLessEqual(lower, mtx[source, target])
+            self.assertGreaterEqual(upper, mtx[source, target])
+
+    def test_landmarks_missing(self):
+        network = copy.deepcopy(network_lattice_4x4_wbox)
+        with self.assertRaises(AttributeError):
+            network.shortest_path(0, 1, method="alt")
+        with self.assertRaises(AttributeError):
+            network.distance_bounds(0, 1)
+
+    def test_landmarks_bad_strategy(self):
+        with self.assertRaises(ValueError):
+            self.network.build_landmarks(strategy="random")
+
+
+##########################################################################################
+# Empirical testing
+##########################################################################################
+
+
+class TestNetworkContractionHierarchyEmpirical(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_empirical_simplified_wcm)
+        self.network.build_contraction_hierarchy()
+        self.ch = self.network.contraction_hierarchy
+
+    def test_ch_query_matches_dijkstra(self):
+        for source in self.network.n_ids[::25]:
+            known_dists, _ = utils.dijkstra(self.network, source)
+            for target in self.network.n_ids:
+                observed_dist = self.ch.query(source, target)
+                self.assertAlmostEqual(observed_dist, known_dists[target])
+
+    def test_ch_many_to_many(self):
+        sources = self.network.n_ids[::10]
+        known_mtx = self.network.n2n_matrix[sources]
+        observed_mtx = self.ch.many_to_many(sources, self.network.n_ids)
+        numpy.testing.assert_array_almost_equal(observed_mtx, known_mtx)
+
+
+if __name__ == "__main__":
+    unittest.main()
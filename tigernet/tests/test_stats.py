@@ -8,6 +8,7 @@ import geopandas
 from shapely.geometry import LineString
 
 import tigernet
+from .network_objects import network_lattice_4x4_wbox
 from .network_objects import network_empirical_lcc
 from .network_objects import network_empirical_simplified
 from .network_objects import network_empirical_simplified_wcm
@@ -345,6 +346,41 @@ class TestNetworkEntropyLattice1x1(unittest.TestCase):
         observed_entropy = net.network_degree_entropy
         self.assertAlmostEqual(observed_entropy, known_entropy)
 
+    def test_lattice_network_multi_column_entropy(self):
+        _lat = self.lat.copy()
+        _lat["MTFCC"] = ["S1100", "S1200", "S1400", "S1700"]
+        _lat["FClass"] = ["A", "A", "B", "B"]
+        net = tigernet.Network(s_data=_lat)
+        net.calc_entropy(["MTFCC", "FClass"], "s_data")
+
+        known_entropies = {"S1100": -0.5, "S1200": -0.5, "S1400": -0.5, "S1700": -0.5}
+        self.assertEqual(net.mtfcc_entropies, known_entropies)
+        self.assertEqual(net.network_mtfcc_entropy, 2.0)
+
+        known_entropies = {"A": -0.5, "B": -0.5}
+        self.assertEqual(net.fclass_entropies, known_entropies)
+        self.assertEqual(net.network_fclass_entropy, 1.0)
+
+    def test_lattice_network_grouped_entropy(self):
+        _lat = self.lat.copy()
+        _lat["MTFCC"] = ["S1100", "S1200", "S1100", "S1100"]
+        _lat["Tile"] = ["a", "a", "b", "b"]
+        net = tigernet.Network(s_data=_lat)
+        net.calc_entropy("MTFCC", "s_data", by="Tile")
+
+        known_entropies = {"a": {"S1100": -0.5, "S1200": -0.5}, "b": {"S1100": 0.0}}
+        observed_entropies = net.mtfcc_entropies_by_tile
+        self.assertEqual(observed_entropies, known_entropies)
+
+        known_entropy = {"a": 1.0, "b": -0.0}
+        observed_entropy = net.network_mtfcc_entropy_by_tile
+        self.assertEqual(observed_entropy, known_entropy)
+
+        # ungrouped entropies are still set
+        known_entropy = 0.8112781244591328
+        observed_entropy = net.network_mtfcc_entropy
+        self.assertAlmostEqual(observed_entropy, known_entropy)
+
 
 class TestNetworkDistanceMetricsLattice1x1(unittest.TestCase):
     def setUp(self):
@@ -381,6 +417,110 @@ class TestNetworkDistanceMetricsLattice1x1(unittest.TestCase):
         self.assertAlmostEqual(observed_circuity, known_circuity, 3)
 
 
+class TestNetworkDistanceMetricsTriangularLattice1x1(unittest.TestCase):
+    def setUp(self):
+        self.lat = tigernet.generate_lattice(n_hori_lines=1, n_vert_lines=1)
+        self.net = tigernet.Network(s_data=self.lat)
+        self.net.cost_matrix(dtype="float32", storage="triangular")
+        self.net.calc_net_stats()
+
+    def test_network_radius(self):
+        known_pair, known_radius = [(0, 1, 1, 1, 1, 2, 3, 4), 4.5]
+        observed_pair, observed_radius = self.net.radius
+        self.assertEqual(observed_pair, known_pair)
+        self.assertAlmostEqual(observed_radius, known_radius)
+
+    def test_network_diameter(self):
+        known_pair, known_diameter = [(0, 0, 0, 2, 2, 2, 3, 3, 3, 4, 4, 4), 9.0]
+        observed_pair, observed_diameter = self.net.diameter
+        self.assertEqual(observed_pair, known_pair)
+        self.assertAlmostEqual(observed_diameter, known_diameter)
+
+    def test_network_total_network_distance(self):
+        known_distance = 144.0
+        observed_distance = self.net.d_net
+        self.assertAlmostEqual(observed_distance, known_distance)
+
+    def test_network_circuity(self):
+        known_circuity = 1.17157287525381
+        observed_circuity = self.net.circuity
+        self.assertAlmostEqual(observed_circuity, known_circuity, 3)
+
+
+class TestNetworkBoundingDiameterLattice4x4(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_4x4_wbox)
+        self.mtx = self.network.n2n_matrix
+
+    def test_bounding_diameter(self):
+        (n1, n2), observed_diameter = tigernet.stats.bounding_diameter(self.network)[0]
+        known_diameter = self.mtx.max()
+        self.assertAlmostEqual(observed_diameter, known_diameter)
+        self.assertAlmostEqual(self.mtx[n1, n2], known_diameter)
+
+    def test_bounding_radius(self):
+        center, observed_radius = tigernet.stats.bounding_diameter(self.network)[1]
+        known_radius = self.mtx.max(axis=1).min()
+        self.assertAlmostEqual(observed_radius, known_radius)
+        self.assertAlmostEqual(self.mtx[center].max(), known_radius)
+
+    def test_bounding_searches(self):
+        observed_searches = tigernet.stats.bounding_diameter(self.network)[2]
+        self.assertLess(observed_searches, self.network.n_node)
+
+    def test_calc_net_stats_w_matrix(self):
+        self.network.calc_net_stats()
+        observed_diameter = self.network.diameter[1]
+        self.assertAlmostEqual(observed_diameter, self.mtx.max())
+        center, observed_radius = self.network.graph_radius
+        self.assertAlmostEqual(observed_radius, self.mtx.max(axis=1).min())
+        self.assertAlmostEqual(self.mtx[center].max(), observed_radius)
+
+    def test_calc_net_stats_wo_matrix(self):
+        del self.network.n2n_matrix
+        with self.assertWarns(UserWarning):
+            self.network.calc_net_stats()
+        observed_diameter = self.network.diameter[1]
+        self.assertAlmostEqual(observed_diameter, self.mtx.max())
+        observed_radius = self.network.graph_radius[1]
+        self.assertAlmostEqual(observed_radius, self.mtx.max(axis=1).min())
+
+
+class TestNetworkCircuityLattice4x4(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_4x4_wbox)
+        tigernet.stats.circuity(self.network)
+        self.known_circuity = self.network.circuity
+
+    def test_chunked_circuity(self):
+        tigernet.stats.circuity(self.network, chunksize=7)
+        observed_circuity = self.network.circuity
+        self.assertAlmostEqual(observed_circuity, self.known_circuity)
+
+    def test_sampled_circuity_all_sources(self):
+        n_sources = self.network.n_node
+        estimate = tigernet.stats.sampled_circuity(self.network, n_sources=n_sources)
+        observed_circuity, (lower, upper) = estimate
+        self.assertAlmostEqual(observed_circuity, self.known_circuity)
+        self.assertAlmostEqual(lower, upper)
+
+    def test_sampled_circuity_interval(self):
+        estimate = tigernet.stats.sampled_circuity(self.network, n_sources=10)
+        observed_circuity, (lower, upper) = estimate
+        self.assertLess(lower, observed_circuity)
+        self.assertGreater(upper, observed_circuity)
+        self.assertLess(lower, self.known_circuity)
+        self.assertGreater(upper, self.known_circuity)
+
+    def test_calc_net_stats_sampled_circuity(self):
+        del self.network.n2n_matrix
+        with self.assertWarns(UserWarning):
+            self.network.calc_net_stats(circuity_sources=10)
+        observed_lower, observed_upper = self.network.circuity_ci
+        self.assertLess(observed_lower, self.network.circuity)
+        self.assertGreater(observed_upper, self.network.circuity)
+
+
 ##########################################################################################
 # Empirical testing
 ##########################################################################################
@@ -3,6 +3,19 @@
 
 import copy
 import unittest
+import numpy
+
+try:
+    import networkx
+except ImportError:
+    networkx = None
+
+try:
+    import igraph
+except ImportError:
+    igraph = None
+
+import tigernet
 from .network_objects import network_lattice_1x1_no_args
 from .network_objects import network_lattice_2x1x1_all
 from .network_objects import network_lattice_2x1x1_largest
@@ -394,5 +407,135 @@ class TestNetworkSimplifyBarb(unittest.TestCase):
         self.assertEqual(observed_degree, known_degree)
 
 
+class TestNetworkFromArraysLattice1x1(unittest.TestCase):
+    def setUp(self):
+        self.known_network = network_lattice_1x1_geomelem
+        lines = [numpy.asarray(g.coords) for g in self.known_network.s_data.geometry]
+        coords = numpy.concatenate(lines)
+        offsets = numpy.cumsum([0] + [line.shape[0] for line in lines])
+        attrs = {"MTFCC": self.known_network.s_data["MTFCC"].values}
+        kws = {"attrs": attrs, "record_geom": True, "def_graph_elems": True}
+        self.network = tigernet.Network.from_arrays(coords, offsets, **kws)
+
+    def test_from_arrays_topology(self):
+        for attr in ["segm2node", "node2segm", "segm2segm", "node2node"]:
+            known_topology = getattr(self.known_network, attr)
+            observed_topology = getattr(self.network, attr)
+            self.assertEqual(observed_topology, known_topology)
+
+    def test_from_arrays_associations(self):
+        for attr in ["segm2xyid", "node2xyid", "segm2coords", "node2coords"]:
+            known_associations = getattr(self.known_network, attr)
+            observed_associations = getattr(self.network, attr)
+            self.assertEqual(observed_associations, known_associations)
+        self.assertEqual(self.network.segm2len, self.known_network.segm2len)
+        self.assertEqual(self.network.node2degree, self.known_network.node2degree)
+        self.assertEqual(self.network.node2elem, self.known_network.node2elem)
+
+    def test_from_arrays_frames(self):
+        cols = ["SegID", "MTFCC", "length", "xyid", "s_neigh", "n_neigh"]
+        known_sdata = self.known_network.s_data[cols]
+        observed_sdata = self.network.s_data[cols]
+        self.assertTrue(observed_sdata.equals(known_sdata))
+
+        cols = ["NodeID", "xyid", "s_neigh", "n_neigh", "degree", "graph_elem"]
+        known_ndata = self.known_network.n_data[cols]
+        observed_ndata = self.network.n_data[cols]
+        self.assertTrue(observed_ndata.equals(known_ndata))
+
+    def test_from_arrays_geometry(self):
+        known_geoms = self.known_network.s_data.geometry
+        observed_geoms = self.network.s_data.geometry
+        self.assertTrue(observed_geoms.geom_equals(known_geoms).all())
+        self.assertEqual(list(self.network.segm2geom), self.network.s_ids)
+
+    def test_from_arrays_no_geometry(self):
+        coords = [[0, 0], [1, 0], [1, 0], [1, 1], [2, 1], [1, 0], [2, 0]]
+        network = tigernet.Network.from_arrays(coords, [0, 2, 5, 7])
+        self.assertNotIn("geometry", network.s_data.columns)
+        self.assertFalse(hasattr(network, "segm2geom"))
+
+        known_segm2len = {0: 1.0, 1: 2.0, 2: 1.0}
+        self.assertEqual(network.segm2len, known_segm2len)
+
+
+class TestNetworkFromEdgelist(unittest.TestCase):
+    def setUp(self):
+        # an isolated edge and a triangle
+        self.node_xy = [[9, 9], [9, 8], [0, 0], [1, 0], [0, 1]]
+        self.u, self.v = [0, 2, 3, 4], [1, 3, 4, 2]
+        self.length = [1.0, 1.0, 2.0, 1.0]
+        args = self.u, self.v, self.length, self.node_xy
+        kws = {"record_components": True, "largest_component": True}
+        self.network = tigernet.Network.from_edgelist(*args, **kws)
+
+    def test_from_edgelist_largest_component(self):
+        known_s_ids, known_n_ids = [1, 2, 3], [2, 3, 4]
+        self.assertEqual(self.network.s_ids, known_s_ids)
+        self.assertEqual(self.network.n_ids, known_n_ids)
+
+    def test_from_edgelist_topology(self):
+        known_segm2node = {1: [2, 3], 2: [3, 4], 3: [2, 4]}
+        self.assertEqual(self.network.segm2node, known_segm2node)
+        known_node2node = {2: [3, 4], 3: [2, 4], 4: [2, 3]}
+        self.assertEqual(self.network.node2node, known_node2node)
+
+    def test_from_edgelist_lengths(self):
+        known_segm2len = {1: 1.0, 2: 2.0, 3: 1.0}
+        self.assertEqual(self.network.segm2len, known_segm2len)
+        self.assertEqual(self.network.network_length, 4.0)
+
+    def test_from_edgelist_cost_matrix(self):
+        args = self.u, self.v, self.length, self.node_xy
+        network = tigernet.Network.from_edgelist(*args)
+        network.cost_matrix()
+        self.assertEqual(network.n2n_matrix[3, 4], 2.0)
+        self.assertEqual(network.n2n_matrix[0, 1], 1.0)
+        self.assertEqual(network.n2n_matrix[0, 2], numpy.inf)
+
+
+class TestNetworkExportBarb(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(graph_barb)
+
+    def test_to_csr(self):
+        graph, segment_id = self.network.to_csr()
+        known_graph = numpy.array([[0.0, 4.5, 0.0], [4.5, 0.0, 4.5], [0.0, 4.5, 0.0]])
+        numpy.testing.assert_array_equal(graph.toarray(), known_graph)
+        # the ring (segment 1) is a self-loop
+        known_segment_id = [0, 0, 2, 2]
+        self.assertEqual(segment_id.tolist(), known_segment_id)
+
+    def test_to_csr_cached(self):
+        graph, _ = self.network.to_csr()
+        self.assertIs(self.network.to_csr()[0], graph)
+        self.network.build_network(self.network.s_data)
+        self.assertIsNot(self.network.to_csr()[0], graph)
+
+    def test_to_csr_shortest_parallel(self):
+        node_xy = [[0, 0], [1, 0]]
+        args = [0, 1, 0], [1, 0, 1], [3.0, 2.0, 2.0], node_xy
+        network = tigernet.Network.from_edgelist(*args)
+        graph, segment_id = network.to_csr()
+        self.assertEqual(graph[0, 1], 2.0)
+        self.assertEqual(segment_id.tolist(), [1, 1])
+
+    @unittest.skipIf(networkx is None, "networkx is not installed.")
+    def test_to_networkx(self):
+        graph = self.network.to_networkx()
+        self.assertEqual(sorted(graph.nodes), self.network.n_ids)
+        self.assertEqual(graph.number_of_edges(), 2)
+        self.assertEqual(graph.edges[0, 1]["length"], 4.5)
+        self.assertEqual(graph.edges[1, 2]["SegID"], 2)
+
+    @unittest.skipIf(igraph is None, "python-igraph is not installed.")
+    def test_to_igraph(self):
+        graph = self.network.to_igraph()
+        self.assertEqual(graph.vcount(), 3)
+        self.assertEqual(graph.ecount(), 2)
+        self.assertEqual(graph.es["length"], [4.5, 4.5])
+        self.assertEqual(graph.es["SegID"], [0, 2])
+
+
 if __name__ == "__main__":
     unittest.main()
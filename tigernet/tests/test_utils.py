@@ -9,6 +9,7 @@ import geopandas
 import numpy
 import operator
 import pandas
+import pickle
 import unittest
 from shapely.geometry import LineString, MultiLineString
 
@@ -393,5 +394,192 @@ class TestUtilSplitLine(unittest.TestCase):
                 self.assertEqual(list(observed_case54[lidx].xy[cidx]), coord)
 
 
+class TestUtilArrayLookup(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_1x1_no_args)
+
+    def test_lazy(self):
+        lookup = utils.ArrayLookup([0, 2, 5], values=numpy.array([1.0, 2.0, 3.0]))
+        self.assertIsNone(lookup._position)
+        self.assertEqual(len(lookup), 3)
+        self.assertEqual(lookup[5], 3.0)
+        self.assertIsNotNone(lookup._position)
+
+    def test_dict_like(self):
+        lookup = utils.ArrayLookup([0, 2, 5], values=numpy.array([1.0, 2.0, 3.0]))
+        self.assertEqual(lookup, {0: 1.0, 2: 2.0, 5: 3.0})
+        self.assertEqual(list(lookup), [0, 2, 5])
+        self.assertIn(2, lookup)
+        for key in [1, 6, -1, "a"]:
+            self.assertNotIn(key, lookup)
+            with self.assertRaises(KeyError):
+                lookup[key]
+        with self.assertRaises(TypeError):
+            lookup[0] = 4.0
+
+    def test_coords(self):
+        known_segm2coords = {
+            0: [(4.5, 0.0), (4.5, 4.5)],
+            1: [(4.5, 4.5), (4.5, 9.0)],
+            2: [(0.0, 4.5), (4.5, 4.5)],
+            3: [(4.5, 4.5), (9.0, 4.5)],
+        }
+        observed_segm2coords = self.network.segm2coords
+        self.assertIsInstance(observed_segm2coords, utils.ArrayLookup)
+        self.assertEqual(observed_segm2coords, known_segm2coords)
+
+        known_node2coords = [(4.5, 4.5)]
+        observed_node2coords = self.network.node2coords[1]
+        self.assertEqual(observed_node2coords, known_node2coords)
+
+    def test_pickle(self):
+        self.network.segm2len[0]
+        segm2len = pickle.loads(pickle.dumps(self.network.segm2len))
+        self.assertIsNone(segm2len._position)
+        self.assertEqual(segm2len, self.network.segm2len)
+
+    def test_bad_sources(self):
+        with self.assertRaises(ValueError):
+            utils.ArrayLookup([0], values=[1.0], geoms=[None])
+
+
+class TestUtilAdjacencyStore(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_1x1_no_args)
+        # segments 0 & 1 are parallel, segment 2 is a ring
+        self.store = utils.AdjacencyStore(
+            [0, 1, 2, 4], [[1, 0], [0, 1], [3, 3], [1, 3]], [0, 1, 3]
+        )
+
+    def test_arrays(self):
+        known_endpoints = numpy.array([[0, 1], [0, 1], [3, 3], [1, 3]])
+        observed_endpoints = self.store.endpoints
+        self.assertEqual(observed_endpoints.dtype, numpy.int32)
+        numpy.testing.assert_array_equal(observed_endpoints, known_endpoints)
+
+        indptr, indices = self.store.node2segm
+        numpy.testing.assert_array_equal(indptr, [0, 2, 5, 7])
+        numpy.testing.assert_array_equal(indices, [0, 1, 0, 1, 4, 2, 4])
+
+        known_degrees = [2, 3, 3]
+        self.assertEqual(self.store.degrees().tolist(), known_degrees)
+
+    def test_neighbors(self):
+        self.assertEqual(self.store.neighbors("segm2segm", 1), [0, 4])
+        self.assertEqual(self.store.neighbors("segm2segm", 2), [4])
+        self.assertEqual(self.store.neighbors("node2node", 3), [1])
+        with self.assertRaises(KeyError):
+            self.store.neighbors("node2segm", 2)
+
+    def test_subset(self):
+        store = self.store.subset([0, 1], [0, 1])
+        self.assertEqual(store.segm_ids.tolist(), [0, 1])
+        self.assertEqual(store.lists("node2node"), [[1], [0]])
+
+    def test_bad_endpoints(self):
+        with self.assertRaises(ValueError):
+            utils.AdjacencyStore([0], [[0, 5]], [0, 1])
+        with self.assertRaises(ValueError):
+            utils.AdjacencyStore([0, 1], [[0, 1]], [0, 1])
+
+    def test_endpoint_nodes(self):
+        known_segm_nodes = [[0, 1], [1, 2], [3, 1], [1, 4]]
+        observed_segm_nodes = utils.endpoint_nodes(self.network)
+        self.assertEqual(observed_segm_nodes.tolist(), known_segm_nodes)
+
+        self.network.segm2xyid[2] = self.network.segm2xyid[2][:1] + ["x9.0y9.0"]
+        with self.assertRaises(AssertionError):
+            utils.endpoint_nodes(self.network)
+
+    def test_neighbor_distances(self):
+        known_neighbors = {
+            v: list(utils.get_neighbor_distances(self.network, v).items())
+            for v in self.network.n_ids
+        }
+        observed_neighbors = utils.neighbor_distances(self.network)
+        self.assertEqual(observed_neighbors, known_neighbors)
+
+        # modified lookups are read through the views
+        self.network.node2segm[1] = [0, 1]
+        observed_neighbors = utils.neighbor_distances(self.network)
+        self.assertEqual(observed_neighbors[1], [(0, 4.5), (2, 4.5)])
+
+    def test_valency_col_deprecated(self):
+        known_degrees = utils.calc_valency(self.network)
+        with self.assertWarns(FutureWarning):
+            observed_degrees = utils.calc_valency(self.network, col="n_neigh")
+        self.assertEqual(observed_degrees, known_degrees)
+
+    def test_network_views(self):
+        known_segm2node = {0: [0, 1], 1: [1, 2], 2: [1, 3], 3: [1, 4]}
+        observed_segm2node = self.network.segm2node
+        self.assertIsInstance(observed_segm2node, utils.AdjacencyView)
+        self.assertIs(observed_segm2node.store, utils.topology(self.network))
+        self.assertEqual(observed_segm2node, known_segm2node)
+        self.assertEqual(self.network.node2segm[1], [0, 1, 2, 3])
+
+    def test_view_assignment(self):
+        node2segm = self.network.node2segm
+        node2segm[1] = [0, 1]
+        node2segm[9] = [3]
+        del node2segm[0]
+        self.assertFalse(node2segm.clean)
+        self.assertEqual(list(node2segm), [1, 2, 3, 4, 9])
+        self.assertEqual(node2segm[1], [0, 1])
+        with self.assertRaises(KeyError):
+            node2segm[0]
+        # the store is unaltered
+        self.assertEqual(node2segm.store.neighbors("node2segm", 0), [0])
+
+    def test_topology_rebuilt(self):
+        self.network.segm2node = dict(self.network.segm2node)
+        del self.network.segm2node[3]
+        store = utils.topology(self.network)
+        self.assertIsNot(store, self.network._topology)
+        self.assertEqual(store.segm_ids.tolist(), [0, 1, 2])
+
+
+class TestUtilSharedNetwork(unittest.TestCase):
+    def setUp(self):
+        self.network = copy.deepcopy(network_lattice_1x1_no_args)
+        self.network.cost_matrix()
+
+    def test_handle(self):
+        with self.network.share() as handle:
+            # only the block names & array specifications are pickled
+            observed_size = len(pickle.dumps(handle))
+            self.assertLess(observed_size, handle.nbytes + 1000)
+            attached = pickle.loads(pickle.dumps(handle)).attach()
+            self.assertEqual(attached.sid_name, self.network.sid_name)
+            self.assertEqual(attached.xyid, self.network.xyid)
+
+    def test_attached_network(self):
+        with self.network.share() as handle:
+            attached = handle.attach()
+            self.assertEqual(attached.s_ids, self.network.s_ids)
+            self.assertEqual(attached.n_ids, self.network.n_ids)
+            for kind in ["segm2segm", "node2node", "segm2node", "node2segm"]:
+                known = getattr(self.network, kind)
+                observed = getattr(attached, kind)
+                self.assertEqual({k: observed[k] for k in known}, dict(known))
+            for segm, geom in self.network.s_data.geometry.items():
+                self.assertTrue(attached.segm2geom[segm].equals(geom))
+            numpy.testing.assert_array_equal(
+                attached.n2n_matrix, self.network.n2n_matrix
+            )
+
+            # the shared arrays are read-only
+            with self.assertRaises(ValueError):
+                attached.n2n_matrix[0, 1] = -1.0
+
+    def test_close(self):
+        handle = self.network.share(matrix=False)
+        names = list(handle.specs)
+        self.assertNotIn("n2n_matrix", names)
+        handle.close()
+        with self.assertRaises(FileNotFoundError):
+            handle.attach()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -6,10 +6,16 @@ from . import stats
 from . import info
 from .generate_data import generate_xyid
 
+import collections
 import copy
+import geopandas
+import numpy
+import os
+import scipy.sparse
 import warnings
+import zipfile
 
-from libpysal import cg
+from scipy.spatial import cKDTree
 
 
 __author__ = "James D. Gaboardi <jgaboardi@gmail.com>"
@@ -46,6 +52,9 @@ class Network:
         largest_component=False,
         calc_stats=False,
         def_graph_elems=False,
+        cache_dir=None,
+        cache_size=None,
+        profile=False,
     ):
         """
         Parameters
@@ -118,20 +127,38 @@ class Network:
             Calculate network stats. Default is ``False``.
         def_graph_elems : bool
             Define graph elements. Default is ``False``.
+        cache_dir : str
+            Directory for caching built networks and cost matrices. Networks are
+            keyed on a hash of the input geometries, attributes, and the parameters
+            above, so rebuilding an identical network loads the cached one.
+            Default is ``None``, which disables caching.
+        cache_size : int
+            Maximum size of ``cache_dir`` in bytes. The least recently used entries
+            are evicted first. Default is ``None``, which never evicts.
+        profile : {bool, callable}
+            Record the wall time, CPU time, peak traced memory, and element counts
+            of each build stage in ``build_profile``. Later calls to
+            ``simplify_network()`` and ``cost_matrix()`` are recorded as well.
+            A callable is used as a hook that receives each stage record as it
+            completes. See ``utils.BuildProfile``. Default is ``False``.
 
         Attributes
         ----------
+        cache_key : str
+            Hash of the network input (only when ``cache_dir`` is set).
+        from_cache : bool
+            The network was loaded from ``cache_dir``.
         segm2xyid : dict
             Segment to xyID lookup.
         node2xyid : dict
             Node to xyID lookup.
-        segm2node : dict
+        segm2node : tigernet.utils.AdjacencyView
             Segment to node lookup.
-        node2segm : dict
+        node2segm : tigernet.utils.AdjacencyView
             Node to segment lookup.
-        segm2segm : dict
+        segm2segm : tigernet.utils.AdjacencyView
             Segment to segment lookup.
-        node2node : dict
+        node2node : tigernet.utils.AdjacencyView
             Node to node lookup.
         segm_cc : dict
             Root segment ID to connected component segment IDs lookup.
@@ -153,32 +180,52 @@ class Network:
             Network segment count.
         n_node : int
             Network node count.
-        segm2len : dict
+        segm2len : tigernet.utils.ArrayLookup
             Segment to segment length lookup.
         network_length : float
             Full network length.
         node2degree : dict
             Node to node degree lookup.
-        segm2tlid : dict
+        segm2tlid : tigernet.utils.ArrayLookup
             Segment to TIGER/Line ID lookup.
         segm2elem : dict
             Segment to network element lookup.
         node2elem : dict
             Node to network element lookup.
-        diameter : float
+        diameter : list
             The longest shortest path between two nodes in the network.
-        radius : float
+            Without a dense ``n2n_matrix`` this is found with
+            ``stats.bounding_diameter()`` on the largest connected component.
+        radius : list
             The shortest path between two nodes in the network.
+        graph_radius : list
+            The minimum node eccentricity and its center node. With a dense
+            ``n2n_matrix`` this is taken from the matrix for the whole network
+            (``numpy.inf`` when it is disconnected), like ``diameter``. See
+            ``stats.eccentricity_radius()``. Otherwise it is found with
+            ``stats.bounding_diameter()`` on the largest connected component.
         d_net : float
             Cumulative network diameter.
         d_euc : float
             Cumulative euclidean diameter.
         circuity : float
             Network circuity. See ``stats.circuity()``.
-        n2n_matrix : numpy.array
+        circuity_ci : tuple
+            Confidence interval of a sampled circuity estimate.
+            See ``stats.sampled_circuity()``.
+        n2n_matrix : {numpy.array, utils.TriangularMatrix}
             All node-to-node shortest path lengths in the network.
         n2n_paths : dict
             All node-to-node shortest paths in the network.
+        n2n_preds : numpy.ndarray
+            All node-to-node shortest path predecessors in the network.
+        contraction_hierarchy : tigernet.utils.ContractionHierarchy
+            Preprocessed hierarchy for point-to-point queries.
+            See ``build_contraction_hierarchy()``.
+        landmarks : numpy.ndarray
+            Landmark node IDs. See ``build_landmarks()``.
+        landmark_dists : numpy.ndarray
+            ``float32`` network distances from each landmark to all nodes.
         max_sinuosity : float
             Maximum segment sinuosity.
         min_sinuosity : float
@@ -207,20 +254,26 @@ class Network:
             Segment/Node ID to {variable/attribute} entropies.
         network_entropy_{} : float
             Network {variable/attribute} entropy.
+        {}_entropies_by_{} : dict
+            Group to {variable/attribute} entropies. See ``calc_entropy(by=...)``.
+        network_{}_entropy_by_{} : dict
+            Group to network {variable/attribute} entropy.
         corrected_rings : int
             Number of corrected rings in the network.
         lines_split : int
             Number of split lines in the network.
         welded_mls : int
             Number of welded multilinestrings in the network.
-        segm2geom : dict
+        segm2geom : tigernet.utils.ArrayLookup
             Segment to geometry lookup.
-        node2geom : dict
+        node2geom : tigernet.utils.ArrayLookup
             Node to geometry lookup.
-        segm2coords : dict
+        segm2coords : tigernet.utils.ArrayLookup
             Segment to endpoint coordinates lookup.
-        node2coords : dict
+        node2coords : tigernet.utils.ArrayLookup
             Node to coordinates lookup.
+        build_profile : pandas.DataFrame
+            Per-stage build profile (only when ``profile`` is set).
 
         Examples
         --------
@@ -263,6 +316,30 @@ class Network:
 
         """
 
+        # record build stages if desired
+        params = dict(locals())
+        self._profiler = None
+        if profile:
+            hook = profile if callable(profile) else None
+            self._profiler = utils.BuildProfile(hook=hook)
+
+        # load a previously built network if the input is in the cache
+        self.cache_dir, self.cache_size = cache_dir, cache_size
+        self.from_cache = False
+        if self.cache_dir:
+            for k in ["self", "s_data", "cache_dir", "cache_size", "profile"]:
+                del params[k]
+            cache_key = utils.hash_input(s_data, params, geo_col=geo_col)
+            with utils.profile_stage(self, "read_cache"):
+                cached = utils.read_cache(self.cache_dir, cache_key)
+            if cached is not None:
+                profiler = self._profiler
+                self.__setstate__(cached)
+                self.cache_dir, self.cache_size = cache_dir, cache_size
+                self.from_cache, self._profiler = True, profiler
+                return
+            self.cache_key = cache_key
+
         self.s_data = s_data
         self.xyid, self.from_raw = xyid, from_raw
         self.sid_name, self.nid_name = sid_name, nid_name
@@ -292,7 +369,8 @@ class Network:
             self.skip_restr = skip_restr
 
             # freshly cleaned segments
-            utils.tiger_netprep(self, calc_len)
+            with utils.profile_stage(self, "tiger_netprep"):
+                utils.tiger_netprep(self, calc_len)
 
         # build a network object from segments
         self.build_network(
@@ -303,10 +381,275 @@ class Network:
             def_graph_elems=def_graph_elems,
         )
 
+        if self.cache_dir:
+            with utils.profile_stage(self, "write_cache"):
+                utils.write_cache(
+                    {k: v for k, v in self.__getstate__().items() if k != "_profiler"},
+                    self.cache_dir,
+                    self.cache_key,
+                    cache_size=self.cache_size,
+                )
+
     ###########################################################################
     ########################    end __init__    ###############################
     ###########################################################################
 
+    @property
+    def build_profile(self):
+        """Per-stage build profile as a ``pandas.DataFrame`` (``None`` unless the
+        network was created with ``profile`` set). See ``utils.BuildProfile``."""
+
+        profiler = getattr(self, "_profiler", None)
+        if profiler is None:
+            return None
+
+        return profiler.frame()
+
+    @classmethod
+    def from_arrays(
+        cls,
+        coords,
+        offsets,
+        attrs=None,
+        record_components=False,
+        largest_component=False,
+        record_geom=False,
+        def_graph_elems=False,
+        sid_name="SegID",
+        nid_name="NodeID",
+        geo_col="geometry",
+        len_col="length",
+        xyid="xyid",
+        profile=False,
+    ):
+        """Create a network directly from a ragged array of segment coordinates,
+        without first creating a ``geopandas.GeoDataFrame`` of lines. Nodes are
+        extracted from the segment endpoints as in ``build_base()``.
+
+        Parameters
+        ----------
+        coords : array-like
+            Coordinates of all segment vertices in the form ``[[x1, y1], ...]``.
+        offsets : array-like
+            Position of the first vertex of each segment in ``coords``, followed
+            by the total number of vertices (``len(coords)``).
+        attrs : {dict, pandas.DataFrame}
+            Segment attributes, one record per segment. Default is ``None``.
+        record_components : bool
+            See ``build_network()``. Default is ``False``.
+        largest_component : bool
+            See ``build_network()``. Default is ``False``.
+        record_geom : bool
+            Create the segment and node geometries (in ``s_data`` and ``n_data``)
+            and an ID to geometry lookup (``True``), or ignore (``False``).
+            Geometries are required for ``simplify_network()`` and
+            ``Observations``. Default is ``False``.
+        def_graph_elems : bool
+            See ``build_network()``. Default is ``False``.
+        sid_name : str
+            Segment column name. Default is ``'SegID'``.
+        nid_name : str
+            Node column name. Default is ``'NodeID'``.
+        geo_col : str
+            Geometry column name. Default is ``'geometry'``.
+        len_col : str
+            Length column name. Default is ``'length'``.
+        xyid : str
+            Combined x-coord + y-coords string ID. Default is ``'xyid'``.
+        profile : {bool, callable}
+            See ``Network``. Default is ``False``.
+
+        Returns
+        -------
+        net : tigernet.Network
+            The network object.
+
+        Examples
+        --------
+
+        >>> import tigernet
+        >>> coords = [[0, 0], [1, 0], [1, 0], [1, 1], [2, 1], [1, 0], [2, 0]]
+        >>> net = tigernet.Network.from_arrays(coords, [0, 2, 5, 7])
+        >>> net.segm2node
+        {0: [0, 1], 1: [1, 2], 2: [1, 3]}
+        >>> net.segm2len[1]
+        2.0
+
+        """
+
+        coords, offsets = utils.check_arrays(coords, offsets)
+        node_xy, segm_nodes = utils.array_nodes(coords, offsets)
+        lengths = utils.array_lengths(coords, offsets)
+
+        net = cls._from_array_parts(
+            coords,
+            offsets,
+            node_xy,
+            segm_nodes,
+            lengths,
+            attrs,
+            [record_components, largest_component, record_geom, def_graph_elems],
+            [sid_name, nid_name, geo_col, len_col, xyid],
+            profile,
+        )
+
+        return net
+
+    @classmethod
+    def from_edgelist(
+        cls,
+        u,
+        v,
+        length,
+        node_xy,
+        attrs=None,
+        record_components=False,
+        largest_component=False,
+        record_geom=False,
+        def_graph_elems=False,
+        sid_name="SegID",
+        nid_name="NodeID",
+        geo_col="geometry",
+        len_col="length",
+        xyid="xyid",
+        profile=False,
+    ):
+        """Create a network directly from an edge list. Each edge becomes a
+        straight segment between its nodes, which keep their positional IDs
+        in ``node_xy``.
+
+        Parameters
+        ----------
+        u : array-like
+            The start node of each edge.
+        v : array-like
+            The end node of each edge.
+        length : array-like
+            The length of each edge, e.g. along its real world geometry.
+        node_xy : array-like
+            Node coordinates in the form ``[[x1, y1], ...]``.
+        attrs : {dict, pandas.DataFrame}
+            See ``from_arrays()``. Default is ``None``.
+        record_components : bool
+            See ``build_network()``. Default is ``False``.
+        largest_component : bool
+            See ``build_network()``. Default is ``False``.
+        record_geom : bool
+            See ``from_arrays()``. Default is ``False``.
+        def_graph_elems : bool
+            See ``build_network()``. Default is ``False``.
+        sid_name : str
+            Segment column name. Default is ``'SegID'``.
+        nid_name : str
+            Node column name. Default is ``'NodeID'``.
+        geo_col : str
+            Geometry column name. Default is ``'geometry'``.
+        len_col : str
+            Length column name. Default is ``'length'``.
+        xyid : str
+            Combined x-coord + y-coords string ID. Default is ``'xyid'``.
+        profile : {bool, callable}
+            See ``Network``. Default is ``False``.
+
+        Returns
+        -------
+        net : tigernet.Network
+            The network object.
+
+        Examples
+        --------
+
+        >>> import tigernet
+        >>> node_xy = [[0, 0], [1, 0], [1, 1]]
+        >>> net = tigernet.Network.from_edgelist([0, 2], [1, 1], [1.0, 1.5], node_xy)
+        >>> net.node2segm
+        {0: [0], 1: [0, 1], 2: [1]}
+        >>> net.network_length
+        2.5
+
+        """
+
+        u, v = numpy.asarray(u, dtype=numpy.int64), numpy.asarray(v, dtype=numpy.int64)
+        lengths = numpy.asarray(length, dtype=float)
+        node_xy = numpy.asarray(node_xy, dtype=float)
+
+        if not u.shape == v.shape == lengths.shape or u.ndim != 1:
+            msg = "'u', 'v', and 'length' must be 1-dimensional and of equal size."
+            raise ValueError(msg)
+        if node_xy.ndim != 2 or node_xy.shape[1] != 2:
+            msg = "'node_xy' must be of shape (n, 2), not %s." % str(node_xy.shape)
+            raise ValueError(msg)
+        segm_nodes = numpy.column_stack([u, v])
+        if segm_nodes.size and (
+            segm_nodes.min() < 0 or segm_nodes.max() >= node_xy.shape[0]
+        ):
+            msg = "Edge nodes must be positions in 'node_xy' "
+            msg += "(0 to %s)." % (node_xy.shape[0] - 1)
+            raise IndexError(msg)
+
+        # each edge is a straight segment between its nodes
+        coords = node_xy[segm_nodes].reshape(-1, 2)
+        offsets = numpy.arange(0, coords.shape[0] + 1, 2)
+
+        net = cls._from_array_parts(
+            coords,
+            offsets,
+            node_xy,
+            segm_nodes,
+            lengths,
+            attrs,
+            [record_components, largest_component, record_geom, def_graph_elems],
+            [sid_name, nid_name, geo_col, len_col, xyid],
+            profile,
+        )
+
+        return net
+
+    @classmethod
+    def _from_array_parts(
+        cls, coords, offsets, node_xy, segm_nodes, lengths, attrs, build, names, profile
+    ):
+        """Instantiate a network from arrays. See ``from_arrays()``."""
+
+        net = cls.__new__(cls)
+
+        # record build stages if desired
+        net._profiler = None
+        if profile:
+            hook = profile if callable(profile) else None
+            net._profiler = utils.BuildProfile(hook=hook)
+
+        net.cache_dir, net.cache_size, net.from_cache = None, None, False
+        net.sid_name, net.nid_name, net.geo_col, net.len_col, net.xyid = names
+        net.from_raw = False
+
+        # TIGER variable attributes
+        net.tnid, net.tnidf, net.tnidt = "TNID", "TNIDF", "TNIDT"
+        net.attr1, net.attr2, net.tlid = None, None, None
+        net.mtfcc_types = info.get_mtfcc_types()
+        net.mtfcc_discard = info.get_discard_mtfcc_by_desc()
+        net.discard_segs = None
+
+        # build a network object from arrays
+        record_components, largest_component, record_geom, def_graph_elems = build
+        net.clear_indexes()
+        with utils.profile_stage(net, "build_network"):
+            with utils.profile_stage(net, "build_base"):
+                utils.array_base(net, coords, offsets, node_xy, lengths, attrs=attrs)
+            with utils.profile_stage(net, "build_topology"):
+                utils.array_topology(net, segm_nodes)
+            if record_components:
+                with utils.profile_stage(net, "build_components"):
+                    net.build_components(largest_cc=largest_component)
+            with utils.profile_stage(net, "build_associations"):
+                _args = coords, offsets, node_xy, lengths
+                utils.array_associations(net, *_args, record_geom=record_geom)
+            if def_graph_elems:
+                with utils.profile_stage(net, "define_graph_elements"):
+                    net.define_graph_elements()
+
+        return net
+
     def build_network(
         self,
         s_data,
@@ -339,13 +682,22 @@ class Network:
 
         """
 
-        self.build_base(s_data)
-        self.build_topology()
-        if record_components:
-            self.build_components(largest_cc=largest_component)
-        self.build_associations(record_geom=record_geom)
-        if def_graph_elems:
-            self.define_graph_elements()
+        # clear the search adjacency and spatial indexes of any previous build
+        self.clear_indexes()
+
+        with utils.profile_stage(self, "build_network"):
+            with utils.profile_stage(self, "build_base"):
+                self.build_base(s_data)
+            with utils.profile_stage(self, "build_topology"):
+                self.build_topology()
+            if record_components:
+                with utils.profile_stage(self, "build_components"):
+                    self.build_components(largest_cc=largest_component)
+            with utils.profile_stage(self, "build_associations"):
+                self.build_associations(record_geom=record_geom)
+            if def_graph_elems:
+                with utils.profile_stage(self, "define_graph_elements"):
+                    self.define_graph_elements()
 
     def build_base(self, s_data):
         """Extract nodes from segment endpoints and relate
@@ -367,15 +719,17 @@ class Network:
             self.s_data[self.len_col] = getattr(self.s_data, self.len_col)
 
         # create segment xyid
-        self.segm2xyid = generate_xyid(
-            df=self.s_data, geom_type="segm", geo_col=self.geo_col
-        )
-        _skws = {"idx": self.sid_name, "col": self.xyid}
-        self.s_data = utils.fill_frame(self.s_data, self.segm2xyid, **_skws)
+        with utils.profile_stage(self, "generate_xyid"):
+            self.segm2xyid = generate_xyid(
+                df=self.s_data, geom_type="segm", geo_col=self.geo_col
+            )
+            _skws = {"idx": self.sid_name, "col": self.xyid}
+            self.s_data = utils.fill_frame(self.s_data, self.segm2xyid, **_skws)
 
         # Instantiate nodes dataframe as part of NetworkClass
-        self.n_data = utils.extract_nodes(self)
-        self.n_data.reset_index(drop=True, inplace=True)
+        with utils.profile_stage(self, "extract_nodes"):
+            self.n_data = utils.extract_nodes(self)
+            self.n_data.reset_index(drop=True, inplace=True)
 
         # create permanent node xyid
         self.node2xyid = generate_xyid(
@@ -388,41 +742,27 @@ class Network:
         utils.set_ids(self)
 
     def build_topology(self):
-        """Relate all graph elements."""
-
-        # Associate segments with neighboring nodes
-        _pri_sec = {"primary": self.segm2xyid, "secondary": self.node2xyid}
-        self.segm2node = utils.associate(assoc="segm2node", **_pri_sec)
-
-        # Associate nodes with neighboring segments
-        _pri_sec = {"primary": self.node2xyid, "secondary": self.segm2xyid}
-        self.node2segm = utils.associate(assoc="node2segm", **_pri_sec)
+        """Relate all graph elements. The relations are held in an array store
+        (see ``utils.AdjacencyStore``) and ``segm2node``, ``node2segm``,
+        ``segm2segm``, and ``node2node`` are views of it."""
 
-        # Associate segments with neighboring segments
-        self.segm2segm = utils.get_neighbors(self.segm2node, self.node2segm)
+        with utils.profile_stage(self, "associate"):
+            # Associate segments with their start and end nodes
+            segm_nodes = utils.endpoint_nodes(self)
 
-        # Associate nodes with neighboring nodes
-        self.node2node = utils.get_neighbors(self.node2segm, self.segm2node)
+        with utils.profile_stage(self, "get_neighbors"):
+            # Associate nodes with segments, and segments & nodes with neighbors
+            store = utils.AdjacencyStore(self.s_ids, segm_nodes, self.n_ids)
+            utils.set_topology(self, store)
 
         # 1. Catch cases w/ >= 3 neighboring nodes for a segment and throw an error.
         # 2. Catch rings and add start & end node.
-        self = utils.assert_2_neighs(self)
-
-        # fill dataframe with seg2seg
-        _skws = {"idx": self.sid_name, "col": "s_neigh"}
-        self.s_data = utils.fill_frame(self.s_data, self.segm2segm, **_skws)
-
-        # fill dataframe with seg2node
-        _skws = {"idx": self.sid_name, "col": "n_neigh"}
-        self.s_data = utils.fill_frame(self.s_data, self.segm2node, **_skws)
+        with utils.profile_stage(self, "assert_2_neighs"):
+            self = utils.assert_2_neighs(self)
 
-        # fill dataframe with node2seg
-        _nkws = {"idx": self.nid_name, "col": "s_neigh"}
-        self.n_data = utils.fill_frame(self.n_data, self.node2segm, **_nkws)
-
-        # fill dataframe with node2node
-        _nkws = {"idx": self.nid_name, "col": "n_neigh"}
-        self.n_data = utils.fill_frame(self.n_data, self.node2node, **_nkws)
+        with utils.profile_stage(self, "fill_frame"):
+            # fill dataframes with seg2seg, seg2node, node2seg, and node2node
+            utils.fill_topology(self)
 
     def build_components(self, largest_cc=False):
         """Find the rooted connected components of the graph (either largest or longest).
@@ -491,18 +831,22 @@ class Network:
         utils.geom_assoc(self, coords=True)
 
         # associate segments with length
-        self.segm2len = utils.xwalk(self.s_data, c1=self.sid_name, c2=self.len_col)
+        _skeys = self.s_data[self.sid_name].values
+        self.segm2len = utils.ArrayLookup(
+            _skeys, values=self.s_data[self.len_col].values
+        )
 
         # total length
-        self.network_length = sum([v for k, v in self.segm2len.items()])
+        self.network_length = sum(self.s_data[self.len_col].tolist())
 
         # Calculate degree for n_ids -- incident segs +1; incident loops +2
-        self.node2degree = utils.calc_valency(self, col="n_neigh")
+        self.node2degree = utils.calc_valency(self)
         self.n_data["degree"] = self.n_data[self.nid_name].map(self.node2degree)
 
         # Create segment to TIGER/Line ID lookup
         if self.tlid:
-            self.segm2tlid = utils.xwalk(self.s_data, c1=self.sid_name, c2=self.tlid)
+            _tlids = self.s_data[self.tlid].values
+            self.segm2tlid = utils.ArrayLookup(_skeys, values=_tlids)
 
     def define_graph_elements(self):
         """Define all segments and nodes as either a leaf (incident with one other
@@ -553,34 +897,36 @@ class Network:
         else:
             simp_net = self
 
-        # Create simplified road segments (remove non-articulation points)
-        simp_segms = utils.simplify(simp_net)
+        with utils.profile_stage(simp_net, "simplify_network"):
+            # Create simplified road segments (remove non-articulation points)
+            with utils.profile_stage(simp_net, "simplify"):
+                simp_segms = utils.simplify(simp_net)
 
-        # Reset index and SegIDX to match
-        simp_segms.reset_index(drop=True, inplace=True)
-        simp_segms = utils.add_ids(simp_segms, id_name=simp_net.sid_name)
-        simp_segms = utils.label_rings(simp_segms, geo_col=simp_net.geo_col)
-        simp_segms = utils.ring_correction(simp_net, simp_segms)
+            # Reset index and SegIDX to match
+            simp_segms.reset_index(drop=True, inplace=True)
+            simp_segms = utils.add_ids(simp_segms, id_name=simp_net.sid_name)
+            simp_segms = utils.label_rings(simp_segms, geo_col=simp_net.geo_col)
+            simp_segms = utils.ring_correction(simp_net, simp_segms)
 
-        # add xyid
-        segm2xyid = generate_xyid(
-            df=simp_segms, geom_type="segm", geo_col=simp_net.geo_col
-        )
-        simp_segms = utils.fill_frame(simp_segms, segm2xyid, col=simp_net.xyid)
-
-        # build a network object from simplified segments
-        simp_net.build_network(
-            simp_segms,
-            record_geom=record_geom,
-            record_components=record_components,
-            largest_component=largest_component,
-            def_graph_elems=def_graph_elems,
-        )
+            # add xyid
+            segm2xyid = generate_xyid(
+                df=simp_segms, geom_type="segm", geo_col=simp_net.geo_col
+            )
+            simp_segms = utils.fill_frame(simp_segms, segm2xyid, col=simp_net.xyid)
+
+            # build a network object from simplified segments
+            simp_net.build_network(
+                simp_segms,
+                record_geom=record_geom,
+                record_components=record_components,
+                largest_component=largest_component,
+                def_graph_elems=def_graph_elems,
+            )
 
         if not inplace:
             return simp_net
 
-    def calc_net_stats(self, conn_stat=None):
+    def calc_net_stats(self, conn_stat=None, circuity_sources=None):
         """Calculate network analyis descriptive statistics.
 
         Parameters
@@ -589,6 +935,10 @@ class Network:
             Either ``'alpha'``, ``'beta'``, ``'gamma'``, ``'eta'``.
             Set to ``'all'`` toc calculate all available statistics.
             For descriptions see ``stats.connectivity()``.
+        circuity_sources : int
+            Without a dense ``n2n_matrix``, estimate circuity from this many
+            sampled source nodes. See ``stats.sampled_circuity()``.
+            Default is ``None``.
 
         """
 
@@ -606,6 +956,13 @@ class Network:
                 msg += " 'build_components' method and run again."
                 raise AttributeError(msg)
 
+        def _sample_circuity(n_sources: int):
+            """Estimate circuity without all node pairs and set as attributes."""
+
+            if n_sources:
+                estimate = stats.sampled_circuity(self, n_sources=n_sources)
+                self.circuity, self.circuity_ci = estimate
+
         # Calculate the sinuosity of network segments and provide descriptive stats
         stats.calc_sinuosity(self)
 
@@ -635,6 +992,15 @@ class Network:
             msg = "The 'Network' has no '%s' attribute. " % mtx_str
             msg += "Run 'cost_matrix()' and try again."
             warnings.warn(msg)
+            # diameter and radius by eccentricity bounding -- no all-pairs
+            self.diameter, self.graph_radius, _ = stats.bounding_diameter(self)
+            _sample_circuity(circuity_sources)
+        elif scipy.sparse.issparse(getattr(self, mtx_str)):
+            msg = "The 'Network' has a sparse (cutoff) '%s' attribute. " % mtx_str
+            msg += "Radius and circuity require all node pairs."
+            warnings.warn(msg)
+            self.diameter, self.graph_radius, _ = stats.bounding_diameter(self)
+            _sample_circuity(circuity_sources)
         else:
             mtx = getattr(self, mtx_str)
 
@@ -644,18 +1010,25 @@ class Network:
             # network radius -- shortest shortest path
             self.radius = stats.dist_metric(mtx, "min")
 
+            # network radius -- minimum node eccentricity
+            self.graph_radius = stats.eccentricity_radius(mtx)
+
             # circuity
             stats.circuity(self)
 
-    def calc_entropy(self, ent_col, frame_name):
+    def calc_entropy(self, ent_col, frame_name, by=None):
         """Network entropy statistics. For descriptions see ``stats.entropies()``.
 
         Parameters
         ----------
-        ent_col : str
-            The column name in ``frame_name`` to calculate entropy on.
+        ent_col : {str, list}
+            The column name(s) in ``frame_name`` to calculate entropy on.
         frame_name : str
             The name of the network element dataframe.
+        by : str
+            Also calculate entropies within each group of this column in
+            ``frame_name``, e.g. ``'CC'`` for connected components.
+            Default is ``None``.
 
         """
 
@@ -665,18 +1038,46 @@ class Network:
         else:
             n_elems = self.n_node
 
-        # calculate local network element entropies
-        indiv_entropies = stats.entropies(ent_col, frame, n_elems)
-        attr_name = "%s_entropies" % ent_col.lower()
-        setattr(self, attr_name, indiv_entropies)
-
-        # calculate global network entropy
-        _entropy = [v for k, v in list(getattr(self, attr_name).items())]
-        network_entropy = sum(_entropy) * -1.0
-        attr_name = "network_%s_entropy" % ent_col.lower()
-        setattr(self, attr_name, network_entropy)
+        columns = [ent_col] if isinstance(ent_col, str) else list(ent_col)
 
-    def cost_matrix(self, wpaths=False, asattr=True):
+        # calculate local network element entropies
+        all_entropies = stats.entropies(columns, frame, n_elems)
+        if by:
+            all_grouped = stats.entropies(columns, frame, n_elems, by=by)
+
+        for col in columns:
+            attr_name = "%s_entropies" % col.lower()
+            setattr(self, attr_name, all_entropies[col])
+
+            # calculate global network entropy
+            _entropy = [v for k, v in list(getattr(self, attr_name).items())]
+            network_entropy = sum(_entropy) * -1.0
+            attr_name = "network_%s_entropy" % col.lower()
+            setattr(self, attr_name, network_entropy)
+
+            # local and global entropies within each group
+            if by:
+                grouped = all_grouped[col]
+                attr_name = "%s_entropies_by_%s" % (col.lower(), by.lower())
+                setattr(self, attr_name, grouped)
+                network_entropy = {
+                    g: sum(e.values()) * -1.0 for g, e in grouped.items()
+                }
+                attr_name = "network_%s_entropy_by_%s" % (col.lower(), by.lower())
+                setattr(self, attr_name, network_entropy)
+
+    def cost_matrix(
+        self,
+        wpaths=False,
+        asattr=True,
+        wpreds=False,
+        path_cache_size=0,
+        dtype="float64",
+        storage="full",
+        cutoff=None,
+        sparse=False,
+        n_jobs=1,
+    ):
         """Network node-to-node cost matrix calculation with options for generating
         shortest paths along tree. For best results the network should be simplified
         prior to running this method.
@@ -688,16 +1089,54 @@ class Network:
         asattr : bool
             Set ``n2n_matrix`` and ``paths`` as attributes of ``Network`` if ``True``,
             otherwise return them. Default is ``True``.
+        wpreds : bool
+            Record shortest paths as a compact ``int32`` predecessor matrix
+            (``n2n_preds``) instead of a paths tree. Individual paths are then
+            reconstructed on demand with ``Network.path()``. Default is ``False``.
+        path_cache_size : int
+            Number of recently requested paths kept by ``Network.path()``.
+            Default is ``0``, which disables the cache.
+        dtype : {str, numpy.dtype}
+            Data type of the cost matrix, e.g. ``'float32'`` to halve its
+            memory footprint. Default is ``'float64'``.
+        storage : str
+            Either ``'full'`` for a dense ``numpy.ndarray`` or ``'triangular'``
+            to store only the upper triangle of the (symmetric) matrix as a
+            ``utils.TriangularMatrix``, which supports ``matrix[i, j]`` and
+            fancy-indexed blocks. Default is ``'full'``.
+        cutoff : {int, float}
+            Only calculate costs between nodes within this network distance
+            with cutoff-limited searches. Pairs beyond the cutoff are
+            ``numpy.inf`` in a dense matrix. Default is ``None``.
+        sparse : bool
+            Return a ``scipy.sparse.csr_matrix`` holding only the pairs within
+            ``cutoff`` (including explicit zeros on the diagonal), so memory
+            scales with the neighborhood size rather than V^2. Pairs that are
+            not stored are beyond the cutoff. Default is ``False``.
+        n_jobs : int
+            The number of worker processes calculating the costs from subsets
+            of the nodes, which attach to the network (and fill the matrix) in
+            shared memory. See ``share()``. ``None`` uses all available CPUs.
+            Default is ``1``.
 
         Returns
         -------
-        n2n_matrix : numpy.ndarray
+        n2n_matrix : {numpy.ndarray, utils.TriangularMatrix, scipy.sparse.csr_matrix}
             Shortest path costs between all nodes.
-        paths : dict
-            Graph traveral paths.
+        paths : {dict, numpy.ndarray}
+            Graph traveral paths (``wpaths=True``) or the
+            predecessor matrix (``wpreds=True``).
 
         """
 
+        if wpaths and wpreds:
+            raise ValueError("Set either 'wpaths' or 'wpreds', not both.")
+        limited = sparse or cutoff is not None
+        if limited and (wpaths or wpreds):
+            msg = "Paths are not recorded for cutoff/sparse cost matrices. "
+            msg += "Set 'wpaths' and 'wpreds' to 'False'."
+            raise ValueError(msg)
+
         # check whether IDs are consecutive and sequential
         i1 = self.s_ids[-1]
         i2 = self.n_segm - 1
@@ -709,20 +1148,367 @@ class Network:
             raise IndexError(msg)
 
         # calculate shortest path length and records paths if desired
-        n2n_matrix, paths = utils.shortest_path(self, gp=wpaths)
+        with utils.profile_stage(self, "cost_matrix"):
+            cache_dir = getattr(self, "cache_dir", None)
+            cached = None
+            if cache_dir:
+                cache_key = utils.hash_network(self)
+                cache_key += "-wpaths%s-wpreds%s" % (wpaths, wpreds)
+                cache_key += "-%s-%s" % (numpy.dtype(dtype).name, storage)
+                if limited:
+                    cache_key += "-cutoff%s-sparse%s" % (cutoff, sparse)
+                cached = utils.read_cache(cache_dir, cache_key, kind="cost_matrix")
+            if cached is not None:
+                n2n_matrix, paths = cached
+            else:
+                if limited:
+                    kws = {"dtype": dtype, "storage": storage, "sparse": sparse}
+                    kws["n_jobs"] = n_jobs
+                    with utils.profile_stage(self, "cutoff_costs"):
+                        n2n_matrix = utils.cutoff_costs(self, cutoff=cutoff, **kws)
+                    paths = {}
+                else:
+                    with utils.profile_stage(self, "shortest_path"):
+                        kws = {"dtype": dtype, "storage": storage, "n_jobs": n_jobs}
+                        n2n_matrix, paths = utils.shortest_path(
+                            self, gp=wpaths, gpred=wpreds, **kws
+                        )
+                if cache_dir:
+                    utils.write_cache(
+                        (n2n_matrix, paths),
+                        cache_dir,
+                        cache_key,
+                        kind="cost_matrix",
+                        cache_size=getattr(self, "cache_size", None),
+                    )
 
         if asattr:
             self.n2n_matrix = n2n_matrix
             if wpaths:
                 self.n2n_paths = paths
+            if wpreds:
+                self.n2n_preds = paths
+            self.path_cache_size = path_cache_size
+            self._path_cache = collections.OrderedDict()
         else:
-            if wpaths:
+            if wpaths or wpreds:
                 return n2n_matrix, paths
             else:
                 return n2n_matrix
 
+    def path(self, source, target, segments=False):
+        """Reconstruct the shortest path between two nodes from either the
+        predecessor matrix (``n2n_preds``) or the paths tree (``n2n_paths``).
+
+        Parameters
+        ----------
+        source : int
+            Origin node ID.
+        target : int
+            Destination node ID.
+        segments : bool
+            Return the traversed segment IDs instead of the node IDs.
+            Default is ``False``.
+
+        Returns
+        -------
+        path : list
+            Node IDs from ``source`` to ``target`` (inclusive) or the segment IDs
+            traversed between them. Empty if ``target`` is not reachable.
+
+        """
+
+        cache = getattr(self, "_path_cache", None)
+        cache_size = getattr(self, "path_cache_size", 0)
+        key = (source, target, segments)
+        if cache_size and key in cache:
+            cache.move_to_end(key)
+            return list(cache[key])
+
+        if hasattr(self, "n2n_preds"):
+            nodes = utils.reconstruct_path(self.n2n_preds[source], source, target)
+        elif hasattr(self, "n2n_paths"):
+            if source != target and self.n2n_matrix[source, target] == numpy.inf:
+                nodes = []
+            elif source == target:
+                nodes = [source]
+            else:
+                nodes = self.n2n_paths[source][target][::-1] + [target]
+        else:
+            msg = "The 'Network' has no 'n2n_preds' or 'n2n_paths' attribute. "
+            msg += "Run 'cost_matrix(wpreds=True)' and try again."
+            raise AttributeError(msg)
+
+        if segments:
+            _path = utils.path_segments(self, nodes)
+        else:
+            _path = nodes
+
+        if cache_size:
+            cache[key] = _path
+            if len(cache) > cache_size:
+                cache.popitem(last=False)
+            _path = list(_path)
+
+        return _path
+
+    def build_contraction_hierarchy(self, witness_limit=500):
+        """Preprocess the network into a contraction hierarchy for fast repeated
+        point-to-point queries. For best results the network should be simplified
+        prior to running this method. See ``utils.ContractionHierarchy``.
+
+        Parameters
+        ----------
+        witness_limit : int
+            The maximum number of nodes settled by each witness search.
+            Default is ``500``.
+
+        """
+
+        self.contraction_hierarchy = utils.ContractionHierarchy(
+            self, witness_limit=witness_limit
+        )
+
+    def build_landmarks(self, n=16, strategy="farthest", n_jobs=1):
+        """Precompute network distances from a small set of landmark nodes.
+        The triangle inequality bounds derived from them tighten the A*
+        heuristic (``shortest_path(method='alt')``) and give fast distance
+        estimates (``distance_bounds()``). See ``utils.landmarks()``.
+
+        Parameters
+        ----------
+        n : int
+            The number of landmarks. Default is ``16``.
+        strategy : str
+            Either ``'farthest'`` or ``'planar'``. Default is ``'farthest'``.
+        n_jobs : int
+            The number of processes used to calculate landmark distances.
+            ``None`` uses all available CPUs. Default is ``1``.
+
+        """
+
+        nodes, dists = utils.landmarks(self, n=n, strategy=strategy, n_jobs=n_jobs)
+        self.landmarks, self.landmark_dists = nodes, dists
+
+    def distance_bounds(self, source, target):
+        """Lower and upper bounds of the network distance between two nodes
+        from the landmark distances.
+
+        Parameters
+        ----------
+        source : int
+            Origin node ID.
+        target : int
+            Destination node ID.
+
+        Returns
+        -------
+        lower : float
+            Lower bound of the network distance.
+        upper : float
+            Upper bound of the network distance (through the best landmark).
+
+        """
+
+        if not hasattr(self, "landmark_dists"):
+            msg = "The 'Network' has no 'landmark_dists' attribute. "
+            msg += "Run 'build_landmarks()' and try again."
+            raise AttributeError(msg)
+
+        dists = self.landmark_dists
+        target_dists = dists[:, target].astype(float)
+        lower = utils.landmark_lower_bounds(dists, source, target_dists)
+        upper = utils.landmark_upper_bound(dists, source, target_dists)
+
+        return lower, upper
+
+    def shortest_path(
+        self,
+        source,
+        target,
+        method="astar",
+        observations=None,
+        destination_observations=None,
+        snap_dist=True,
+    ):
+        """Point-to-point shortest path between two nodes or two snapped
+        observations without calculating the all-pairs ``cost_matrix()``.
+
+        Parameters
+        ----------
+        source : int
+            Origin node ID, or the positional index of the origin in
+            ``observations``.
+        target : int
+            Destination node ID, or the positional index of the destination
+            in ``destination_observations`` (``observations`` if not set).
+        method : str
+            Either ``'astar'`` for an A* search with a Euclidean lower-bound
+            heuristic from ``node2coords``, ``'alt'`` for an A* search with the
+            heuristic tightened by landmark bounds (see ``build_landmarks()``),
+            ``'bidirectional'`` for a bidirectional Dijkstra search,
+            or ``'dijkstra'``. Default is ``'astar'``.
+        observations : tigernet.Observations
+            Snapped origin observations. Default is ``None``.
+        destination_observations : tigernet.Observations
+            Snapped destination observations. Default is ``None``.
+        snap_dist : bool
+            Include the distance from observations to the network.
+            Default is ``True``.
+
+        Returns
+        -------
+        cost : float
+            Shortest path cost (``numpy.inf`` if ``target`` is not reachable).
+        nodes : list
+            Node IDs along the shortest path.
+        segms : list
+            Segment IDs along the shortest path, including the segments
+            observations are snapped to.
+
+        """
+
+        methods = ["astar", "alt", "bidirectional", "dijkstra"]
+        if method not in methods:
+            msg = "Shortest path method '%s' not supported. " % method
+            msg += "Choose from %s." % methods
+            raise ValueError(msg)
+        if method == "alt" and not hasattr(self, "landmark_dists"):
+            msg = "The 'Network' has no 'landmark_dists' attribute. "
+            msg += "Run 'build_landmarks()' and try again."
+            raise AttributeError(msg)
+
+        # describe how the origin and destination attach to the network
+        if observations is None:
+            for node in [source, target]:
+                if node not in self.node2segm:
+                    raise IndexError("Node '%s' is not in the network." % node)
+            src_att = (None, source, 0.0, source, 0.0, 0.0)
+            tgt_att = (None, target, 0.0, target, 0.0, 0.0)
+        else:
+            if not destination_observations:
+                destination_observations = observations
+            kws = {"snap_dist": snap_dist}
+            src_att = utils.obs_attachments(observations, rows=[source], **kws)[0]
+            tgt_att = utils.obs_attachments(
+                destination_observations, rows=[target], **kws
+            )[0]
+
+        seeds = utils.attachment_seeds(src_att)
+        goals = utils.attachment_seeds(tgt_att)
+        direct = utils.same_segment_cost(src_att, tgt_att)
+        if observations is None and source == target:
+            direct = 0.0
+
+        adj = utils.adjacency(self)
+        if method == "bidirectional":
+            search = utils.bidirectional_dijkstra(adj, seeds, goals, direct=direct)
+        else:
+            kws = {"direct": direct, "heuristic": method != "dijkstra"}
+            if method == "alt":
+                kws["landmarks"] = self.landmark_dists
+            search = utils.astar(adj, self.node2coords, seeds, goals, **kws)
+        cost, nodes, segms, n_settled = search
+
+        # include the segments the observations are snapped to
+        if observations is not None and cost != numpy.inf:
+            segms = [src_att[0]] + segms + [tgt_att[0]]
+            segms = [s for i, s in enumerate(segms) if not i or s != segms[i - 1]]
+            segms = [s for s in segms if s is not None]
+        if observations is None and source == target:
+            nodes = [source]
+
+        return cost, nodes, segms
+
+    def service_area(self, sources, cutoff, snap_dist=True):
+        """Network service area (isochrone) of one or more sources from a single
+        multi-source Dijkstra search bounded by ``cutoff``.
+
+        Parameters
+        ----------
+        sources : {list, tigernet.Observations}
+            Source node IDs or snapped observations. Observations snapped to
+            segments seed the search from both segment endpoints with their
+            partial offsets (``dist_a``/``dist_b``).
+        cutoff : {int, float}
+            Maximum network distance from any source.
+        snap_dist : bool
+            Include the distance from observations to the network.
+            Default is ``True``.
+
+        Returns
+        -------
+        nodes : pandas.DataFrame
+            Reached nodes (index) with their network distance (``'dist'``) and
+            nearest source (``'source'``), which is a node ID or an observation
+            key (``df_key``, or the positional index when not set).
+        segms : pandas.DataFrame
+            (Partially) covered segments (index) with their length (``'length'``),
+            covered length (``'covered'``), and full coverage flag (``'full'``).
+
+        """
+
+        if cutoff < 0:
+            raise ValueError("'cutoff' must be non-negative, not %s." % cutoff)
+
+        seeds, inner = [], []
+        if isinstance(sources, Observations):
+            sp = sources.snapped_points
+            labels = sp[sources.df_key] if sources.df_key else range(sp.shape[0])
+            attachments = utils.obs_attachments(sources, snap_dist=snap_dist)
+            for label, att in zip(labels, attachments):
+                seeds += utils.attachment_seeds(att, label=label)
+                segm, node_a, dist_a, node_b, dist_b, snap = att
+                if segm is not None:
+                    inner.append((segm, node_a, dist_a, cutoff - snap))
+        else:
+            for node in sources:
+                if node not in self.node2segm:
+                    raise IndexError("Node '%s' is not in the network." % node)
+                seeds.append((node, 0.0, node))
+
+        nodes, segms = utils.service_area(self, seeds, cutoff, inner=inner)
+
+        return nodes, segms
+
+    def __getstate__(self):
+        """The segment spatial index can not be pickled, so only record
+        that it was built and rebuild it when unpickled. Restricted
+        views are rebuilt lazily."""
+
+        state = self.__dict__.copy()
+        state["_segms_sindex"] = state.get("_segms_sindex") is not None
+        state["_restricted_views"] = {}
+
+        return state
+
+    def __setstate__(self, state):
+        """Restore the network (and rebuild its segment spatial index)."""
+
+        state = dict(state)
+        rebuild_sindex = state.pop("_segms_sindex", False)
+        self.__dict__.update(state)
+        self._segms_sindex = None
+        if rebuild_sindex:
+            self.segms_sindex()
+
+    def clear_indexes(self):
+        """Discard the cached search adjacency, sparse adjacency matrix, node
+        kdtree, segment spatial index, and restricted views. This is done
+        automatically when the network topology changes (``build_network()``,
+        ``simplify_network()``, and ``utils.remove_restricted()``) and the
+        indexes are rebuilt lazily."""
+
+        self._adjacency = None
+        self._csr = None
+        self._nodes_kdtree = None
+        self._segms_sindex = None
+        self._restricted_views = {}
+
     def nodes_kdtree(self, only_coords=False):
         """Build a kdtree from the network node coords for observations lookup.
+        The tree of the network nodes is cached and reused until the network
+        topology changes.
 
         Parameters
         ----------
@@ -731,21 +1517,198 @@ class Network:
 
         Returns
         -------
-        kdtree : scipy.spatial.kdtree.KDTree
+        kdtree : scipy.spatial.cKDTree
             All network nodes lookup.
 
         """
 
         if only_coords:
             geoms = self.n_data[self.geo_col]
-            coords = list(zip(geoms.x, geoms.y))
-            kdtree = cg.KDTree(coords)
+            coords = numpy.column_stack([geoms.x.values, geoms.y.values])
+            kdtree = cKDTree(coords)
         else:
-            coords = [coords[0] for (node, coords) in list(self.node2coords.items())]
-            kdtree = cg.KDTree(coords)
+            kdtree = getattr(self, "_nodes_kdtree", None)
+            if kdtree is None:
+                coords = [coords[0] for coords in self.node2coords.values()]
+                kdtree = cKDTree(numpy.array(coords, dtype=float).reshape(-1, 2))
+                self._nodes_kdtree = kdtree
 
         return kdtree
 
+    def segms_sindex(self):
+        """Build an STRtree spatial index of the network segments. The index
+        is cached and reused until the network topology changes.
+
+        Returns
+        -------
+        sindex : geopandas.sindex.BaseSpatialIndex
+            All network segments lookup. Positions returned by queries
+            refer to the segment IDs in ``s_ids``.
+
+        """
+
+        sindex = getattr(self, "_segms_sindex", None)
+        if sindex is None:
+            if hasattr(self, "segm2geom"):
+                geoms = [self.segm2geom[segm] for segm in self.s_ids]
+            else:
+                geoms = self.s_data.loc[self.s_ids, self.geo_col].values
+            sindex = geopandas.GeoSeries(geoms).sindex
+            self._segms_sindex = sindex
+
+        return sindex
+
+    def share(self, matrix=True):
+        """Place the network topology, node and segment coordinates, segment
+        lengths, and (optionally) the cost matrix in shared memory blocks for
+        ``multiprocessing`` workers. The returned handle is small and picklable,
+        and workers ``attach()`` to it as a read-only network without copying.
+        The blocks are released by ``close()`` of the handle (or when leaving
+        its ``with`` block), so it must stay open while workers use it.
+        See ``utils.share_network()``.
+
+        Parameters
+        ----------
+        matrix : bool
+            Share the network cost matrix (``n2n_matrix``), if calculated.
+            Default is ``True``.
+
+        Returns
+        -------
+        handle : tigernet.utils.SharedNetwork
+            Picklable handle to the shared network.
+
+        Examples
+        --------
+
+        >>> import tigernet
+        >>> lat = tigernet.generate_lattice(n_hori_lines=1, n_vert_lines=1)
+        >>> net = tigernet.Network(s_data=lat)
+        >>> net.cost_matrix()
+        >>> with net.share() as handle:
+        ...     shared = handle.attach()
+        ...     shared.segm2node[3], shared.n2n_matrix[0, 4]
+        ([1, 4], 9.0)
+
+        """
+
+        handle = utils.share_network(self, matrix=matrix)
+
+        return handle
+
+    def to_csr(self):
+        """Sparse (symmetric) adjacency matrix of the network weighted by segment
+        length. The matrix is cached until the network topology changes and
+        should not be modified. See ``utils.csr()``.
+
+        Returns
+        -------
+        graph : scipy.sparse.csr_matrix
+            Segment lengths indexed by node ID. Only the shortest of any
+            parallel segments is kept and self-loops are dropped.
+        segment_id : numpy.ndarray
+            The segment ID of each entry in ``graph.data``.
+
+        Examples
+        --------
+
+        >>> import tigernet
+        >>> lat = tigernet.generate_lattice(n_hori_lines=1, n_vert_lines=1)
+        >>> net = tigernet.Network(s_data=lat)
+        >>> graph, segment_id = net.to_csr()
+        >>> graph[1].toarray()
+        array([[4.5, 0. , 4.5, 4.5, 4.5]])
+        >>> segment_id[graph.indptr[1] : graph.indptr[2]]
+        array([0, 1, 2, 3])
+
+        """
+
+        graph, segment_id = utils.csr(self)
+
+        return graph, segment_id
+
+    def _edge_arrays(self):
+        """Each undirected edge of ``to_csr()`` once, as arrays."""
+
+        graph, segment_id = self.to_csr()
+        coo = graph.tocoo()
+        upper = coo.row < coo.col
+        u, v, lengths = coo.row[upper], coo.col[upper], coo.data[upper]
+
+        return u, v, lengths, segment_id[upper]
+
+    def to_networkx(self):
+        """Convert the network to a ``networkx.Graph``. Nodes are node IDs
+        with ``x`` and ``y`` coordinate attributes, and edges have the segment
+        length (``len_col``) and segment ID (``sid_name``) as attributes.
+        As in ``to_csr()``, only the shortest of any parallel segments is kept
+        and self-loops are dropped.
+
+        Returns
+        -------
+        graph : networkx.Graph
+            The network graph.
+
+        """
+
+        try:
+            import networkx
+        except ImportError:
+            raise ImportError("Converting to NetworkX requires 'networkx'.")
+
+        u, v, lengths, segms = self._edge_arrays()
+
+        graph = networkx.Graph()
+        graph.add_nodes_from(
+            (node, {"x": xy[0][0], "y": xy[0][1]})
+            for node, xy in self.node2coords.items()
+        )
+        graph.add_edges_from(
+            (n1, n2, {self.len_col: l, self.sid_name: s})
+            for n1, n2, l, s in zip(
+                u.tolist(), v.tolist(), lengths.tolist(), segms.tolist()
+            )
+        )
+
+        return graph
+
+    def to_igraph(self):
+        """Convert the network to an ``igraph.Graph``. Vertex indices are node
+        IDs (so vertices may be isolated when node IDs are not sequential),
+        with ``x`` and ``y`` coordinate attributes, and edges have the segment
+        length (``len_col``) and segment ID (``sid_name``) as attributes.
+        As in ``to_csr()``, only the shortest of any parallel segments is kept
+        and self-loops are dropped.
+
+        Returns
+        -------
+        graph : igraph.Graph
+            The network graph.
+
+        """
+
+        try:
+            import igraph
+        except ImportError:
+            raise ImportError("Converting to igraph requires 'python-igraph'.")
+
+        u, v, lengths, segms = self._edge_arrays()
+        n = self.to_csr()[0].shape[0]
+
+        xy = numpy.full((n, 2), numpy.nan)
+        nodes = numpy.fromiter(self.node2coords.keys(), dtype=numpy.int64)
+        xy[nodes] = [coords[0] for coords in self.node2coords.values()]
+
+        graph = igraph.Graph(
+            n=n,
+            edges=numpy.column_stack([u, v]).tolist(),
+            directed=False,
+            vertex_attrs={"x": xy[:, 0].tolist(), "y": xy[:, 1].tolist()},
+            edge_attrs={self.len_col: lengths.tolist(), self.sid_name: segms.tolist()},
+        )
+
+        return graph
+
 
 class Observations:
     """Near-network observations.
@@ -774,6 +1737,14 @@ class Observations:
         Snapping to line tolerance. Default is ``.01``.
     snap_to : str
         Snap points to either segments of nodes. Default is ``'segments'``.
+    profile : {bool, callable}
+        Record the wall time, CPU time, peak traced memory, and element counts
+        of each snapping stage in ``build_profile``. See ``Network``.
+        Default is ``False``.
+    n_jobs : int
+        The number of worker processes snapping subsets of the observations,
+        which attach to the network in shared memory. See ``Network.share()``.
+        ``None`` uses all available CPUs. Default is ``1``.
 
     Attributes
     ----------
@@ -789,6 +1760,8 @@ class Observations:
         Snapped point representation.
     obs2segm : dict
         Observation id (key) to segment id.
+    build_profile : pandas.DataFrame
+        Per-stage snapping profile (only when ``profile`` is set).
 
     """
 
@@ -807,6 +1780,8 @@ class Observations:
         tol=0.01,
         snap_to="segments",
         geo_col="geometry",
+        profile=False,
+        n_jobs=1,
     ):
 
         if not hasattr(net, "segm2geom"):
@@ -828,13 +1803,21 @@ class Observations:
         ############### --- ... the segments ARE still part of the network......
         ########################################################################
 
-        # remove restricted network segments
+        # record snapping stages if desired
+        self._profiler = None
+        if profile:
+            hook = profile if callable(profile) else None
+            self._profiler = utils.BuildProfile(hook=hook)
+
+        # mask restricted network segments (the network itself is unaltered)
         if remove_restricted:
             kws = {"restr": remove_restricted, "col": restrict_col}
-            net = utils.remove_restricted(net, **kws)
+            with utils.profile_stage(self, "remove_restricted"):
+                net = utils.restricted_view(net, **kws)
 
         # build kdtree
-        kd_tree = net.nodes_kdtree()
+        with utils.profile_stage(self, "nodes_kdtree"):
+            kd_tree = net.nodes_kdtree()
 
         self.sid_name = net.sid_name
         self.df = df
@@ -848,10 +1831,12 @@ class Observations:
         self.snap_to = snap_to
 
         # create observation to coordinate xwalk
-        self.obs2coords = utils.get_obs2coords(self)
+        with utils.profile_stage(self, "get_obs2coords"):
+            self.obs2coords = utils.get_obs2coords(self)
 
         # snap points and return dataframe
-        self.snapped_points = utils.snap_to_nearest(self, net=net)
+        with utils.profile_stage(self, "snap_to_nearest"):
+            self.snapped_points = utils.snap_to_nearest(self, net=net, n_jobs=n_jobs)
 
         # create observation-to-segment lookup
         if self.snap_to == "segments":
@@ -864,12 +1849,24 @@ class Observations:
         # create a segment-to-population tracker
         if self.snap_to == "segments" and obs_pop:
             self.snapped_points[obs_pop] = self.df[obs_pop]
-            self.segm2pop = {
-                seg: self.snapped_points.loc[
-                    (self.snapped_points["assoc_segm"] == seg), obs_pop
-                ].sum()
-                for seg in net.s_ids
-            }
+            with utils.profile_stage(self, "segm2pop"):
+                self.segm2pop = {
+                    seg: self.snapped_points.loc[
+                        (self.snapped_points["assoc_segm"] == seg), obs_pop
+                    ].sum()
+                    for seg in net.s_ids
+                }
+
+    @property
+    def build_profile(self):
+        """Per-stage snapping profile as a ``pandas.DataFrame`` (``None`` unless
+        created with ``profile`` set). See ``utils.BuildProfile``."""
+
+        profiler = getattr(self, "_profiler", None)
+        if profiler is None:
+            return None
+
+        return profiler.frame()
 
 
 def obs2obs_cost_matrix(
@@ -878,6 +1875,9 @@ def obs2obs_cost_matrix(
     destination_observations=None,
     snap_dist=True,
     distance_type="network",
+    chunksize=None,
+    n_jobs=1,
+    shared=None,
 ):
     """Calculate a cost matrix from (n) observations to (m) observations.
 
@@ -892,11 +1892,25 @@ def obs2obs_cost_matrix(
     distance_type : str
         Type of distance cost matrix. Default is ``'network'``.
         Option is ``'euclidean'``.
+    chunksize : int
+        Calculate the matrix in blocks of (at most) ``chunksize`` origin rows.
+        If set, a generator of ``(row_slice, block)`` tuples is returned
+        rather than the full matrix, which keeps memory bounded for large
+        numbers of observations. See ``write_cost_blocks()`` for streaming
+        the blocks to disk. Default is ``None``.
+    n_jobs : int
+        The number of worker processes calculating subsets of the rows, which
+        attach to the network cost matrix in shared memory. ``None`` uses all
+        available CPUs. Default is ``1``.
+    shared : tigernet.utils.SharedNetwork
+        A handle from ``network.share()`` to reuse over several calls with
+        ``n_jobs``. Default is ``None``, which shares the network cost matrix
+        for the call.
 
     Returns
     -------
-    n2m_matrix : numpy.ndarray
-        'nXm' cost matrix.
+    n2m_matrix : {numpy.ndarray, generator}
+        'nXm' cost matrix or a generator of ``(row_slice, block)`` tuples.
 
     """
 
@@ -959,6 +1973,162 @@ def obs2obs_cost_matrix(
         dist_type=distance_type,
         assoc_col=assoc_col,
         numeric_cols=numeric_cols,
+        chunksize=chunksize,
+        n_jobs=n_jobs,
+        shared=shared,
     )
 
     return n2m_matrix
+
+
+def nearest_destinations(
+    origins,
+    network,
+    destinations=None,
+    k=1,
+    max_dist=numpy.inf,
+    snap_dist=True,
+    include_self=False,
+):
+    """Find the ``k`` nearest destinations (by network distance) of each origin.
+    Rather than calculating a full cost matrix, a bounded Dijkstra search is
+    run from the snapped segment endpoints of each origin that stops once
+    its ``k`` nearest destinations are settled, requiring only O(n*k) memory.
+
+    Parameters
+    ----------
+    origins : tigernet.Observations
+        Origin observations.
+    network : tigernet.Network
+    destinations : tigernet.Observations
+        Destination observations. Default is ``None``, which uses the
+        origins as destinations.
+    k : int
+        The number of destinations to find. Default is ``1``.
+    max_dist : float
+        Ignore destinations farther than this. Default is ``numpy.inf``.
+    snap_dist : bool
+        Include the distance to observations from the network. Default is ``True``.
+    include_self : bool
+        Without ``destinations``, count each origin as its own nearest
+        destination (at zero distance). Default is ``False``.
+
+    Returns
+    -------
+    indices : numpy.ndarray
+        ``(n, k)`` destination (positional) indices sorted by distance. Unfilled
+        entries (fewer than ``k`` destinations within ``max_dist``) are ``-1``.
+    distances : numpy.ndarray
+        ``(n, k)`` network distances associated with ``indices``. Unfilled
+        entries are ``numpy.inf``.
+
+    """
+
+    if k < 1:
+        raise ValueError("'k' must be a positive integer, not %s." % k)
+
+    symmetric = destinations is None
+    if symmetric:
+        destinations = origins
+
+    adj = utils.adjacency(network)
+    orig = utils.obs_attachments(origins, snap_dist=snap_dist)
+    dest = utils.obs_attachments(destinations, snap_dist=snap_dist)
+
+    kws = {"k": k, "max_dist": max_dist, "symmetric": symmetric}
+    kws["include_self"] = include_self
+    indices, distances = utils.k_nearest(adj, orig, dest, **kws)
+
+    return indices, distances
+
+
+def write_cost_blocks(blocks, path, fmt=None):
+    """Stream cost matrix blocks from ``obs2obs_cost_matrix(..., chunksize=...)``
+    to disk without holding the full matrix in memory.
+
+    Parameters
+    ----------
+    blocks : iterable
+        ``(row_slice, block)`` tuples.
+    path : str
+        Output file (or directory for Zarr) path.
+    fmt : str
+        One of ``'npz'``, ``'parquet'``, or ``'zarr'``. Default is ``None``,
+        which infers the format from the ``path`` extension.
+
+    Returns
+    -------
+    n_rows : int
+        The number of origin rows written.
+
+    Notes
+    -----
+
+    * ``'npz'`` writes one (uncompressed) array per block named
+      ``'rows_<start>_<stop>'``.
+    * ``'parquet'`` writes a long table with ``'origin'``, ``'destination'``,
+      and ``'cost'`` columns, one row group per block. Requires ``pyarrow``.
+    * ``'zarr'`` writes a single ``(n, m)`` array chunked by block.
+      Requires ``zarr``.
+
+    """
+
+    if not fmt:
+        fmt = os.path.splitext(path.rstrip("/"))[1].lstrip(".").lower()
+    _formats = ["npz", "parquet", "zarr"]
+    if fmt not in _formats:
+        msg = "Cost matrix block format '%s' not supported. " % fmt
+        msg += "Choose from %s." % _formats
+        raise ValueError(msg)
+
+    n_rows = 0
+
+    if fmt == "npz":
+        with zipfile.ZipFile(path, mode="w", allowZip64=True) as zf:
+            for rows, block in blocks:
+                name = "rows_%s_%s.npy" % (rows.start, rows.stop)
+                with zf.open(name, mode="w", force_zip64=True) as f:
+                    numpy.lib.format.write_array(f, block, allow_pickle=False)
+                n_rows += block.shape[0]
+
+    if fmt == "parquet":
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Writing Parquet requires 'pyarrow'.")
+        writer = None
+        try:
+            for rows, block in blocks:
+                n_dest = block.shape[1]
+                table = pyarrow.table(
+                    {
+                        "origin": numpy.repeat(
+                            numpy.arange(rows.start, rows.stop), n_dest
+                        ),
+                        "destination": numpy.tile(numpy.arange(n_dest), block.shape[0]),
+                        "cost": block.ravel(),
+                    }
+                )
+                if writer is None:
+                    writer = pyarrow.parquet.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                n_rows += block.shape[0]
+        finally:
+            if writer is not None:
+                writer.close()
+
+    if fmt == "zarr":
+        try:
+            import zarr
+        except ImportError:
+            raise ImportError("Writing Zarr requires 'zarr'.")
+        z = None
+        for rows, block in blocks:
+            if z is None:
+                kws = {"shape": (0, block.shape[1]), "chunks": block.shape}
+                z = zarr.open_array(path, mode="w", dtype=block.dtype, **kws)
+            z.append(block)
+            n_rows += block.shape[0]
+
+    return n_rows
@@ -2,16 +2,32 @@
 """
 
 from ast import literal_eval
-import copy, re
+import collections
+import collections.abc
+import concurrent.futures
+import contextlib
+import bisect, copy, hashlib, heapq, math, os, pickle, re, tempfile, time, tracemalloc
+import warnings
+from multiprocessing import shared_memory
 
 import geopandas
 import numpy
 import pandas
+import scipy.sparse
+import scipy.sparse.csgraph
+import scipy.spatial
 from shapely.geometry import Point, MultiPoint
 from shapely.geometry import LineString, MultiLineString
 from shapely.geometry import GeometryCollection
 from shapely.ops import linemerge, polygonize
 
+try:
+    # vectorised geometry creation and coordinates -- shapely >= 2.0
+    from shapely import get_coordinates as shapely_get_coordinates
+    from shapely import linestrings as shapely_linestrings
+except ImportError:
+    shapely_get_coordinates, shapely_linestrings = None, None
+
 from .generate_data import generate_xyid
 
 # used to supress warning in addIDX()
@@ -536,21 +552,25 @@ def update_adj(net, seg_keys, node_keys):
 
     """
 
-    # update all crosswalk dictionaries
-    net.segm2segm = remove_adj(net.segm2segm, seg_keys)
-    net.segm2node = remove_adj(net.segm2node, seg_keys)
-    net.node2node = remove_adj(net.node2node, node_keys)
-    net.node2segm = remove_adj(net.node2segm, node_keys)
-
     # Keep only the largest connected component
     net.segm_cc = net.largest_segm_cc
     net.node_cc = net.largest_node_cc
+    scc_vals = list(net.segm_cc.values())[0]
+    ncc_vals = list(net.node_cc.values())[0]
+
+    # update all crosswalk dictionaries -- subset the topology store
+    # when the crosswalks are (unmodified) views of it
+    if all(_is_topology_view(net, kind) for kind in AdjacencyStore.kinds):
+        set_topology(net, net._topology.subset(scc_vals, ncc_vals))
+    else:
+        net.segm2segm = remove_adj(net.segm2segm, seg_keys)
+        net.segm2node = remove_adj(net.segm2node, seg_keys)
+        net.node2node = remove_adj(net.node2node, node_keys)
+        net.node2segm = remove_adj(net.node2segm, node_keys)
 
     # Set component ID to dataframe
-    scc_vals = list(net.segm_cc.values())[0]
     net.s_data = net.s_data[net.s_data[net.sid_name].isin(scc_vals)]
     net.s_data.reset_index(drop=True, inplace=True)
-    ncc_vals = list(net.node_cc.values())[0]
     net.n_data = net.n_data[net.n_data[net.nid_name].isin(ncc_vals)]
     net.n_data.reset_index(drop=True, inplace=True)
 
@@ -577,8 +597,521 @@ def remove_adj(e2e, remove):
     return e2e
 
 
+def _id_positions(ids):
+    """Dense ID-to-position lookup array (``-1`` where an ID is absent)."""
+
+    position = numpy.full(ids.max() + 1 if ids.size else 0, -1, dtype=numpy.int64)
+    position[ids] = numpy.arange(ids.shape[0])
+
+    return position
+
+
+def _key_position(position, key):
+    """The position of an ID in a ``_id_positions()`` lookup array."""
+
+    try:
+        pos = position[key] if key >= 0 else -1
+    except (IndexError, TypeError):
+        pos = -1
+    if pos < 0:
+        raise KeyError(key)
+
+    return pos
+
+
+def _incidence_csr(rows, cols, n_rows):
+    """Sorted unique ``cols`` of each of ``n_rows`` rows as CSR arrays."""
+
+    order = numpy.lexsort((cols, rows))
+    rows, cols = rows[order], cols[order]
+    first = numpy.ones(rows.shape[0], dtype=bool)
+    first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+    rows, cols = rows[first], cols[first]
+
+    indptr = numpy.zeros(n_rows + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(rows, minlength=n_rows), out=indptr[1:])
+
+    return indptr, cols.astype(numpy.int32)
+
+
+class AdjacencyStore(object):
+    """Compact array store of the network topology -- the endpoint nodes of
+    each segment and CSR (compressed sparse row) arrays of the node-to-segment,
+    segment-to-segment, and node-to-node neighbors. The ``segm2node``,
+    ``node2segm``, ``segm2segm``, and ``node2node`` lookups of a network are
+    views of its store (see ``AdjacencyView`` and ``topology()``).
+
+    Parameters
+    ----------
+    segm_ids : array-like
+        Segment IDs.
+    endpoints : array-like
+        ``(n_segm, 2)`` node IDs incident with each segment. Rings are incident
+        with their single node twice.
+    node_ids : array-like
+        Node IDs.
+
+    Attributes
+    ----------
+    segm_ids : numpy.ndarray
+        Segment IDs.
+    node_ids : numpy.ndarray
+        Node IDs.
+    endpoints : numpy.ndarray
+        ``(n_segm, 2)`` sorted ``int32`` endpoint node IDs of each segment.
+    node2segm : tuple
+        ``(indptr, indices)`` -- the (sorted) IDs of the segments incident
+        with the ``i``-th node are ``indices[indptr[i]:indptr[i + 1]]``.
+    segm2segm : tuple
+        ``(indptr, indices)`` of the segments neighboring each segment.
+    node2node : tuple
+        ``(indptr, indices)`` of the nodes neighboring each node.
+
+    Examples
+    --------
+
+    >>> import tigernet
+    >>> endpoints = [[1, 0], [1, 2], [2, 2]]
+    >>> store = tigernet.utils.AdjacencyStore([0, 1, 2], endpoints, [0, 1, 2])
+    >>> store.endpoints
+    array([[0, 1],
+           [1, 2],
+           [2, 2]], dtype=int32)
+    >>> store.neighbors("node2segm", 2)
+    [1, 2]
+    >>> store.degrees()
+    array([1, 2, 3])
+
+    """
+
+    kinds = ["segm2node", "node2segm", "segm2segm", "node2node"]
+
+    def __init__(self, segm_ids, endpoints, node_ids):
+        self.segm_ids = numpy.asarray(segm_ids, dtype=numpy.int64).reshape(-1)
+        self.node_ids = numpy.asarray(node_ids, dtype=numpy.int64).reshape(-1)
+        endpoints = numpy.asarray(endpoints, dtype=numpy.int64).reshape(-1, 2)
+        n_segm, n_node = self.segm_ids.shape[0], self.node_ids.shape[0]
+        if endpoints.shape[0] != n_segm:
+            msg = "There are %s segment IDs but " % n_segm
+            msg += "%s pairs of segment endpoints." % endpoints.shape[0]
+            raise ValueError(msg)
+
+        self._segm_position = _id_positions(self.segm_ids)
+        self._node_position = _id_positions(self.node_ids)
+
+        # node position of each segment endpoint
+        nodes = numpy.full(endpoints.shape, -1, dtype=numpy.int64)
+        inside = (endpoints >= 0) & (endpoints < self._node_position.shape[0])
+        nodes[inside] = self._node_position[endpoints[inside]]
+        if (nodes < 0).any():
+            missing = numpy.unique(endpoints[nodes < 0]).tolist()
+            msg = "Segment endpoints are not network nodes.\n\n"
+            msg += "Missing node IDs: %s" % str(missing)
+            raise ValueError(msg)
+        self.endpoints = numpy.sort(endpoints, axis=1).astype(numpy.int32)
+
+        # node to segment and -- through shared incidence -- segment to
+        # segment and node to node, excluding the element itself
+        segms, nodes = numpy.repeat(numpy.arange(n_segm), 2), nodes.ravel()
+        self.node2segm = _incidence_csr(nodes, self.segm_ids[segms], n_node)
+        incidence = scipy.sparse.csr_matrix(
+            (numpy.ones(segms.shape[0]), (segms, nodes)), shape=(n_segm, n_node)
+        )
+        for kind, mtx, ids in [
+            ("segm2segm", incidence @ incidence.T, self.segm_ids),
+            ("node2node", incidence.T @ incidence, self.node_ids),
+        ]:
+            mtx = mtx.tocoo()
+            keep = mtx.row != mtx.col
+            csr = _incidence_csr(mtx.row[keep], ids[mtx.col[keep]], mtx.shape[0])
+            setattr(self, kind, csr)
+
+    def arrays(self):
+        """All arrays of the store by name (see ``from_arrays()``)."""
+
+        arrays = {
+            "segm_ids": self.segm_ids,
+            "node_ids": self.node_ids,
+            "endpoints": self.endpoints,
+            "segm_position": self._segm_position,
+            "node_position": self._node_position,
+        }
+        for kind in self.kinds[1:]:
+            arrays["%s_indptr" % kind], arrays["%s_indices" % kind] = getattr(
+                self, kind
+            )
+
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Restore a store from its ``arrays()`` (e.g. in shared memory)
+        without copying or recalculating them."""
+
+        store = cls.__new__(cls)
+        store.segm_ids, store.node_ids = arrays["segm_ids"], arrays["node_ids"]
+        store.endpoints = arrays["endpoints"]
+        store._segm_position = arrays["segm_position"]
+        store._node_position = arrays["node_position"]
+        for kind in cls.kinds[1:]:
+            csr = arrays["%s_indptr" % kind], arrays["%s_indices" % kind]
+            setattr(store, kind, csr)
+
+        return store
+
+    def ids(self, kind):
+        """The IDs of the elements keying the ``kind`` lookup."""
+
+        return self.segm_ids if kind.startswith("segm") else self.node_ids
+
+    def neighbors(self, kind, key):
+        """The neighbors of one element (``KeyError`` if not found).
+
+        Parameters
+        ----------
+        kind : str
+            ``'segm2node'``, ``'node2segm'``, ``'segm2segm'``, or ``'node2node'``.
+        key : int
+            The element ID.
+
+        Returns
+        -------
+        neighbors : list
+            The (sorted) neighbor IDs.
+
+        """
+
+        if kind.startswith("segm"):
+            pos = _key_position(self._segm_position, key)
+        else:
+            pos = _key_position(self._node_position, key)
+
+        if kind == "segm2node":
+            return self.endpoints[pos].tolist()
+        indptr, indices = getattr(self, kind)
+
+        return indices[indptr[pos] : indptr[pos + 1]].tolist()
+
+    def lists(self, kind):
+        """The neighbors of all elements as lists (in the order of ``ids()``)."""
+
+        if kind == "segm2node":
+            return self.endpoints.tolist()
+        indptr, indices = getattr(self, kind)
+        indptr, indices = indptr.tolist(), indices.tolist()
+
+        return [indices[i:j] for i, j in zip(indptr[:-1], indptr[1:])]
+
+    def segm_endpoints(self, segm_ids):
+        """The ``(n, 2)`` endpoint node IDs of the segments in ``segm_ids``."""
+
+        return self.endpoints[self._segm_position[numpy.asarray(segm_ids)]]
+
+    def degrees(self):
+        """The degree of each node (in the order of ``node_ids``) -- incident
+        segments count once and incident loops twice."""
+
+        nodes = self._node_position[self.endpoints.ravel()]
+
+        return numpy.bincount(nodes, minlength=self.node_ids.shape[0])
+
+    def subset(self, segm_ids, node_ids):
+        """A store of only the segments in ``segm_ids`` and the nodes in
+        ``node_ids`` (which must include their endpoints), in the same order."""
+
+        segms = numpy.isin(self.segm_ids, segm_ids)
+        nodes = numpy.isin(self.node_ids, node_ids)
+        store = AdjacencyStore(
+            self.segm_ids[segms], self.endpoints[segms], self.node_ids[nodes]
+        )
+
+        return store
+
+
+class AdjacencyView(collections.abc.MutableMapping):
+    """Dictionary-like view of one of the lookups of an ``AdjacencyStore``,
+    e.g. ``{segm: [node1, node2]}`` for ``segm2node``. Each value is a new
+    list. Items that are assigned or deleted are held by the view, leaving
+    the store unaltered.
+
+    Parameters
+    ----------
+    store : tigernet.utils.AdjacencyStore
+        The topology store.
+    kind : str
+        ``'segm2node'``, ``'node2segm'``, ``'segm2segm'``, or ``'node2node'``.
+
+    Examples
+    --------
+
+    >>> import tigernet
+    >>> endpoints = [[0, 1], [1, 2]]
+    >>> store = tigernet.utils.AdjacencyStore([0, 1], endpoints, [0, 1, 2])
+    >>> node2node = tigernet.utils.AdjacencyView(store, "node2node")
+    >>> node2node
+    {0: [1], 1: [0, 2], 2: [1]}
+
+    """
+
+    def __init__(self, store, kind):
+        if kind not in AdjacencyStore.kinds:
+            msg = "'kind' of %s not valid." % kind
+            raise ValueError(msg)
+        self.store, self.kind = store, kind
+        self._assigned, self._deleted = {}, set()
+
+    @property
+    def clean(self):
+        """No items were assigned or deleted (``True``)."""
+
+        return not self._assigned and not self._deleted
+
+    def __getitem__(self, key):
+        if key in self._assigned:
+            return self._assigned[key]
+        if key in self._deleted:
+            raise KeyError(key)
+        return self.store.neighbors(self.kind, key)
+
+    def __setitem__(self, key, value):
+        self._deleted.discard(key)
+        self._assigned[key] = value
+
+    def __delitem__(self, key):
+        self[key]
+        self._assigned.pop(key, None)
+        self._deleted.add(key)
+
+    def __iter__(self):
+        keys = self.store.ids(self.kind).tolist()
+        if not self.clean:
+            stored = set(keys)
+            keys = [k for k in keys if k not in self._deleted]
+            keys += [k for k in self._assigned if k not in stored]
+        return iter(keys)
+
+    def __len__(self):
+        if self.clean:
+            return self.store.ids(self.kind).shape[0]
+        return sum(1 for _ in self)
+
+    def items(self):
+        if not self.clean:
+            return [(k, self[k]) for k in self]
+        keys = self.store.ids(self.kind).tolist()
+        return list(zip(keys, self.store.lists(self.kind)))
+
+    def values(self):
+        return [v for k, v in self.items()]
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+def set_topology(net, store):
+    """Set the topology store of a network and its ``segm2node``, ``node2segm``,
+    ``segm2segm``, and ``node2node`` lookups as views of the store.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+    store : tigernet.utils.AdjacencyStore
+        The topology store.
+
+    """
+
+    net._topology = store
+    for kind in AdjacencyStore.kinds:
+        setattr(net, kind, AdjacencyView(store, kind))
+
+
+def _is_topology_view(net, kind):
+    """The lookup is an unmodified view of the network topology store."""
+
+    view, store = getattr(net, kind, None), getattr(net, "_topology", None)
+    is_view = isinstance(view, AdjacencyView) and view.clean
+
+    return is_view and store is not None and view.store is store
+
+
+def topology(net):
+    """Return the topology store of the network. When ``segm2node`` is not an
+    unmodified view of the store (e.g. after ``remove_restricted()``) a new
+    store is built from ``segm2node`` and ``n_ids``, which is not cached.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+
+    Returns
+    -------
+    store : tigernet.utils.AdjacencyStore
+        The network topology.
+
+    """
+
+    if _is_topology_view(net, "segm2node"):
+        return net._topology
+
+    items = list(net.segm2node.items())
+    segm_ids, endpoints = [k for k, v in items], [v for k, v in items]
+    store = AdjacencyStore(segm_ids, endpoints, net.n_ids)
+
+    return store
+
+
+def endpoint_nodes(net):
+    """Match the first and last coordinates of each segment (in the order of
+    ``s_ids``) with a node through their ``xyid``.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+
+    Returns
+    -------
+    segm_nodes : numpy.ndarray
+        Start and end node of each segment.
+
+    """
+
+    # sorted node xyids -- the last of any duplicates is matched
+    node_ids = numpy.fromiter(net.node2xyid.keys(), dtype=numpy.int64)
+    node_xyids = numpy.array([xyids[0] for xyids in net.node2xyid.values()])
+    order = node_xyids.argsort(kind="stable")
+    node_ids, node_xyids = node_ids[order], node_xyids[order]
+
+    # first and last xyid of each segment
+    segm2xyid = net.segm2xyid
+    ends = [(segm2xyid[s][0], segm2xyid[s][-1]) for s in net.s_ids]
+    ends = numpy.array(ends, dtype=str).reshape(-1, 2)
+
+    pos = numpy.searchsorted(node_xyids, ends, side="right") - 1
+    pos = numpy.maximum(pos, 0)
+    matched = node_xyids[pos] == ends if node_ids.size else ends != ends
+
+    unmatched = ~matched.all(axis=1)
+    if unmatched.any():
+        unmatched = numpy.asarray(net.s_ids)[unmatched].tolist()
+        msg = "Adjacency value corruption. The segments listed below are not "
+        msg += "incident with two nodes.\n\nProblem segment IDs: %s" % str(unmatched)
+        raise AssertionError(msg)
+
+    segm_nodes = node_ids[pos]
+
+    return segm_nodes
+
+
+def fill_topology(net):
+    """Fill the segment and node dataframes with the neighbors of each
+    element (the ``s_neigh`` and ``n_neigh`` columns). Dataframe rows are
+    in the order of ``s_ids`` and ``n_ids``.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+
+    """
+
+    s_neigh, n_neigh = "s_neigh", "n_neigh"
+    net.s_data[s_neigh] = [str(v) for v in net.segm2segm.values()]
+    net.s_data[n_neigh] = [str(v) for v in net.segm2node.values()]
+    net.n_data[s_neigh] = [str(v) for v in net.node2segm.values()]
+    net.n_data[n_neigh] = [str(v) for v in net.node2node.values()]
+
+
+class ArrayLookup(collections.abc.Mapping):
+    """Read-only ID lookup backed by arrays, in place of an eagerly built
+    ``dict`` crosswalk. Nothing is computed until the first access.
+
+    Parameters
+    ----------
+    keys : array-like
+        Element IDs (integers).
+    values : array-like
+        The value of each element, e.g. a dataframe column. Default is ``None``.
+    geoms : array-like
+        The geometry of each element. Values are the geometry coordinates
+        in the form ``[(x1, y1), ...]``. Default is ``None``.
+    coords : tuple
+        Coordinates of all elements as ``(coords, offsets)``, where ``coords``
+        is of shape ``(n, 2)`` and the coordinates of element ``i`` are
+        ``coords[offsets[i]:offsets[i + 1]]``. See ``check_arrays()``.
+        Values are as with ``geoms``. Default is ``None``.
+
+    Examples
+    --------
+
+    >>> import tigernet
+    >>> lookup = tigernet.utils.ArrayLookup([3, 5], values=[4.5, 9.0])
+    >>> lookup[5]
+    9.0
+    >>> lookup
+    {3: 4.5, 5: 9.0}
+
+    """
+
+    def __init__(self, keys, values=None, geoms=None, coords=None):
+        if sum([arg is None for arg in [values, geoms, coords]]) != 2:
+            msg = "Exactly one of 'values', 'geoms', or 'coords' must be set."
+            raise ValueError(msg)
+        self._keys, self._values, self._geoms = keys, values, geoms
+        self._coords = coords
+        self._position = None
+
+    def _load(self):
+        """Index the keys and prepare the values on first access."""
+
+        keys = numpy.asarray(self._keys, dtype=numpy.int64)
+        position = _id_positions(keys)
+
+        if self._values is not None:
+            self._values = numpy.asarray(self._values)
+        elif self._geoms is not None:
+            geoms = numpy.asarray(self._geoms)
+            if shapely_get_coordinates is not None:
+                xys, idx = shapely_get_coordinates(geoms, return_index=True)
+                counts = numpy.bincount(idx, minlength=geoms.shape[0])
+            else:
+                xys = [numpy.asarray(geom.coords).reshape(-1, 2) for geom in geoms]
+                counts = numpy.array([xy.shape[0] for xy in xys], dtype=int)
+                xys = numpy.concatenate(xys) if xys else numpy.empty((0, 2))
+            offsets = numpy.zeros(counts.shape[0] + 1, dtype=numpy.int64)
+            numpy.cumsum(counts, out=offsets[1:])
+            self._coords, self._geoms = (xys, offsets), None
+
+        self._keys, self._position = keys, position
+
+    def __getitem__(self, key):
+        if self._position is None:
+            self._load()
+        pos = _key_position(self._position, key)
+        if self._values is not None:
+            return self._values[pos]
+        xys, offsets = self._coords
+        return [tuple(xy) for xy in xys[offsets[pos] : offsets[pos + 1]].tolist()]
+
+    def __iter__(self):
+        if self._position is None:
+            self._load()
+        return iter(self._keys.tolist())
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __getstate__(self):
+        # drop the key index, which is rebuilt on first access
+        state = self.__dict__.copy()
+        state["_position"] = None
+        return state
+
+
 def geom_assoc(net, coords=False):
-    """Associate nodes and segments with geometry or coordinates.
+    """Associate nodes and segments with geometry or coordinates through
+    (lazy) lookups. See ``ArrayLookup``.
 
     Parameters
     ----------
@@ -588,14 +1121,14 @@ def geom_assoc(net, coords=False):
 
     """
 
-    _kws = {"c2": net.geo_col, "geo_col": net.geo_col}
+    _skeys, _nkeys = net.s_data[net.sid_name].values, net.n_data[net.nid_name].values
+    _sgeoms, _ngeoms = net.s_data[net.geo_col].values, net.n_data[net.geo_col].values
     if not coords:
-        net.segm2geom = xwalk(net.s_data, c1=net.sid_name, **_kws)
-        net.node2geom = xwalk(net.n_data, c1=net.nid_name, **_kws)
+        net.segm2geom = ArrayLookup(_skeys, values=_sgeoms)
+        net.node2geom = ArrayLookup(_nkeys, values=_ngeoms)
     else:
-        _kws.update({"stipulation": "coords"})
-        net.segm2coords = xwalk(net.s_data, c1=net.sid_name, **_kws)
-        net.node2coords = xwalk(net.n_data, c1=net.nid_name, **_kws)
+        net.segm2coords = ArrayLookup(_skeys, geoms=_sgeoms)
+        net.node2coords = ArrayLookup(_nkeys, geoms=_ngeoms)
 
 
 def calc_valency(net, col=None):
@@ -605,7 +1138,9 @@ def calc_valency(net, col=None):
     ----------
     net : tigernet.Network
     col : str
-        The node neighbors column. Default is ``None``.
+        Deprecated. The node neighbors column is no longer read, as the
+        degree is counted from the segment endpoints (see
+        ``AdjacencyStore.degrees()``). Default is ``None``.
 
     Returns
     -------
@@ -614,17 +1149,13 @@ def calc_valency(net, col=None):
 
     """
 
-    n2d = {}
-    for node, segs in net.node2segm.items():
-        loops = 0
-        for s in segs:
-            segv = net.s_data[net.sid_name] == s
-            neighs = literal_eval(net.s_data.loc[segv, col].values[0])
-            if neighs[0] == neighs[1]:
-                loops += 1
-        degree = len(segs) + loops
+    if col is not None:
+        msg = "The 'col' argument of 'calc_valency()' is deprecated and ignored. "
+        msg += "Node degrees are counted from the network topology."
+        warnings.warn(msg, FutureWarning)
 
-        n2d[node] = degree
+    store = topology(net)
+    n2d = dict(zip(store.node_ids.tolist(), store.degrees().tolist()))
 
     return n2d
 
@@ -720,9 +1251,8 @@ def _locate_naps(net):
     # subset only degree-2 nodes
     degree_two_nodes = set([n for n, d in net.node2degree.items() if d == 2])
 
-    # recreate n2n xwalk
-    new_n2n = {k: v for k, v in net.node2node.items()}
-    two2two = {k: new_n2n[k] for k in degree_two_nodes}
+    # node to node xwalk of the degree-2 nodes
+    two2two = {k: net.node2node[k] for k in degree_two_nodes}
 
     # get set intersection of degree-2 node neighbors
     for k, vs in list(two2two.items()):
@@ -741,7 +1271,7 @@ def _locate_naps(net):
     for napt_count, napt_info in napts.items():
         napt = []
         for napt_node in napt_info[net.nid_name]:
-            napt.extend([v for k, v in net.node2segm.items() if k == napt_node])
+            napt.append(net.node2segm[napt_node])
 
         # if more than one pair of segments in napt
         napt = set([seg for segs in napt for seg in segs])
@@ -1111,11 +1641,15 @@ def euc_calc(net, col=None):
 
     """
 
-    net.s_data[col] = numpy.nan
-    for seg_k, (n1, n2) in net.segm2node.items():
-        p1, p2 = net.node2coords[n1][0], net.node2coords[n2][0]
-        ed = _euc_dist(p1, p2)
-        net.s_data.loc[(net.s_data[net.sid_name] == seg_k), col] = ed
+    # endpoint coordinates of all segments as two arrays
+    segms = list(net.segm2node.keys())
+    p1 = numpy.array([net.node2coords[n1][0] for n1, n2 in net.segm2node.values()])
+    p2 = numpy.array([net.node2coords[n2][0] for n1, n2 in net.segm2node.values()])
+    p1, p2 = p1.reshape(-1, 2).T, p2.reshape(-1, 2).T
+
+    # all endpoint distances at once, then a single column write
+    ed = pandas.Series(_euc_dist(p1, p2), index=segms, dtype=float)
+    net.s_data[col] = net.s_data[net.sid_name].map(ed)
 
     return net.s_data
 
@@ -1125,14 +1659,15 @@ def _euc_dist(p1, p2):
 
     Parameters
     ----------
-    p1 : {float, int}
-        The start point of a line.
-    p2 : {float, int}
-        The end point of a line.
+    p1 : {tuple, numpy.ndarray}
+        The start point of a line. Also accepts an array of x and y coordinates
+        in the form ``[xs, ys]`` for many lines at once.
+    p2 : {tuple, numpy.ndarray}
+        The end point of a line, in the same form as ``p1``.
 
     Returns
     -------
-    euc : float
+    euc : {float, numpy.ndarray}
         The euclidean distance between two line endpoints.
 
     """
@@ -1142,6 +1677,264 @@ def _euc_dist(p1, p2):
     return euc
 
 
+###############################################################################
+################ Array network construction functionality #####################
+###############################################################################
+
+
+def check_arrays(coords, offsets):
+    """Validate a ragged array of segment coordinates.
+
+    Parameters
+    ----------
+    coords : array-like
+        Coordinates of all segment vertices in the form ``[[x1, y1], ...]``.
+    offsets : array-like
+        Position of the first vertex of each segment in ``coords``,
+        followed by the total number of vertices.
+
+    Returns
+    -------
+    coords : numpy.ndarray
+        ``float`` coordinates.
+    offsets : numpy.ndarray
+        ``int`` offsets.
+
+    """
+
+    coords = numpy.asarray(coords, dtype=float)
+    offsets = numpy.asarray(offsets, dtype=numpy.int64)
+
+    if coords.ndim != 2 or coords.shape[1] != 2:
+        msg = "'coords' must be of shape (n, 2), not %s." % str(coords.shape)
+        raise ValueError(msg)
+
+    bad_bounds = offsets.shape[0] < 2 or offsets[0] != 0
+    if offsets.ndim != 1 or bad_bounds or offsets[-1] != coords.shape[0]:
+        msg = "'offsets' must begin at 0 and end at the number of coordinates "
+        msg += "(%s)." % coords.shape[0]
+        raise ValueError(msg)
+
+    if (numpy.diff(offsets) < 2).any():
+        msg = "Each segment must have at least 2 coordinates."
+        raise ValueError(msg)
+
+    return coords, offsets
+
+
+def array_lengths(coords, offsets):
+    """Calculate the length of each segment in a ragged coordinate array.
+
+    Parameters
+    ----------
+    coords : numpy.ndarray
+        Segment vertex coordinates. See ``check_arrays()``.
+    offsets : numpy.ndarray
+        Segment offsets into ``coords``. See ``check_arrays()``.
+
+    Returns
+    -------
+    lengths : numpy.ndarray
+        Segment lengths.
+
+    """
+
+    # vertex-to-vertex distances, excluding those between consecutive segments
+    steps = _euc_dist(coords[:-1].T, coords[1:].T)
+    steps[offsets[1:-1] - 1] = 0.0
+    lengths = numpy.add.reduceat(steps, offsets[:-1]) if steps.size else steps
+
+    return lengths
+
+
+def array_nodes(coords, offsets):
+    """Extract nodes from the endpoints of the segments in a ragged coordinate
+    array. Node IDs are set in order of first appearance, as ``extract_nodes()``.
+
+    Parameters
+    ----------
+    coords : numpy.ndarray
+        Segment vertex coordinates. See ``check_arrays()``.
+    offsets : numpy.ndarray
+        Segment offsets into ``coords``. See ``check_arrays()``.
+
+    Returns
+    -------
+    node_xy : numpy.ndarray
+        Node coordinates in the form ``[[x1, y1], ...]``.
+    segm_nodes : numpy.ndarray
+        Start and end node of each segment.
+
+    """
+
+    # segment endpoints in the form [start1, end1, start2, end2, ...]
+    ends = numpy.empty((2 * (offsets.shape[0] - 1), 2))
+    ends[0::2], ends[1::2] = coords[offsets[:-1]], coords[offsets[1:] - 1]
+
+    # unique coordinates renumbered in order of first appearance
+    _, first, inverse = numpy.unique(
+        ends, axis=0, return_index=True, return_inverse=True
+    )
+    order = numpy.argsort(first)
+    rank = numpy.empty_like(order)
+    rank[order] = numpy.arange(order.shape[0])
+    node_xy = ends[first[order]]
+    segm_nodes = rank[inverse.ravel()].reshape(-1, 2)
+
+    return node_xy, segm_nodes
+
+
+def array_base(net, coords, offsets, node_xy, lengths, attrs=None):
+    """Create the segment and node dataframes and ``xyid`` lookups
+    from arrays. See ``tigernet.Network.build_base()``.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+    coords : numpy.ndarray
+        Segment vertex coordinates. See ``check_arrays()``.
+    offsets : numpy.ndarray
+        Segment offsets into ``coords``. See ``check_arrays()``.
+    node_xy : numpy.ndarray
+        Node coordinates.
+    lengths : numpy.ndarray
+        Segment lengths.
+    attrs : {dict, pandas.DataFrame}
+        Segment attributes. Default is ``None``.
+
+    """
+
+    xyids = ["x" + str(x) + "y" + str(y) for (x, y) in coords.tolist()]
+    net.segm2xyid = {
+        segm: xyids[start:end]
+        for segm, (start, end) in enumerate(zip(offsets[:-1], offsets[1:]))
+    }
+    net.node2xyid = {
+        node: ["x" + str(x) + "y" + str(y)]
+        for node, (x, y) in enumerate(node_xy.tolist())
+    }
+
+    n_segm = offsets.shape[0] - 1
+    if attrs is None:
+        s_data = pandas.DataFrame(index=range(n_segm))
+    else:
+        s_data = pandas.DataFrame(attrs).reset_index(drop=True)
+        if s_data.shape[0] != n_segm:
+            msg = "'attrs' must have one record per segment (%s), " % n_segm
+            msg += "not %s." % s_data.shape[0]
+            raise ValueError(msg)
+    s_data[net.sid_name] = numpy.arange(n_segm)
+    s_data[net.len_col] = lengths
+    s_data[net.xyid] = [str(v) for v in net.segm2xyid.values()]
+    net.s_data = geopandas.GeoDataFrame(s_data)
+
+    n_data = pandas.DataFrame({net.nid_name: numpy.arange(node_xy.shape[0])})
+    n_data[net.xyid] = [str(v) for v in net.node2xyid.values()]
+    net.n_data = geopandas.GeoDataFrame(n_data)
+
+    # set segment & node ID lists and counts elements
+    set_ids(net)
+
+
+def array_topology(net, segm_nodes):
+    """Relate all graph elements from an array of segment endpoints.
+    See ``tigernet.Network.build_topology()``.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+    segm_nodes : numpy.ndarray
+        Start and end node of each segment.
+
+    """
+
+    store = AdjacencyStore(net.s_ids, segm_nodes, net.n_ids)
+    set_topology(net, store)
+
+    # fill dataframes with neighbors
+    fill_topology(net)
+
+
+def array_associations(net, coords, offsets, node_xy, lengths, record_geom=False):
+    """Associate graph elements with coordinates, segment lengths, node
+    degrees, and (optionally) geometries from arrays. Only the segments and
+    nodes in ``s_ids`` and ``n_ids`` are associated. See
+    ``tigernet.Network.build_associations()``.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+    coords : numpy.ndarray
+        Segment vertex coordinates. See ``check_arrays()``.
+    offsets : numpy.ndarray
+        Segment offsets into ``coords``. See ``check_arrays()``.
+    node_xy : numpy.ndarray
+        Node coordinates.
+    lengths : numpy.ndarray
+        Segment lengths.
+    record_geom : bool
+        Create (``shapely``) geometries for the segments and nodes, and an
+        ID-to-geometry lookup (``True``). Default is ``False``.
+
+    """
+
+    s_ids, n_ids = numpy.asarray(net.s_ids), numpy.asarray(net.n_ids)
+
+    # associate segments & nodes with coordinates
+    counts = numpy.diff(offsets)[s_ids]
+    segm_offsets = numpy.zeros(counts.shape[0] + 1, dtype=numpy.int64)
+    numpy.cumsum(counts, out=segm_offsets[1:])
+    segm_coords = coords[numpy.isin(_ragged_index(offsets), s_ids)]
+    net.segm2coords = ArrayLookup(s_ids, coords=(segm_coords, segm_offsets))
+    node_offsets = numpy.arange(n_ids.shape[0] + 1)
+    net.node2coords = ArrayLookup(n_ids, coords=(node_xy[n_ids], node_offsets))
+
+    # associate segments with length
+    net.segm2len = ArrayLookup(s_ids, values=lengths[s_ids])
+    net.network_length = sum(lengths[s_ids].tolist())
+
+    # Calculate degree for n_ids -- incident segs +1; incident loops +2
+    net.node2degree = calc_valency(net)
+    net.n_data["degree"] = net.n_data[net.nid_name].map(net.node2degree)
+
+    if record_geom:
+        lines = geopandas.GeoSeries(_linestrings(coords, offsets))[s_ids].values
+        points = geopandas.points_from_xy(*node_xy[n_ids].T)
+        net.s_data[net.geo_col] = lines
+        net.s_data = net.s_data.set_geometry(net.geo_col)
+        net.n_data[net.geo_col] = points
+        net.n_data = net.n_data.set_geometry(net.geo_col)
+        net.segm2geom = ArrayLookup(s_ids, values=net.s_data.geometry.values)
+        net.node2geom = ArrayLookup(n_ids, values=net.n_data.geometry.values)
+
+
+def _linestrings(coords, offsets=None):
+    """Lines from ragged coordinate arrays (see ``check_arrays()``), or from
+    an array of equal length lines in the form ``[[[x1, y1], ...], ...]``
+    when ``offsets`` is ``None``."""
+
+    if offsets is None:
+        if shapely_linestrings is not None:
+            return shapely_linestrings(coords)
+        return [LineString(line) for line in coords]
+
+    if shapely_linestrings is not None:
+        lines = shapely_linestrings(coords, indices=_ragged_index(offsets))
+    else:
+        lines = [
+            LineString(coords[offsets[i] : offsets[i + 1]])
+            for i in range(offsets.shape[0] - 1)
+        ]
+
+    return lines
+
+
+def _ragged_index(offsets):
+    """Segment index of each vertex in a ragged coordinate array."""
+
+    return numpy.repeat(numpy.arange(offsets.shape[0] - 1), numpy.diff(offsets))
+
+
 ###############################################################################
 ################ TIGER/Line clean up functionality ############################
 ###############################################################################
@@ -1811,7 +2604,9 @@ def _make_break_locs(breaks=None, standard=False, loi=None, line=False, mline=Fa
 ###############################################################################
 
 
-def shortest_path(net, gp=False):
+def shortest_path(
+    net, gp=False, gpred=False, dtype="float64", storage="full", n_jobs=1
+):
     """Graph traversal for shortest path.
 
     Parameters
@@ -1819,37 +2614,125 @@ def shortest_path(net, gp=False):
     net : tigernet.Network
     gp : bool
         Generate paths. Default is ``False``.
+    gpred : bool
+        Generate an ``int32`` predecessor matrix instead of paths.
+        Default is ``False``.
+    dtype : {str, numpy.dtype}
+        Data type of the cost matrix. Default is ``'float64'``.
+    storage : str
+        Either ``'full'`` for a dense ``numpy.ndarray`` or ``'triangular'``
+        for a packed upper triangle (``TriangularMatrix``). Default is ``'full'``.
+    n_jobs : int
+        The number of worker processes, which attach to the network and fill
+        the cost matrix in shared memory (see ``share_network()``). ``None``
+        uses all available CPUs. Default is ``1``.
 
     Returns
     -------
-    mtx : numpy.ndarray
+    mtx : {numpy.ndarray, TriangularMatrix}
         Shortest path costs between all nodes.
-    paths : dict
-        Graph traveral paths.
+    paths : {dict, numpy.ndarray}
+        Graph traveral paths or the predecessor matrix (``gpred=True``),
+        where ``paths[i, j]`` is the node preceding ``j`` on the
+        shortest path from ``i`` (``-1`` for ``i`` and unreachable nodes).
 
     """
 
     # Instantiate empty cost matrix and paths
-    mtx, paths = numpy.empty((net.n_node, net.n_node)), {}
+    if storage == "full":
+        mtx = numpy.empty((net.n_node, net.n_node), dtype=dtype)
+    elif storage == "triangular":
+        mtx = TriangularMatrix(net.n_node, dtype=dtype)
+    else:
+        raise ValueError("Cost matrix storage '%s' not supported." % storage)
+    paths = {}
+    if gpred:
+        paths = numpy.full((net.n_node, net.n_node), -1, dtype=numpy.int32)
+
+    out = {"mtx": mtx.data if storage == "triangular" else mtx}
+    if gpred:
+        out["preds"] = paths
 
     # Dijkstra classic source-to-all algo for optimal shortest path graph traversal.
-    for n in net.n_ids:
+    n_jobs = _n_jobs(n_jobs, net.n_node)
+    if n_jobs > 1:
+        # fill the shared matrix rows of each worker's sources
+        tasks = [(sources, storage, gp, gpred) for sources in _split(net.n_ids, n_jobs)]
+        with share_network(net, matrix=False) as handle, SharedArrays(
+            out, readonly=False
+        ) as shared_out:
+            trees = _shared_map(
+                _shortest_path_rows, tasks, [handle, shared_out], n_jobs
+            )
+            for name, array in shared_out.attach().items():
+                out[name][...] = array
+        trees = {n: tree for _trees in trees for n, tree in _trees.items()}
+    else:
+        trees = _shortest_path_rows(net, out, net.n_ids, storage, gp, gpred)
+
+    if not gpred:
+        paths = trees
+
+    return mtx, paths
+
+
+def _shortest_path_rows(net, out, sources, storage, gp, gpred):
+    """Fill the cost matrix (and predecessor matrix) rows of the ``sources``.
+    See ``shortest_path()``.
+
+    Parameters
+    ----------
+    net : {tigernet.Network, tigernet.utils.AttachedNetwork}
+    out : dict
+        The cost matrix (``'mtx'``), packed if triangular, and the
+        predecessor matrix (``'preds'``, if ``gpred``).
+    sources : list
+        Source node IDs.
+    storage : str
+        ``'full'`` or ``'triangular'``.
+    gp : bool
+        Generate paths.
+    gpred : bool
+        Record predecessors in ``out``.
+
+    Returns
+    -------
+    trees : dict
+        Graph traversal paths (or ``None``) of each source.
+
+    """
+
+    mtx = out["mtx"]
+    if storage == "triangular":
+        mtx = TriangularMatrix(net.n_node, dtype=mtx.dtype, data=mtx)
+
+    # neighbors and distances of all nodes, read once from the topology
+    neighbors = neighbor_distances(net)
+
+    trees = {}
+    for n in sources:
 
         # get the distance array and predecessor nodes for each node
-        dist, pred = dijkstra(net, n)
+        dist, pred = dijkstra(net, n, neighbors=neighbors)
         tree = None
 
         # if recording the paths
-        if gp:
+        if gpred:
+            out["preds"][n] = pred
+        elif gp:
             tree = generate_tree(pred)
 
         # set the distance array in a matrix and paths in a dict
-        mtx[n], paths[n] = dist, tree
+        if storage == "triangular":
+            mtx.set_row(n, dist)
+        else:
+            mtx[n] = dist
+        trees[n] = tree
 
-    return mtx, paths
+    return trees
 
 
-def dijkstra(net, source):
+def dijkstra(net, source, neighbors=None):
     """Dijkstra single source to all destinations.
 
     Parameters
@@ -1857,6 +2740,9 @@ def dijkstra(net, source):
     net : tigernet.Network
     source : int
         Source node for iteration.
+    neighbors : dict
+        Neighbors with distances of every node. See ``neighbor_distances()``.
+        Default is ``None``, which reads them from the network.
 
     Returns
     -------
@@ -1867,6 +2753,9 @@ def dijkstra(net, source):
 
     """
 
+    if neighbors is None:
+        neighbors = neighbor_distances(net)
+
     initial_dist = numpy.inf
     distance = [initial_dist for n in net.n_ids]
     distance[source] = 0.0
@@ -1884,8 +2773,7 @@ def dijkstra(net, source):
         unvisited.remove(current)
 
         # Get the neighbors & distances to the current node.
-        neighbors = get_neighbor_distances(net, current)
-        for neigh, add_dist in list(neighbors.items()):
+        for neigh, add_dist in neighbors[current]:
 
             new_dist = distance[current] + add_dist
 
@@ -1925,20 +2813,61 @@ def get_neighbor_distances(net, v):
     return neighbors
 
 
-def generate_tree(pred):
-    """Generate a tree for shortest path between source and destination nodes.
+def neighbor_distances(net):
+    """Create a lookup of the neighbors with distances of every node for
+    dijkstra. Unmodified topology views are read straight from the arrays
+    of the topology store (see ``AdjacencyStore``), otherwise the network
+    lookups are read with ``get_neighbor_distances()``.
 
-     Parameters
-     ----------
-     pred : list
-         Predecessor nodes.
+    Parameters
+    ----------
+    net : tigernet.Network
 
     Returns
-     -------
-     tree : dict
-         Shortest path tree in the form:
-         ``{source_node: [destination_node, ..., source_node]}``
-         e.g.: ``{0: [0], 1: [0], 2: [339, 0]}``
+    -------
+    neighbors : dict
+        Lookup in the form ``{node: [(neighor_ID, neighbor_distance), ...]}``.
+
+    """
+
+    if not (
+        _is_topology_view(net, "node2segm") and _is_topology_view(net, "segm2node")
+    ):
+        return {v: list(get_neighbor_distances(net, v).items()) for v in net.n_ids}
+
+    store = topology(net)
+    _, _, lengths = segment_arrays(net)
+
+    # the other endpoint of each incident segment -- the node itself for loops
+    indptr, indices = store.node2segm
+    segms = store._segm_position[indices]
+    nodes = numpy.repeat(store.node_ids, numpy.diff(indptr))
+    ends = store.endpoints[segms]
+    neighs = numpy.where(ends[:, 0] != nodes, ends[:, 0], ends[:, 1])
+
+    # as ``get_neighbor_distances()`` the last of any parallel segments is kept
+    _neighbors = {v: {} for v in store.node_ids.tolist()}
+    for v, neigh, dist in zip(nodes.tolist(), neighs.tolist(), lengths[segms].tolist()):
+        _neighbors[v][neigh] = dist
+    neighbors = {v: list(nbrs.items()) for v, nbrs in _neighbors.items()}
+
+    return neighbors
+
+
+def generate_tree(pred):
+    """Generate a tree for shortest path between source and destination nodes.
+
+     Parameters
+     ----------
+     pred : list
+         Predecessor nodes.
+
+    Returns
+     -------
+     tree : dict
+         Shortest path tree in the form:
+         ``{source_node: [destination_node, ..., source_node]}``
+         e.g.: ``{0: [0], 1: [0], 2: [339, 0]}``
     """
 
     tree = {}
@@ -1962,657 +2891,3090 @@ def generate_tree(pred):
     return tree
 
 
-###############################################################################
-################ Near-Network Observations functionality ######################
-###############################################################################
+def reconstruct_path(pred, source, target):
+    """Walk a row of a predecessor matrix back from ``target`` to ``source``.
 
+    Parameters
+    ----------
+    pred : numpy.ndarray
+        Predecessor nodes from ``source``.
+    source : int
+        Origin node ID.
+    target : int
+        Destination node ID.
 
-def remove_restricted(net, restr=None, col=None):
-    """Subset the unrestricted segments and update adjacencies and
-    return (1) the geodataframe of unrestricted segments, and (2) the
-    network object with updated adjacency values. Used for snapping points
-    to appropriate network segments
+    Returns
+    -------
+    path : list
+        Node IDs from ``source`` to ``target`` (inclusive). Empty if
+        ``target`` is not reachable from ``source``.
+
+    """
+
+    path = [target]
+    while path[-1] != source:
+        p = int(pred[path[-1]])
+        if p < 0:
+            return []
+        path.append(p)
+    path.reverse()
+
+    return path
+
+
+def path_segments(net, nodes):
+    """Segments traversed along a sequence of nodes. When parallel segments
+    connect two nodes the shortest is selected.
 
     Parameters
     ----------
     net : tigernet.Network
-    restr : list
-        Restricted segment types. Default is ``None``.
-    col : str
-        Column name for segment restriction stipulation. Default is ``None``.
+    nodes : list
+        Node IDs along a path.
 
     Returns
     -------
+    segms : list
+        Segment IDs along the path.
+
+    """
+
+    segms = []
+    for n1, n2 in zip(nodes[:-1], nodes[1:]):
+        incident = [s for s in net.node2segm[n1] if n2 in net.segm2node[s]]
+        segms.append(min(incident, key=lambda s: net.segm2len[s]))
+
+    return segms
+
+
+def cutoff_costs(
+    net, cutoff=None, dtype="float64", storage="full", sparse=False, n_jobs=1
+):
+    """Node-to-node costs from cutoff-limited (heap-based) Dijkstra searches.
+
+    Parameters
+    ----------
     net : tigernet.Network
-        The updated network object.
+    cutoff : {int, float}
+        Maximum network distance between node pairs. Default is ``None``,
+        which does not limit the searches.
+    dtype : {str, numpy.dtype}
+        Data type of the cost matrix. Default is ``'float64'``.
+    storage : str
+        Either ``'full'`` or ``'triangular'`` for dense matrices.
+        Default is ``'full'``.
+    sparse : bool
+        Return a ``scipy.sparse.csr_matrix`` of only the pairs within ``cutoff``.
+        Default is ``False``, which returns a dense matrix with pairs beyond
+        ``cutoff`` set to ``numpy.inf``.
+    n_jobs : int
+        The number of worker processes, which attach to the network in shared
+        memory (see ``share_network()``). ``None`` uses all available CPUs.
+        Default is ``1``.
+
+    Returns
+    -------
+    mtx : {scipy.sparse.csr_matrix, numpy.ndarray, TriangularMatrix}
+        Shortest path costs between nodes within ``cutoff``.
 
     """
 
-    def _remove_segm_ids(n2s, restr):
-        """Remove restricted segment ids from node to segment adjacency.
+    if storage not in ["full", "triangular"]:
+        raise ValueError("Cost matrix storage '%s' not supported." % storage)
+    if cutoff is None:
+        cutoff = numpy.inf
+
+    # one sorted row of reachable pairs per node
+    n_jobs = _n_jobs(n_jobs, net.n_node)
+    if n_jobs > 1:
+        tasks = [(sources, cutoff, dtype) for sources in _split(net.n_ids, n_jobs)]
+        with share_network(net, matrix=False) as handle:
+            rows = _shared_map(_cutoff_rows, tasks, [handle], n_jobs)
+        counts, indices, data = [sum(part, []) for part in zip(*rows)]
+    else:
+        counts, indices, data = _cutoff_rows(net, net.n_ids, cutoff, dtype)
+
+    indptr = numpy.zeros(len(counts) + 1, dtype=numpy.int64)
+    numpy.cumsum(counts, out=indptr[1:])
+    shape = (net.n_node, net.n_node)
+    data, indices = numpy.concatenate(data), numpy.concatenate(indices)
+    mtx = scipy.sparse.csr_matrix((data, indices, indptr), shape=shape)
+    if sparse:
+        return mtx
+
+    # expand into a dense matrix with unreached pairs at infinity -- the
+    # packed triangle is filled straight from the upper triangle entries
+    coo = mtx.tocoo()
+    if storage == "triangular":
+        size = net.n_node * (net.n_node + 1) // 2
+        tri = TriangularMatrix(net.n_node, data=numpy.full(size, numpy.inf, dtype))
+        rows, cols = coo.row.astype(numpy.int64), coo.col.astype(numpy.int64)
+        upper = rows <= cols
+        tri[rows[upper], cols[upper]] = coo.data[upper]
+        return tri
+
+    dense = numpy.full(shape, numpy.inf, dtype=dtype)
+    dense[coo.row, coo.col] = coo.data
+
+    return dense
+
+
+def _cutoff_rows(net, sources, cutoff, dtype):
+    """The sorted reachable nodes and costs from each of the ``sources``.
+    See ``cutoff_costs()``.
+
+    Returns
+    -------
+    counts : list
+        The number of reachable nodes from each source.
+    indices : list
+        Arrays of the reachable nodes from each source.
+    data : list
+        Arrays of the costs to the reachable nodes from each source.
+
+    """
+
+    adj = adjacency(net)
+
+    counts, indices, data = [], [], []
+    for n in sources:
+        dist, _, _ = dijkstra_search(adj, [(n, 0.0, None)], cutoff=cutoff)
+        cols = numpy.fromiter(dist.keys(), dtype=numpy.int64, count=len(dist))
+        costs = numpy.fromiter(dist.values(), dtype=float, count=len(dist))
+        order = cols.argsort()
+        indices.append(cols[order])
+        data.append(costs[order].astype(dtype))
+        counts.append(cols.shape[0])
+
+    return counts, indices, data
+
+
+class TriangularMatrix(object):
+    """Symmetric ``n x n`` matrix stored as a packed upper triangle
+    (diagonal included), which requires ``n * (n + 1) / 2`` elements
+    rather than ``n ** 2``.
+
+    Parameters
+    ----------
+    n : int
+        Number of rows (and columns).
+    dtype : {str, numpy.dtype}
+        Data type of the matrix elements. Default is ``'float64'``.
+    data : numpy.ndarray
+        Packed upper triangle in row-major order. Default is ``None``,
+        which initializes an array of zeros.
+
+    Examples
+    --------
+
+    >>> import numpy
+    >>> from tigernet.utils import TriangularMatrix
+    >>> mtx = TriangularMatrix(3)
+    >>> mtx.set_row(0, [0.0, 1.0, 2.0])
+    >>> mtx.set_row(1, [1.0, 0.0, 3.0])
+    >>> mtx[2, 1]
+    3.0
+
+    >>> mtx[[0, 2], 1:]
+    array([[1., 2.],
+           [3., 0.]])
+
+    """
+
+    def __init__(self, n, dtype="float64", data=None):
+        self.n = int(n)
+        if data is None:
+            data = numpy.zeros(self.n * (self.n + 1) // 2, dtype=dtype)
+        elif data.shape[0] != self.n * (self.n + 1) // 2:
+            msg = "Packed data of length %s does not fit " % data.shape[0]
+            msg += "a %s x %s matrix." % (self.n, self.n)
+            raise ValueError(msg)
+        self.data = data
+
+    def __repr__(self):
+        return "TriangularMatrix(n=%s, dtype=%s)" % (self.n, self.dtype)
+
+    def __len__(self):
+        return self.n
+
+    def __array__(self, dtype=None):
+        # never silently expand the packed storage into a full matrix
+        msg = "A 'TriangularMatrix' is not implicitly converted to a dense "
+        msg += "array. Use 'toarray()' to expand it."
+        raise TypeError(msg)
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def _offset(self, i):
+        """Position of element ``[i, i]`` in the packed array."""
+        i = numpy.asarray(i, dtype=numpy.int64)
+        return i * self.n - (i * (i - 1)) // 2
+
+    def _axis(self, key):
+        """Convert an axis key to an array of non-negative indices."""
+        if isinstance(key, slice):
+            return numpy.arange(self.n)[key]
+        key = numpy.asarray(key)
+        if key.dtype == bool:
+            return numpy.nonzero(key)[0]
+        if not numpy.issubdtype(key.dtype, numpy.integer):
+            raise IndexError("Only integer, slice, or boolean indices are valid.")
+        if ((key < -self.n) | (key >= self.n)).any():
+            raise IndexError("Index out of bounds for size %s." % self.n)
+        # packed positions grow as ``n ** 2`` -- avoid (e.g.) int32 overflow
+        key = key.astype(numpy.int64)
+        return numpy.where(key < 0, key + self.n, key)
+
+    def _index(self, i, j):
+        """Packed positions of elements ``[i, j]`` (broadcast arrays)."""
+        lo, hi = numpy.minimum(i, j), numpy.maximum(i, j)
+        return self._offset(lo) + hi - lo
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) == 1:
+            key += (slice(None),)
+        ki, kj = key
+        i, j = self._axis(ki), self._axis(kj)
+        # slices (and 1-d indices paired with a slice) produce blocks,
+        # while paired index arrays are broadcast element-wise (as numpy)
+        slices = isinstance(ki, slice) or isinstance(kj, slice)
+        if slices and i.ndim == j.ndim == 1:
+            i, j = i[:, None], j[None, :]
+        values = self.data[self._index(i, j)]
+        if values.ndim == 0:
+            values = values.item()
+        return values
+
+    def __setitem__(self, key, value):
+        i, j = key
+        self.data[self._index(self._axis(i), self._axis(j))] = value
+
+    def set_row(self, i, values):
+        """Set the upper triangle part of row ``i`` (``values[i:]``)
+        from a full row of ``n`` values.
 
         Parameters
         ----------
-        n2s : dict
-            Node to segment adjacency.
-        restr : list
-            Restricted segment ids.
+        i : int
+            Row index.
+        values : {list, numpy.ndarray}
+            All ``n`` values in row ``i``.
+
+        """
+
+        start = self._offset(i)
+        self.data[start : start + self.n - i] = numpy.asarray(values)[i:]
+
+    def toarray(self):
+        """Expand into a full (dense) ``numpy.ndarray``."""
+        full = numpy.empty(self.shape, dtype=self.dtype)
+        for i in range(self.n):
+            start = self._offset(i)
+            full[i, i:] = full[i:, i] = self.data[start : start + self.n - i]
+        return full
+
+    def diagonal(self):
+        """Return the diagonal."""
+        return self.data[self._offset(numpy.arange(self.n))]
+
+    def max(self, axis=None):
+        """Maximum value of the matrix.
+
+        Parameters
+        ----------
+        axis : int
+            Return the maximum of each row (``1``) or column (``0``), which
+            are the same for a symmetric matrix. Default is ``None``.
+
+        """
+
+        if axis is None:
+            return self.data.max()
+
+        # row maxima of the upper triangle, then of the columns above the diagonal
+        offsets = self._offset(numpy.arange(self.n))
+        maxima = numpy.maximum.reduceat(self.data, offsets)
+        for i in range(self.n - 1):
+            start = offsets[i] + 1
+            row = self.data[start : start + self.n - i - 1]
+            numpy.maximum(maxima[i + 1 :], row, out=maxima[i + 1 :])
+        return maxima
+
+    def min(self):
+        """Minimum value of the matrix."""
+        return self.data.min()
+
+    def sum(self):
+        """Sum of all matrix elements (both triangles)."""
+        return 2 * self.data.sum() - self.diagonal().sum()
+
+    def where(self, value):
+        """Equivalent of ``numpy.where(matrix == value)`` on the full matrix.
+
+        Parameters
+        ----------
+        value : {int, float}
+            Value to locate.
 
         Returns
         -------
-        n2s : dict
-            Updated node to segment adjacency.
+        rows : numpy.ndarray
+            Row indices, sorted with ``cols`` in row-major order.
+        cols : numpy.ndarray
+            Column indices.
 
         """
 
-        update_n2s = {}
+        # unravel the packed positions of the matches into (row, col)
+        hits = numpy.nonzero(self.data == value)[0]
+        offsets = self._offset(numpy.arange(self.n))
+        rows = numpy.searchsorted(offsets, hits, side="right") - 1
+        cols = hits - offsets[rows] + rows
+        off = rows != cols
+        rows, cols = (
+            numpy.concatenate((rows, cols[off])),
+            numpy.concatenate((cols, rows[off])),
+        )
+        order = numpy.lexsort((cols, rows))
+        return rows[order], cols[order]
 
-        for node, segms in list(n2s.items()):
-            updated_segms = []
 
-            for segm in segms:
-                if segm not in restr:
-                    updated_segms.append(segm)
-            update_n2s[node] = updated_segms
+class SparseCosts(object):
+    """Scalar ``[i, j]`` lookups in a cutoff (``scipy.sparse``) cost matrix,
+    where pairs that are not stored are beyond the cutoff (``numpy.inf``).
 
-        n2s = update_n2s
+    Parameters
+    ----------
+    mtx : scipy.sparse.spmatrix
+        Sparse cost matrix (see ``cutoff_costs()``).
 
-        return n2s
+    """
 
-    # records all node and segment ids
-    df, full_node_ids, full_segm_ids = net.s_data, net.n_ids, net.s_ids
+    def __init__(self, mtx):
+        self.mtx = mtx.tocsr()
+        self.mtx.sort_indices()
+        self.shape = self.mtx.shape
 
-    # get restricted segment ids
-    restricted_segm_ids = list(df[df[col].isin(restr)].index)
+    def __getitem__(self, key):
+        i, j = key
+        mtx = self.mtx
+        start, stop = mtx.indptr[i], mtx.indptr[i + 1]
+        pos = start + numpy.searchsorted(mtx.indices[start:stop], j)
+        if pos < stop and mtx.indices[pos] == j:
+            return mtx.data[pos]
+        return numpy.inf
 
-    # subset unrestricted segments dataframe
-    unrestrict_segm_df = df[~df[col].isin(restr)]
 
-    # remove restricted segment ids from the segment id list
-    net.s_ids = list(unrestrict_segm_df.index)
+###############################################################################
+################ Network search functionality #################################
+###############################################################################
+
+
+def adjacency(net):
+    """Create (or fetch the cached) adjacency lookup for heap-based network
+    searches. Only the shortest of any parallel segments between two nodes
+    is kept and loops are ignored.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+
+    Returns
+    -------
+    adj : dict
+        Lookup in the form ``{node: [(neighbor, length, segment), ...]}``.
+
+    """
+
+    adj = getattr(net, "_adjacency", None)
+    if adj is not None:
+        return adj
+
+    segms, nodes, lengths = segment_arrays(net)
+    _adj = {n: {} for n in net.n_ids}
+    for segm, (n1, n2), length in zip(segms.tolist(), nodes.tolist(), lengths):
+        if n1 == n2:
+            continue
+        for u, v in [(n1, n2), (n2, n1)]:
+            if v not in _adj[u] or length < _adj[u][v][0]:
+                _adj[u][v] = (length, segm)
+    adj = {u: [(v, l, s) for v, (l, s) in nbrs.items()] for u, nbrs in _adj.items()}
+
+    net._adjacency = adj
+
+    return adj
+
+
+def obs_attachments(obs, snap_dist=True, rows=None):
+    """Describe how each snapped observation attaches to the network.
+
+    Parameters
+    ----------
+    obs : tigernet.Observations
+        Snapped observations.
+    snap_dist : bool
+        Include the distance from the observations to the network.
+        Default is ``True``.
+    rows : list
+        Positional indices of the observations to describe.
+        Default is ``None``, which describes all observations.
+
+    Returns
+    -------
+    attachments : list
+        One ``(segm, node_a, dist_a, node_b, dist_b, snap)`` tuple per observation.
+        Observations snapped to nodes have a ``segm`` of ``None`` and both
+        ``node_a`` and ``node_b`` set to the associated node at a distance of ``0``.
+
+    """
+
+    sp = obs.snapped_points
+    if rows is not None:
+        sp = sp.iloc[list(rows)]
+    n_obs = sp.shape[0]
+
+    def _col(c, t):
+        return sp[c].apply(lambda x: literal_eval(x) if type(x) == str else x).astype(t)
+
+    if obs.snap_to == "nodes":
+        nodes = _col("assoc_node", int)
+        zeros = numpy.zeros(n_obs)
+        segms, node_a, dist_a, node_b, dist_b = (
+            [None] * n_obs,
+            nodes,
+            zeros,
+            nodes,
+            zeros,
+        )
+        snap = _col("dist2node", float) if snap_dist else zeros
+    else:
+        segms = _col("assoc_segm", int)
+        node_a, dist_a = _col("node_a", int), _col("dist_a", float)
+        node_b, dist_b = _col("node_b", int), _col("dist_b", float)
+        snap = _col("dist2line", float) if snap_dist else numpy.zeros(n_obs)
+
+    attachments = list(
+        zip(
+            segms,
+            numpy.asarray(node_a).tolist(),
+            numpy.asarray(dist_a).tolist(),
+            numpy.asarray(node_b).tolist(),
+            numpy.asarray(dist_b).tolist(),
+            numpy.asarray(snap).tolist(),
+        )
+    )
+
+    return attachments
+
+
+def attachment_seeds(attachment, label=None):
+    """Search seeds for an observation attachment (see ``obs_attachments()``).
+
+    Parameters
+    ----------
+    attachment : tuple
+        ``(segm, node_a, dist_a, node_b, dist_b, snap)``.
+    label : object
+        Label of the source recorded by the search. Default is ``None``.
+
+    Returns
+    -------
+    seeds : list
+        Search seeds in the form ``[(node, initial_distance, label), ...]``.
+
+    """
+
+    segm, node_a, dist_a, node_b, dist_b, snap = attachment
+    seeds = [(node_a, dist_a + snap, label), (node_b, dist_b + snap, label)]
+
+    return seeds
+
+
+def same_segment_cost(att_i, att_j):
+    """Direct cost between two observations snapped to the same segment.
+
+    Parameters
+    ----------
+    att_i : tuple
+        Origin attachment (see ``obs_attachments()``).
+    att_j : tuple
+        Destination attachment (see ``obs_attachments()``).
+
+    Returns
+    -------
+    cost : float
+        The cost along the shared segment (``numpy.inf`` if not shared).
+
+    """
+
+    if att_i[0] is None or att_i[0] != att_j[0] or att_i[1] != att_j[1]:
+        return numpy.inf
+
+    cost = abs(att_i[2] - att_j[2]) + att_i[5] + att_j[5]
+
+    return cost
+
+
+def dijkstra_search(adj, seeds, cutoff=numpy.inf, visit=None):
+    """Heap-based (multi-source) Dijkstra search, optionally bounded by a cost
+    cutoff and/or stopped early by a ``visit`` callback.
+
+    Parameters
+    ----------
+    adj : dict
+        Network adjacency (see ``adjacency()``).
+    seeds : list
+        Search seeds in the form ``[(node, initial_distance, label), ...]``.
+    cutoff : float
+        Do not settle nodes farther than this. Default is ``numpy.inf``.
+    visit : callable
+        Called as ``visit(node, distance)`` when a node is settled. The search
+        stops if it returns ``True``. Default is ``None``.
+
+    Returns
+    -------
+    distance : dict
+        Settled nodes in the form ``{node: distance}`` (in settle order).
+    pred : dict
+        Predecessors in the form ``{node: (predecessor, segment)}``, where
+        seeded nodes map to ``(-1, -1)``.
+    source : dict
+        Label of the nearest seed in the form ``{node: label}``.
+
+    """
+
+    distance, pred, source = {}, {}, {}
+    best, heap = {}, []
+
+    for order, (node, dist, label) in enumerate(seeds):
+        if dist < best.get(node, numpy.inf):
+            best[node] = dist
+            pred[node], source[node] = (-1, -1), label
+            heapq.heappush(heap, (dist, order, node))
+
+    # tie-breaking counter for a stable (deterministic) heap order
+    counter = len(seeds)
+
+    while heap:
+        dist, _, node = heapq.heappop(heap)
+        if node in distance or dist > best[node]:
+            continue
+        if dist > cutoff:
+            break
+        distance[node] = dist
+        if visit is not None and visit(node, dist):
+            break
+        for neigh, length, segm in adj[node]:
+            new_dist = dist + length
+            if neigh not in distance and new_dist < best.get(neigh, numpy.inf):
+                best[neigh] = new_dist
+                pred[neigh], source[neigh] = (node, segm), source[node]
+                heapq.heappush(heap, (new_dist, counter, neigh))
+                counter += 1
+
+    pred = {n: pred[n] for n in distance}
+    source = {n: source[n] for n in distance}
+
+    return distance, pred, source
+
+
+def k_nearest(
+    adj, orig, dest, k=1, max_dist=numpy.inf, symmetric=False, include_self=False
+):
+    """Bounded multi-target Dijkstra searches for the ``k`` nearest destinations
+    of each origin.
+
+    Parameters
+    ----------
+    adj : dict
+        Network adjacency (see ``adjacency()``).
+    orig : list
+        Origin attachments (see ``obs_attachments()``).
+    dest : list
+        Destination attachments (see ``obs_attachments()``).
+    k : int
+        The number of destinations to find. Default is ``1``.
+    max_dist : float
+        Ignore destinations farther than this. Default is ``numpy.inf``.
+    symmetric : bool
+        Origins and destinations are the same observations. Default is ``False``.
+    include_self : bool
+        With ``symmetric``, each origin is also its own nearest destination
+        (at zero cost). Default is ``False``.
+
+    Returns
+    -------
+    indices : numpy.ndarray
+        ``(n, k)`` destination positions sorted by cost (``-1`` if not found).
+    distances : numpy.ndarray
+        ``(n, k)`` costs associated with ``indices`` (``numpy.inf`` if not found).
+
+    """
+
+    # destinations reachable from each node and from each segment
+    dest_by_node, dest_by_segm = {}, {}
+    for j, att in enumerate(dest):
+        segm, node_a, dist_a, node_b, dist_b, snap = att
+        dest_by_node.setdefault(node_a, []).append((j, dist_a + snap))
+        dest_by_node.setdefault(node_b, []).append((j, dist_b + snap))
+        if segm is not None:
+            dest_by_segm.setdefault(segm, []).append(j)
+
+    indices = numpy.full((len(orig), k), -1, dtype=numpy.int64)
+    distances = numpy.full((len(orig), k), numpy.inf)
+
+    for i, att in enumerate(orig):
+
+        # the k cheapest ``(cost, destination)`` found so far -- sorted, so
+        # ties are broken by destination position -- and their costs
+        nearest, costs = [], {}
+        skip = i if symmetric and not include_self else None
+
+        def _update(j, cost):
+            """Record a (tentative) cost, returning the search bound."""
+            if j == skip or cost > max_dist or cost >= costs.get(j, numpy.inf):
+                return
+            if j in costs:
+                del nearest[bisect.bisect_left(nearest, (costs.pop(j), j))]
+            elif len(nearest) == k:
+                if (cost, j) >= nearest[-1]:
+                    return
+                del costs[nearest.pop()[1]]
+            bisect.insort(nearest, (cost, j))
+            costs[j] = cost
+            if len(nearest) == k:
+                bound[0] = nearest[-1][0]
+
+        # no unsettled node can improve on the current k nearest
+        bound = [max_dist]
+        if symmetric and include_self:
+            _update(i, 0.0)
+        for j in dest_by_segm.get(att[0], []):
+            _update(j, same_segment_cost(att, dest[j]))
+
+        def _visit(node, dist):
+            if dist > bound[0]:
+                return True
+            for j, offset in dest_by_node.get(node, []):
+                _update(j, dist + offset)
+            return False
+
+        dijkstra_search(adj, attachment_seeds(att), cutoff=max_dist, visit=_visit)
+
+        for col, (cost, j) in enumerate(nearest):
+            indices[i, col], distances[i, col] = j, cost
+
+    return indices, distances
+
+
+def service_area(net, seeds, cutoff, inner=None):
+    """Multi-source network service area bounded by a cost cutoff.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+    seeds : list
+        Search seeds in the form ``[(node, initial_distance, label), ...]``.
+    cutoff : float
+        Maximum network distance from any source.
+    inner : list
+        Sources located along segments in the form
+        ``[(segm, node, offset, reach), ...]``, where ``offset`` is the
+        distance along ``segm`` from ``node`` and ``reach`` is the remaining
+        cost allowance at the source. Default is ``None``.
+
+    Returns
+    -------
+    nodes : pandas.DataFrame
+        Reached nodes (index) with their distance (``'dist'``) and
+        nearest source (``'source'``).
+    segms : pandas.DataFrame
+        (Partially) covered segments (index) with their length (``'length'``),
+        covered length (``'covered'``), and full coverage flag (``'full'``).
+
+    """
+
+    distance, pred, source = dijkstra_search(adjacency(net), seeds, cutoff=cutoff)
+
+    # covered intervals along each segment measured from its first node
+    intervals = {}
+    for segm, (n1, n2) in net.segm2node.items():
+        length = net.segm2len[segm]
+        if n1 in distance:
+            intervals.setdefault(segm, []).append((0.0, cutoff - distance[n1]))
+        if n2 in distance:
+            intervals.setdefault(segm, []).append(
+                (length - cutoff + distance[n2], length)
+            )
+    for segm, node, offset, reach in inner or []:
+        if reach < 0.0:
+            continue
+        if node != net.segm2node[segm][0]:
+            offset = net.segm2len[segm] - offset
+        intervals.setdefault(segm, []).append((offset - reach, offset + reach))
+
+    # union of the (clipped) intervals along each segment
+    covered = {}
+    for segm, spans in intervals.items():
+        length = net.segm2len[segm]
+        spans = sorted((max(0.0, lo), min(length, hi)) for (lo, hi) in spans)
+        total, reach = 0.0, 0.0
+        for lo, hi in spans:
+            lo = max(lo, reach)
+            if hi > lo:
+                total += hi - lo
+                reach = hi
+        if total > 0.0:
+            covered[segm] = total
+
+    nodes = pandas.DataFrame(
+        {"dist": pandas.Series(distance), "source": pandas.Series(source)}
+    ).sort_index()
+    segms = pandas.DataFrame(
+        {
+            "length": pandas.Series({s: net.segm2len[s] for s in covered}),
+            "covered": pandas.Series(covered, dtype=float),
+        }
+    ).sort_index()
+    segms["full"] = numpy.isclose(segms["covered"], segms["length"])
+
+    return nodes, segms
+
+
+def _walk_back(pred, node):
+    """Follow search predecessors from ``node`` back to its seed.
+
+    Parameters
+    ----------
+    pred : dict
+        Predecessors in the form ``{node: (predecessor, segment)}``.
+    node : int
+        Node to start from.
+
+    Returns
+    -------
+    nodes : list
+        Node IDs from the seed to ``node`` (inclusive).
+    segms : list
+        Segment IDs traversed between ``nodes``.
+
+    """
+
+    nodes, segms = [node], []
+    while pred[node][0] != -1:
+        node, segm = pred[node]
+        nodes.append(node)
+        segms.append(segm)
+
+    return nodes[::-1], segms[::-1]
+
+
+def astar(adj, coords, seeds, goals, direct=numpy.inf, heuristic=True, landmarks=None):
+    """A* point-to-point search with a Euclidean lower-bound heuristic. As
+    segments are never shorter than the straight line between their nodes
+    the heuristic is admissible. If landmark distances are passed the
+    heuristic is tightened with triangle inequality bounds (ALT).
+
+    Parameters
+    ----------
+    adj : dict
+        Network adjacency (see ``adjacency()``).
+    coords : dict
+        Node coordinates in the form ``{node: [(x, y)]}``.
+    seeds : list
+        Search seeds in the form ``[(node, initial_distance, label), ...]``.
+    goals : list
+        Goal nodes in the form ``[(node, final_distance, label), ...]``, where
+        ``final_distance`` is the remaining cost from ``node`` to the target.
+    direct : float
+        Known cost without traversing the network (e.g. two observations along
+        the same segment). Default is ``numpy.inf``.
+    heuristic : bool
+        Use the Euclidean heuristic (``False`` is plain Dijkstra).
+        Default is ``True``.
+    landmarks : numpy.ndarray
+        ``(n, V)`` landmark distances (see ``landmarks()``). Default is ``None``.
+
+    Returns
+    -------
+    cost : float
+        Shortest path cost (``numpy.inf`` if ``target`` is not reachable).
+    nodes : list
+        Node IDs along the shortest path (empty if not traversing the network).
+    segms : list
+        Segment IDs traversed between ``nodes``.
+    n_settled : int
+        The number of nodes expanded by the search.
+
+    """
+
+    goal_offset = {}
+    for node, dist, _ in goals:
+        goal_offset[node] = min(dist, goal_offset.get(node, numpy.inf))
+    goal_xys = [(coords[g][0], off) for g, off in goal_offset.items()]
+    if landmarks is not None:
+        goal_lms = [landmarks[:, g].astype(float) for g in goal_offset]
+
+    def _h(node):
+        if not heuristic:
+            return 0.0
+        (x, y) = coords[node][0]
+        bounds = [math.hypot(x - gx, y - gy) for ((gx, gy), _) in goal_xys]
+        if landmarks is not None:
+            for i, goal_dists in enumerate(goal_lms):
+                lower = landmark_lower_bounds(landmarks, node, goal_dists)
+                bounds[i] = max(bounds[i], lower)
+        return min(b + off for b, (_, off) in zip(bounds, goal_xys))
+
+    best, pred, heap = {}, {}, []
+    for node, dist, _ in seeds:
+        if dist < best.get(node, numpy.inf):
+            best[node], pred[node] = dist, (-1, -1)
+    for order, (node, dist) in enumerate(best.items()):
+        heapq.heappush(heap, (dist + _h(node), order, dist, node))
+    counter = len(best)
+
+    cost, goal, n_settled = direct, None, 0
+    while heap:
+        f, _, g, node = heapq.heappop(heap)
+        # the cheapest route found can no longer be improved
+        if f >= cost:
+            break
+        if g > best[node]:
+            continue
+        n_settled += 1
+        if node in goal_offset and g + goal_offset[node] < cost:
+            cost, goal = g + goal_offset[node], node
+        for neigh, length, segm in adj[node]:
+            new_g = g + length
+            if new_g < best.get(neigh, numpy.inf):
+                best[neigh], pred[neigh] = new_g, (node, segm)
+                heapq.heappush(heap, (new_g + _h(neigh), counter, new_g, neigh))
+                counter += 1
+
+    nodes, segms = _walk_back(pred, goal) if goal is not None else ([], [])
+
+    return cost, nodes, segms, n_settled
+
+
+def bidirectional_dijkstra(adj, seeds, goals, direct=numpy.inf):
+    """Bidirectional Dijkstra point-to-point search, alternating a forward
+    search from the source with a backward search from the target until
+    the two frontiers prove the best meeting point.
+
+    Parameters
+    ----------
+    adj : dict
+        Network adjacency (see ``adjacency()``).
+    seeds : list
+        Search seeds in the form ``[(node, initial_distance, label), ...]``.
+    goals : list
+        Goal nodes in the form ``[(node, final_distance, label), ...]``, where
+        ``final_distance`` is the remaining cost from ``node`` to the target.
+    direct : float
+        Known cost without traversing the network (e.g. two observations along
+        the same segment). Default is ``numpy.inf``.
+
+    Returns
+    -------
+    cost : float
+        Shortest path cost (``numpy.inf`` if ``target`` is not reachable).
+    nodes : list
+        Node IDs along the shortest path (empty if not traversing the network).
+    segms : list
+        Segment IDs traversed between ``nodes``.
+    n_settled : int
+        The number of nodes settled by both searches.
+
+    """
+
+    # forward (0) and backward (1) tentative distances, predecessors, and heaps
+    best, pred, heaps, settled = [{}, {}], [{}, {}], [[], []], [set(), set()]
+    for side, init in enumerate([seeds, goals]):
+        for node, dist, _ in init:
+            if dist < best[side].get(node, numpy.inf):
+                best[side][node], pred[side][node] = dist, (-1, -1)
+        for order, (node, dist) in enumerate(best[side].items()):
+            heapq.heappush(heaps[side], (dist, order, node))
+    counter = len(seeds) + len(goals)
+
+    cost, meet = direct, None
+    for node in best[0]:
+        if node in best[1] and best[0][node] + best[1][node] < cost:
+            cost, meet = best[0][node] + best[1][node], node
+
+    side = 0
+    while heaps[0] and heaps[1]:
+        # the frontiers can no longer produce a cheaper meeting point
+        if heaps[0][0][0] + heaps[1][0][0] >= cost:
+            break
+        dist, _, node = heapq.heappop(heaps[side])
+        if node in settled[side] or dist > best[side][node]:
+            continue
+        settled[side].add(node)
+        other = best[1 - side]
+        for neigh, length, segm in adj[node]:
+            new_dist = dist + length
+            if new_dist < best[side].get(neigh, numpy.inf):
+                best[side][neigh], pred[side][neigh] = new_dist, (node, segm)
+                heapq.heappush(heaps[side], (new_dist, counter, neigh))
+                counter += 1
+            if neigh in other and best[side][neigh] + other[neigh] < cost:
+                cost, meet = best[side][neigh] + other[neigh], neigh
+        side = 1 - side
+
+    if meet is None:
+        nodes, segms = [], []
+    else:
+        nodes, segms = _walk_back(pred[0], meet)
+        back_nodes, back_segms = _walk_back(pred[1], meet)
+        nodes += back_nodes[::-1][1:]
+        segms += back_segms[::-1]
+
+    n_settled = len(settled[0]) + len(settled[1])
+
+    return cost, nodes, segms, n_settled
+
+
+def segment_arrays(net):
+    """Segment IDs, endpoint nodes, and lengths of the network as arrays.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+
+    Returns
+    -------
+    segms : numpy.ndarray
+        Segment IDs (in the order of ``segm2node``).
+    nodes : numpy.ndarray
+        ``(n_segm, 2)`` endpoint node IDs of each segment.
+    lengths : numpy.ndarray
+        Segment lengths.
+
+    """
+
+    store = topology(net)
+    segms, nodes = store.segm_ids, store.endpoints.astype(numpy.int64)
+    lengths = numpy.fromiter(map(net.segm2len.__getitem__, segms.tolist()), float)
+
+    return segms, nodes, lengths
+
+
+def csr(net):
+    """Sparse (symmetric) adjacency matrix of the network weighted by segment
+    length, and the segment of each stored entry. Only the shortest of any
+    parallel segments is kept and self-loops are dropped. The matrix is
+    cached on the network until its topology changes.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+
+    Returns
+    -------
+    graph : scipy.sparse.csr_matrix
+        Segment lengths indexed by node ID.
+    segment_id : numpy.ndarray
+        The segment ID of each entry in ``graph.data``.
+
+    """
+
+    cached = getattr(net, "_csr", None)
+    if cached is not None:
+        return cached
+
+    segms, nodes, lengths = segment_arrays(net)
+    keep = nodes[:, 0] != nodes[:, 1]
+    segms, nodes, lengths = segms[keep], nodes[keep], lengths[keep]
+    seq = numpy.arange(segms.shape[0])
+
+    # both directions of every segment
+    rows = numpy.concatenate([nodes[:, 0], nodes[:, 1]])
+    cols = numpy.concatenate([nodes[:, 1], nodes[:, 0]])
+    data = numpy.concatenate([lengths, lengths])
+    sid, seq = numpy.concatenate([segms, segms]), numpy.concatenate([seq, seq])
+
+    # sort by row, column, then length -- keeping the first
+    # of equally short parallel segments (see ``adjacency()``)
+    order = numpy.lexsort((seq, data, cols, rows))
+    rows, cols, data, sid = rows[order], cols[order], data[order], sid[order]
+    first = numpy.ones(rows.shape[0], dtype=bool)
+    first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+    rows, cols, data, sid = rows[first], cols[first], data[first], sid[first]
+
+    n = max(net.n_ids) + 1
+    indptr = numpy.zeros(n + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(rows, minlength=n), out=indptr[1:])
+    graph = scipy.sparse.csr_matrix((data, cols, indptr), shape=(n, n))
+
+    net._csr = graph, sid
+
+    return graph, sid
+
+
+def csgraph(net):
+    """Sparse (symmetric) adjacency matrix of the network for ``scipy.sparse.csgraph``
+    routines. Only the shortest of any parallel segments is kept. See ``csr()``.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+
+    Returns
+    -------
+    graph : scipy.sparse.csr_matrix
+        Segment costs indexed by node ID.
+
+    """
+
+    graph, _ = csr(net)
+
+    return graph
+
+
+def _csgraph_dijkstra(graph, indices):
+    """Single source distances from each node in ``indices`` as ``float32``."""
+    dists = scipy.sparse.csgraph.dijkstra(graph, directed=False, indices=indices)
+    return dists.astype(numpy.float32)
+
+
+def landmarks(net, n=16, strategy="farthest", n_jobs=1):
+    """Select landmark nodes and calculate their distances to all nodes.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+    n : int
+        The number of landmarks. Default is ``16``.
+    strategy : str
+        Either ``'farthest'``, which repeatedly selects the node farthest (by
+        network distance) from those already selected, or ``'planar'``, which
+        selects the node farthest from the network centroid in each of ``n``
+        equal angular sectors. Default is ``'farthest'``.
+    n_jobs : int
+        The number of processes used to calculate the landmark distances for
+        the ``'planar'`` strategy. The ``'farthest'`` selection is inherently
+        sequential and calculates the distances while selecting. ``None``
+        uses all available CPUs. Default is ``1``.
+
+    Returns
+    -------
+    nodes : numpy.ndarray
+        Landmark node IDs.
+    dists : numpy.ndarray
+        ``(n, V)`` ``float32`` network distances from each landmark.
+
+    """
+
+    graph = csgraph(net)
+    n = min(n, net.n_node)
+
+    if strategy == "farthest":
+        ids = numpy.asarray(net.n_ids)
+        # start from the node farthest from an arbitrary node
+        mindist = _csgraph_dijkstra(graph, [ids[0]])[0]
+        nodes, dists = [], []
+        for i in range(n):
+            # unreached nodes (other components) are the farthest
+            reach = mindist[ids]
+            if i and reach.max() == 0.0:
+                break
+            node = ids[reach.argmax()]
+            dist = _csgraph_dijkstra(graph, [node])[0]
+            nodes.append(node)
+            dists.append(dist)
+            mindist = dist if not i else numpy.minimum(mindist, dist)
+        nodes, dists = numpy.array(nodes), numpy.vstack(dists)
+
+    elif strategy == "planar":
+        ids = numpy.asarray(net.n_ids)
+        xys = numpy.array([net.node2coords[i][0] for i in ids])
+        offsets = xys - xys.mean(axis=0)
+        angles = numpy.arctan2(offsets[:, 1], offsets[:, 0])
+        sectors = ((angles + numpy.pi) / (2 * numpy.pi) * n).astype(int) % n
+        radii = numpy.hypot(offsets[:, 0], offsets[:, 1])
+        nodes = []
+        for sector in range(n):
+            members = numpy.nonzero(sectors == sector)[0]
+            if members.size:
+                nodes.append(ids[members[radii[members].argmax()]])
+        nodes = numpy.array(nodes)
+
+        # calculate the landmark distances in parallel
+        n_jobs = _n_jobs(n_jobs, len(nodes))
+        chunks = [c for c in numpy.array_split(nodes, n_jobs) if c.size]
+        if n_jobs > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                dists = list(pool.map(_csgraph_dijkstra, [graph] * len(chunks), chunks))
+        else:
+            dists = [_csgraph_dijkstra(graph, c) for c in chunks]
+        dists = numpy.vstack(dists)
+
+    else:
+        msg = "Landmark selection strategy '%s' not supported. " % strategy
+        msg += "Choose from ['farthest', 'planar']."
+        raise ValueError(msg)
+
+    return nodes, dists
+
+
+def landmark_lower_bounds(dists, node, goal_dists):
+    """Triangle inequality lower bound of the distance between ``node`` and a
+    goal from landmark distances. The ``float32`` rounding error is
+    subtracted to keep the bound admissible.
+
+    Parameters
+    ----------
+    dists : numpy.ndarray
+        ``(n, V)`` landmark distances.
+    node : int
+        Node ID.
+    goal_dists : numpy.ndarray
+        Landmark distances of the goal (``dists[:, goal]``).
+
+    Returns
+    -------
+    lower : float
+        Lower bound of the network distance.
+
+    """
+
+    node_dists = dists[:, node]
+    bounds = numpy.abs(goal_dists - node_dists)
+    bounds -= numpy.finfo(numpy.float32).eps * (goal_dists + node_dists)
+    lower = float(numpy.fmax.reduce(bounds))
+    if lower != lower or lower < 0.0:
+        lower = 0.0
+
+    return lower
+
+
+def landmark_upper_bound(dists, node, goal_dists):
+    """Upper bound of the distance between ``node`` and a goal through the
+    best landmark. The ``float32`` rounding error is added to keep the bound
+    above the network distance.
+
+    Parameters
+    ----------
+    dists : numpy.ndarray
+        ``(n, V)`` landmark distances.
+    node : int
+        Node ID.
+    goal_dists : numpy.ndarray
+        Landmark distances of the goal (``dists[:, goal]``).
+
+    Returns
+    -------
+    upper : float
+        Upper bound of the network distance.
+
+    """
+
+    totals = dists[:, node].astype(float) + goal_dists
+    totals += numpy.finfo(numpy.float32).eps * totals
+    upper = float(totals.min())
+
+    return upper
+
+
+class ContractionHierarchy(object):
+    """Contraction hierarchy for fast repeated point-to-point network distance
+    queries. Nodes are contracted in order of importance (edge difference plus
+    the number of already contracted neighbors) and shortcuts are added
+    between the remaining neighbors of a contracted node unless a witness path
+    of at most the same cost exists. Queries are then answered by two
+    searches that only move "upward" in the hierarchy.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+    witness_limit : int
+        The maximum number of nodes settled by each witness search. Lower
+        values speed up the preprocessing at the expense of (unnecessary)
+        shortcuts. Default is ``500``.
+
+    Attributes
+    ----------
+    rank : dict
+        Contraction order in the form ``{node: rank}``.
+    up : dict
+        Upward graph in the form ``{node: [(higher_ranked_neighbor, cost), ...]}``.
+    middle : dict
+        Contracted node bypassed by each shortcut in the form ``{(u, v): node}``
+        with ``u < v``.
+    n_shortcuts : int
+        The number of shortcuts added.
+
+    """
+
+    def __init__(self, net, witness_limit=500):
+
+        self.witness_limit = witness_limit
+        self.rank, self.up, self.middle = {}, {}, {}
+        self.n_shortcuts = 0
+
+        # remaining (not yet contracted) graph
+        graph = {u: {v: l for v, l, s in nbrs} for u, nbrs in adjacency(net).items()}
+        deleted = {n: 0 for n in graph}
+
+        def _priority(v):
+            shortcuts = self._shortcuts(graph, v)
+            return len(shortcuts) - len(graph[v]) + deleted[v]
+
+        heap = [(_priority(v), v) for v in graph]
+        heapq.heapify(heap)
+
+        while heap:
+            _, v = heapq.heappop(heap)
+
+            # lazy update -- re-queue if no longer the least important node
+            priority = _priority(v)
+            if heap and priority > heap[0][0]:
+                heapq.heappush(heap, (priority, v))
+                continue
+
+            # add shortcuts bypassing ``v``
+            for u, w, cost in self._shortcuts(graph, v):
+                if cost < graph[u].get(w, numpy.inf):
+                    graph[u][w] = graph[w][u] = cost
+                    self.middle[(min(u, w), max(u, w))] = v
+                    self.n_shortcuts += 1
+
+            # contract ``v`` -- all remaining neighbors are higher ranked
+            self.rank[v] = len(self.rank)
+            self.up[v] = list(graph[v].items())
+            for u in graph[v]:
+                del graph[u][v]
+                deleted[u] += 1
+            del graph[v]
+
+    def _shortcuts(self, graph, v):
+        """Shortcuts required to contract ``v`` from ``graph``.
+
+        Parameters
+        ----------
+        graph : dict
+            Remaining graph in the form ``{node: {neighbor: cost}}``.
+        v : int
+            Node to contract.
+
+        Returns
+        -------
+        shortcuts : list
+            Shortcuts in the form ``[(u, w, cost), ...]``.
+
+        """
+
+        shortcuts = []
+        nbrs = list(graph[v].items())
+        for idx, (u, cost_u) in enumerate(nbrs):
+            others = nbrs[idx + 1 :]
+            if not others:
+                continue
+
+            # witness search from ``u`` avoiding ``v``
+            limit = cost_u + max(cost for _, cost in others)
+            dist, heap, n_settled = {u: 0.0}, [(0.0, u)], 0
+            while heap and n_settled < self.witness_limit:
+                d, n = heapq.heappop(heap)
+                if d > dist[n]:
+                    continue
+                if d > limit:
+                    break
+                n_settled += 1
+                for m, cost in graph[n].items():
+                    if m != v and d + cost < dist.get(m, numpy.inf):
+                        dist[m] = d + cost
+                        heapq.heappush(heap, (d + cost, m))
+
+            for w, cost_w in others:
+                if dist.get(w, numpy.inf) > cost_u + cost_w:
+                    shortcuts.append((u, w, cost_u + cost_w))
+
+        return shortcuts
+
+    def _upward(self, source):
+        """Full upward search from ``source``.
+
+        Parameters
+        ----------
+        source : int
+            Node to search from.
+
+        Returns
+        -------
+        dist : dict
+            Upward search space in the form ``{node: cost}``.
+
+        """
+
+        dist, heap = {source: 0.0}, [(0.0, source)]
+        while heap:
+            d, n = heapq.heappop(heap)
+            if d > dist[n]:
+                continue
+            for m, cost in self.up[n]:
+                if d + cost < dist.get(m, numpy.inf):
+                    dist[m] = d + cost
+                    heapq.heappush(heap, (d + cost, m))
+
+        return dist
+
+    def _unpack(self, u, v):
+        """Expand the (shortcut) edge ``(u, v)`` into original network nodes."""
+
+        nodes, stack = [u], [(u, v)]
+        while stack:
+            a, b = stack.pop()
+            key = (min(a, b), max(a, b))
+            if key in self.middle:
+                m = self.middle[key]
+                stack += [(m, b), (a, m)]
+            else:
+                nodes.append(b)
+
+        return nodes
+
+    def query(self, source, target, path=False):
+        """Shortest path cost between two nodes from a bidirectional
+        upward search.
+
+        Parameters
+        ----------
+        source : int
+            Origin node ID.
+        target : int
+            Destination node ID.
+        path : bool
+            Also return the nodes along the (unpacked) shortest path.
+            Default is ``False``.
+
+        Returns
+        -------
+        cost : float
+            Shortest path cost (``numpy.inf`` if ``target`` is not reachable).
+        nodes : list
+            Node IDs along the shortest path (if ``path=True``).
+
+        """
+
+        for node in [source, target]:
+            if node not in self.rank:
+                raise IndexError("Node '%s' is not in the hierarchy." % node)
+
+        dist = [{source: 0.0}, {target: 0.0}]
+        pred = [{source: None}, {target: None}]
+        heaps = [[(0.0, source)], [(0.0, target)]]
+        cost, meet = numpy.inf, None
+        if source == target:
+            cost, meet = 0.0, source
+
+        while heaps[0] or heaps[1]:
+            for side in [0, 1]:
+                if not heaps[side]:
+                    continue
+                d, n = heapq.heappop(heaps[side])
+                if d > dist[side][n]:
+                    continue
+                # this direction can no longer improve on the cheapest cost
+                if d >= cost:
+                    heaps[side] = []
+                    continue
+                other = dist[1 - side]
+                if n in other and d + other[n] < cost:
+                    cost, meet = d + other[n], n
+                for m, c in self.up[n]:
+                    if d + c < dist[side].get(m, numpy.inf):
+                        dist[side][m], pred[side][m] = d + c, n
+                        heapq.heappush(heaps[side], (d + c, m))
+
+        if not path:
+            return cost
+
+        nodes = []
+        if meet is not None:
+            # upward nodes from the source and target to the meeting node
+            halves = []
+            for side in [0, 1]:
+                n, half = meet, [meet]
+                while pred[side][n] is not None:
+                    n = pred[side][n]
+                    half.append(n)
+                halves.append(half)
+            upward = halves[0][::-1] + halves[1][1:]
+            nodes = [upward[0]]
+            for a, b in zip(upward[:-1], upward[1:]):
+                nodes += self._unpack(a, b)[1:]
+
+        return cost, nodes
+
+    def many_to_many(self, sources, targets):
+        """Shortest path costs between all ``sources`` and ``targets`` with
+        the bucket method (one upward search per source and target).
+
+        Parameters
+        ----------
+        sources : list
+            Origin node IDs.
+        targets : list
+            Destination node IDs.
+
+        Returns
+        -------
+        mtx : numpy.ndarray
+            ``(len(sources), len(targets))`` shortest path costs.
+
+        """
+
+        for node in list(sources) + list(targets):
+            if node not in self.rank:
+                raise IndexError("Node '%s' is not in the hierarchy." % node)
+
+        buckets = {}
+        for j, target in enumerate(targets):
+            for n, d in self._upward(target).items():
+                buckets.setdefault(n, []).append((j, d))
+
+        mtx = numpy.full((len(sources), len(targets)), numpy.inf)
+        for i, source in enumerate(sources):
+            row = mtx[i]
+            for n, d in self._upward(source).items():
+                for j, dt in buckets.get(n, []):
+                    if d + dt < row[j]:
+                        row[j] = d + dt
+
+        return mtx
+
+
+###############################################################################
+################ Near-Network Observations functionality ######################
+###############################################################################
+
+
+def remove_restricted(net, restr=None, col=None):
+    """Subset the unrestricted segments and update adjacencies and
+    return (1) the geodataframe of unrestricted segments, and (2) the
+    network object with updated adjacency values. Used for snapping points
+    to appropriate network segments. The network is altered in place,
+    see ``restricted_view()`` for a non-mutating alternative.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+    restr : list
+        Restricted segment types. Default is ``None``.
+    col : str
+        Column name for segment restriction stipulation. Default is ``None``.
+
+    Returns
+    -------
+    net : tigernet.Network
+        The updated network object.
+
+    """
+
+    def _remove_segm_ids(n2s, restr):
+        """Remove restricted segment ids from node to segment adjacency.
+
+        Parameters
+        ----------
+        n2s : dict
+            Node to segment adjacency.
+        restr : list
+            Restricted segment ids.
+
+        Returns
+        -------
+        n2s : dict
+            Updated node to segment adjacency.
+
+        """
+
+        update_n2s = {}
+
+        for node, segms in list(n2s.items()):
+            updated_segms = []
+
+            for segm in segms:
+                if segm not in restr:
+                    updated_segms.append(segm)
+            update_n2s[node] = updated_segms
+
+        n2s = update_n2s
+
+        return n2s
+
+    # the cached search adjacency and spatial indexes are of the full network
+    net.clear_indexes()
+
+    # records all node and segment ids
+    df, full_node_ids, full_segm_ids = net.s_data, net.n_ids, net.s_ids
+
+    # get restricted segment ids
+    restricted_segm_ids = list(df[df[col].isin(restr)].index)
+
+    # subset unrestricted segments dataframe
+    unrestrict_segm_df = df[~df[col].isin(restr)]
+
+    # remove restricted segment ids from the segment id list
+    net.s_ids = list(unrestrict_segm_df.index)
+
+    # update segm2node
+    net.segm2node = remove_adj(net.segm2node, restricted_segm_ids)
+
+    # update segm2geom
+    net.segm2geom = remove_adj(net.segm2geom, restricted_segm_ids)
+
+    # remove restricted node ids from the node id list
+    unrestrict_node_ids = set()
+    for seg, nodes in list(net.segm2node.items()):
+        unrestrict_node_ids.update(nodes)
+    net.n_ids = sorted(list(unrestrict_node_ids))
+
+    # record restricted nodes: these are nodes that fall ONLY on
+    # restricted segments (e.g. node incident with 2 restricted
+    # segments). Node that are incident with 1 restricted and 1
+    # unrestricted segment are NOT restricted but the node2segm
+    # adjacency for the restricted segment will be removed in below.
+    restricted_node_ids = [node for node in full_node_ids if node not in net.n_ids]
+
+    # update node2coords
+    net.node2coords = remove_adj(net.node2coords, restricted_node_ids)
+
+    # update node2geom
+    net.node2geom = remove_adj(net.node2geom, restricted_node_ids)
+
+    # update node2segm adjacency by removing restricted
+    # segments from nodes that are incident with both
+    # restricted and unrestricted segments
+    net.node2segm = _remove_segm_ids(net.node2segm, restricted_segm_ids)
+
+    return net
+
+
+def restricted_view(net, restr=None, col=None):
+    """Return the (cached) view of the network without the restricted
+    segments for snapping observations. Unlike ``remove_restricted()``
+    the network itself is not altered, so it may be shared between
+    restriction sets (and threads).
+
+    Parameters
+    ----------
+    net : tigernet.Network
+    restr : list
+        Restricted segment types. Default is ``None``.
+    col : str
+        Column name for segment restriction stipulation. Default is ``None``.
+
+    Returns
+    -------
+    view : tigernet.utils.RestrictedNetwork
+        The unrestricted segments and nodes of the network.
+
+    """
+
+    views = getattr(net, "_restricted_views", None)
+    if views is None:
+        views = net._restricted_views = {}
+
+    key = (col, frozenset(restr))
+    view = views.get(key)
+    if view is None:
+        view = views[key] = RestrictedNetwork(net, restr=restr, col=col)
+
+    return view
+
+
+class _RestrictedAdjacency(object):
+    """Read-only lookup of element to segment adjacency excluding
+    the restricted segments, filtered when accessed."""
+
+    def __init__(self, e2s, unrestricted):
+        self._e2s, self._unrestricted = e2s, unrestricted
+
+    def __getitem__(self, key):
+        return [segm for segm in self._e2s[key] if segm in self._unrestricted]
+
+    def __contains__(self, key):
+        return key in self._e2s
+
+    def __len__(self):
+        return len(self._e2s)
+
+    def __iter__(self):
+        return iter(self._e2s)
+
+
+class RestrictedNetwork(object):
+    """A network masked to its unrestricted segments (and the nodes incident
+    with them) for snapping observations. Attributes not overridden here are
+    read from the underlying network, which is left untouched.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+    restr : list
+        Restricted segment types. Default is ``None``.
+    col : str
+        Column name for segment restriction stipulation. Default is ``None``.
+
+    Attributes
+    ----------
+    network : tigernet.Network
+        The underlying network.
+    segm_mask : numpy.ndarray
+        Unrestricted (``True``) segments of the network in ``network.s_ids``.
+    node_mask : numpy.ndarray
+        Unrestricted (``True``) nodes of the network in ``network.n_ids``.
+    s_ids : list
+        Unrestricted segment IDs.
+    n_ids : list
+        Nodes IDs incident with at least one unrestricted segment.
+    node2segm : tigernet.utils._RestrictedAdjacency
+        Node to unrestricted segment lookup.
+
+    """
+
+    def __init__(self, net, restr=None, col=None):
+        self.network = net
+
+        # restricted segments are masked -- a node is restricted only when
+        # all of its incident segments are (see ``remove_restricted()``)
+        s_ids, n_ids = numpy.asarray(net.s_ids), numpy.asarray(net.n_ids)
+        df = net.s_data
+        self.segm_mask = ~numpy.isin(s_ids, df.index[df[col].isin(restr)])
+        s_ids = s_ids[self.segm_mask]
+        nodes = topology(net).segm_endpoints(s_ids)
+        self.node_mask = numpy.isin(n_ids, nodes)
+
+        self.s_ids, self.n_ids = s_ids.tolist(), n_ids[self.node_mask].tolist()
+        self.node2segm = _RestrictedAdjacency(net.node2segm, set(self.s_ids))
+        self._nodes_kdtree = None
+
+    def __getattr__(self, name):
+        # only called for attributes not set on the view
+        if name == "network":
+            raise AttributeError(name)
+        return getattr(self.network, name)
+
+    def nodes_kdtree(self):
+        """Build (once) a kdtree of the unrestricted network nodes.
+
+        Returns
+        -------
+        kdtree : scipy.spatial.cKDTree
+            Unrestricted network nodes lookup, in the order of ``n_ids``.
+
+        """
+
+        if self._nodes_kdtree is None:
+            coords = [self.network.node2coords[node][0] for node in self.n_ids]
+            coords = numpy.array(coords, dtype=float).reshape(-1, 2)
+            self._nodes_kdtree = scipy.spatial.cKDTree(coords)
+
+        return self._nodes_kdtree
+
+
+def get_obs2coords(obs):
+    """Create an observation to coordinate xwalk.
+
+    Parameters
+    ----------
+    obs : tigernet.Observations
+
+    Returns
+    -------
+    o2c : dict
+        Observations to coordinates lookup.
+
+    """
+
+    o2c = {
+        (ix, obs.df.loc[ix, obs.df_key]): (
+            obs.df.loc[ix, obs.geo_col].x,
+            obs.df.loc[ix, obs.geo_col].y,
+        )
+        for ix in obs.df.index
+    }
+
+    return o2c
+
+
+def snap_to_nearest(obs, net, n_jobs=1):
+    """Record the nearest network node then snap to either that
+    endpoint or the nearest line segment.
+
+    Parameters
+    ----------
+    obs : tigernet.Observations
+    net : tigernet.Network
+    n_jobs : int
+        The number of worker processes snapping the observations, which attach
+        to the network in shared memory (see ``share_network()``). ``None``
+        uses all available CPUs. Default is ``1``.
+
+    Returns
+    -------
+    snp_pts_df : geopandas.GeoDataFrame
+        Dataframe of observations snapped to the network.
+
+    """
+
+    def _get_k_nearest(obs, net):
+        """Record k nearest in the form: ``[[(idx, key), [dists, nodes], [segments]]]``.
+
+        Returns
+        -------
+        k_nearest : list
+            Information on the k-nearest neighbors.
+
+        """
+
+        if obs.k > len(net.s_ids):
+            obs.k = len(net.s_ids)
+
+        k_nearest = []
+
+        for (obidx, coords) in obs.obs2coords.items():
+
+            # query kdtree and return array-like list in the form:
+            # >>>    [[dist1, n1], [dist2, node2], ...[distn, noden]]
+            tree = numpy.array(obs.kd_tree.query(coords, k=obs.k)).T.tolist()
+
+            # convert id from float to int
+            tree = [[dist, net.n_ids[int(idx)]] for (dist, idx) in tree]
+
+            # get all segments associated with each k-nearest node
+            segms = [net.node2segm[idx] for (dist, idx) in tree]
+            segms = set([seg for segs in segms for seg in segs])
+
+            # get node distances and nodes from tree query
+            nodes = [idx for (dist, idx) in tree]
+            node_dists = [dist for (dist, idx) in tree]
+
+            # append to nearest information list
+            k_nearest.append([obidx, [node_dists, nodes], segms])
+
+        return k_nearest
+
+    k_near_elems = _get_k_nearest(obs, net)
+
+    # snap points
+    points = [obs.df[obs.geo_col][idx] for (idx, key), _, _ in k_near_elems]
+    args = obs.snap_to, obs.df_key, obs.tol, obs.geo_col
+    n_jobs = _n_jobs(n_jobs, len(k_near_elems))
+    if n_jobs > 1:
+        # snap (contiguous) subsets of the observations in each worker -- the
+        # segment sets are sent as lists to keep their iteration order
+        kne = [(ik, dn, list(segms)) for ik, dn, segms in k_near_elems]
+        kne_splits = _split(kne, n_jobs)
+        point_splits = _split(points, n_jobs)
+        tasks = [(k, p) + args for k, p in zip(kne_splits, point_splits)]
+        with share_network(net, matrix=False) as handle:
+            snapped = _shared_map(_snap_points, tasks, [handle], n_jobs)
+        snapped_pts = {}
+        for _snapped in snapped:
+            snapped_pts.update(_snapped)
+    else:
+        snapped_pts = _snap_points(net, k_near_elems, points, *args)
+
+    # make columns headers based on snap method
+    if obs.snap_to == "segments":
+        cols = [
+            obs.df_key,
+            "assoc_segm",
+            "dist2line",
+            "dist_a",
+            "node_a",
+            "dist_b",
+            "node_b",
+            obs.geo_col,
+        ]
+
+    if obs.snap_to == "nodes":
+        cols = [obs.df_key, "assoc_node", "dist2node", obs.geo_col]
+
+    # create dataframe
+    snp_pts_df = fill_frame(obs.df, snapped_pts, full=True, col=cols)
+
+    # add xyid
+    node2xyid = generate_xyid(df=snp_pts_df, geom_type="node", geo_col=obs.geo_col)
+    snp_pts_df = fill_frame(snp_pts_df, node2xyid, idx="index", col=obs.xyid)
+
+    return snp_pts_df
+
+
+def _snap_points(net, kne, points, snap_to, df_key, tol, geo_col):
+    """Find the nearest point along a line segment of the nearest
+    network node and records pertinent information. See ``snap_to_nearest()``.
+
+    Parameters
+    ----------
+    net : {tigernet.Network, tigernet.utils.AttachedNetwork}
+    kne : list
+        Information on the k-nearest neighbors.
+    points : list
+        The original point geometry of each observation in ``kne``.
+    snap_to : str
+        Snap points to either ``'segments'`` or ``'nodes'``.
+    df_key : {str, int}
+        Observations dataframe key column name.
+    tol : float
+        Snapping to line tolerance.
+    geo_col : str
+        Observations geometry column name.
+
+    Returns
+    -------
+    snpts : dict
+        Information on the newly-snapped observations.
+
+    """
+
+    def _unary2point(net, sgs, spinfo, opt):
+        """Find the nearest point along the lines of a unary union.
+
+        Parameters
+        ----------
+        sgs : list
+            Unrestricted segment ids.
+        spinfo : dict
+            Snapped point information.
+        opt : shapely.geometry.Point
+            Original point geometry.
+
+        Returns
+        -------
+        spinfo : dict
+            Updated snapped point information.
+
+        """
+
+        # get line subset (in the order of the segments dataframe)
+        segms_sub = geopandas.GeoSeries([net.segm2geom[s] for s in sorted(sgs)])
+        segms_uu = segms_sub.unary_union
+        near_points = []
+
+        segms_uu = sorted(segms_uu, key=lambda line: line.xy)
+
+        for line in segms_uu:
+            near_pt = line.interpolate(line.project(opt))
+            near_points.append(near_pt)
+
+        NEAREAST_POINT_DIST = numpy.inf
+        point = None
+        for near_p in near_points:
+            if near_p.distance(opt) < NEAREAST_POINT_DIST:
+                NEAREAST_POINT_DIST = near_p.distance(opt)
+                point = near_p
+
+        # get coords of new point
+        spinfo[geo_col] = point
+
+        # tease out which exact segment
+        for ns in sgs:
+            if net.segm2geom[ns].intersects(point.buffer(tol)):
+                spinfo["assoc_segm"] = ns
+                break
+        return spinfo
+
+    # snapped points dictionary
+    snpts = {}
+
+    for ((idx, key), (dists, nodes), (segms)), opt in zip(kne, points):
+
+        spinfo = {df_key: key}
+        if snap_to == "segments":
+
+            # original point geometry is ``opt``
+            spinfo = _unary2point(net, segms, spinfo, opt)
+
+            # associated segment
+            asc_seg = spinfo["assoc_segm"]
+
+            # snapped point geometry
+            snp = spinfo[geo_col]
+            line_length = net.segm2len[asc_seg]
+
+            # line segment geometry
+            asc_seg_geom = net.segm2geom[asc_seg]
+
+            # endpoint of the associated line segment
+            line_ep1 = net.segm2node[asc_seg][0]
+            line_ep2 = net.segm2node[asc_seg][1]
+
+            # line segment endpoint 1 geometry
+            line_ep1_geom = net.node2geom[line_ep1]
+
+            # set line endpoints 1 and 2 as node a and node b
+            # node a is determined as being 0.0 distance from the
+            # projected distance along the line segment
+            if asc_seg_geom.project(line_ep1_geom) == 0.0:
+                node_a = line_ep1
+                node_b = line_ep2
+            else:
+                node_a = line_ep2
+                node_b = line_ep1
+
+            # node a information ----------------------------------
+            #       * node a is the point which shapely chooses as
+            #         the base from which calculation occurs
+            #         for 'project' distance.
+            #       * node a is generally the 'smaller' of the
+            #         the two line segment endpoint in
+            #         euclidean space
+            dist_a = asc_seg_geom.project(snp)
+            spinfo["dist_a"] = dist_a
+            spinfo["node_a"] = node_a
+            # node b information ----------------------------------
+            dist_b = line_length - dist_a
+            spinfo["dist_b"] = dist_b
+            spinfo["node_b"] = node_b
+            spinfo["dist2line"] = snp.distance(opt)
+
+        # just to the nearest network vertex
+        # does not currently stipulate tha ti has to be the
+        # nearest vertex on the nearest line
+        # can add in functionality later
+        if snap_to == "nodes":
+            nearest_node, nearest_dist = nodes[0], dists[0]
+            spinfo["assoc_node"] = nearest_node
+            spinfo["dist2node"] = nearest_dist
+            spinfo[net.geo_col] = net.node2geom[nearest_node]
+
+        # add to dictionary
+        snpts[idx] = spinfo
+
+    return snpts
+
+
+def obs2obs_costs(
+    orig,
+    dest,
+    symmetric,
+    network_matrix,
+    from_nodes,
+    snap_dist,
+    assoc_col,
+    dist_type,
+    xyid,
+    numeric_cols,
+    chunksize=None,
+    n_jobs=1,
+    shared=None,
+):
+    """Internal function to calculate a cost matrix
+    from (n) observations to (m) observations.
+
+    Parameters
+    ----------
+    orig : geopandas.GeoDataFrame
+        Origin observations.
+    dest : geopandas.GeoDataFrame
+        Destination observations.
+    symmetric : bool
+        Calculate an observation nXn cost matrix.
+    network_matrix : {numpy.ndarray, TriangularMatrix, scipy.sparse.csr_matrix}
+        'nXn' network nodes cost matrix.
+    from_nodes : bool
+        Calculate cost matrix from network nodes only.
+    snap_dist : str
+        Column name to use for distance to observation from the network.
+    assoc_col : str
+        Column name for network geometry snapping.
+    dist_type : str
+        Type of distance cost matrix.
+        Options are 'network_pp2n' and 'euclidean'. Default is None.
+    xyid : str
+        String xyID column name
+    numeric_cols : list
+        Columns to preprocess to ensure numeric values.
+    chunksize : int
+        Number of origin rows per block. If set, a generator of
+        ``(row_slice, block)`` tuples is returned instead of the full
+        matrix. Default is ``None``.
+    n_jobs : int
+        The number of worker processes calculating the rows, which attach to
+        the network cost matrix in shared memory. ``None`` uses all available
+        CPUs. Default is ``1``.
+    shared : tigernet.utils.SharedNetwork
+        A handle of the network (including ``network_matrix``) in shared
+        memory for the workers (see ``share_network()``). Default is ``None``,
+        which shares ``network_matrix`` for the calculation.
+
+    Returns
+    -------
+    n2m_matrix : {numpy.ndarray, generator}
+        'nXm' cost matrix or a generator of its row blocks.
+
+    """
+
+    def _ensure_numeric(o, d, cols):
+        """Make sure dataframe columns are in proper numeric format.
+
+        Parameters
+        ----------
+        o : geopandas.GeoDataFrame
+            Origin observations.
+        d : geopandas.GeoDataFrame
+            Destination observations.
+        cols : list
+            Columns to preprocess to ensure numeric values.
+
+        Returns
+        -------
+        o : geopandas.GeoDataFrame
+            Origin observations.
+        d : geopandas.GeoDataFrame
+            Destination observations.
+
+        """
+
+        # having trouble keeping the integers and floats in numeric form
+        types = [int, float, numpy.int64, numpy.float64]
+
+        for col in cols:
+
+            if type(o[col][0]) not in types:
+                o[col] = o[col].apply(lambda x: literal_eval(x))
+
+            if type(d[col][0]) not in types:
+                d[col] = d[col].apply(lambda x: literal_eval(x))
+
+        return o, d
+
+    # set matrix style
+    if symmetric:
+        dest = copy.deepcopy(orig)
+
+    # make sure node indices and distances are set to
+    # numeric values in dataframe columns
+    if dist_type != "euclidean":
+        orig, dest = _ensure_numeric(orig, dest, numeric_cols)
+
+    opts = symmetric, from_nodes, snap_dist, assoc_col, dist_type, xyid
+    n_jobs = _n_jobs(n_jobs, orig.shape[0])
+
+    @contextlib.contextmanager
+    def _pool():
+        """Worker processes attached to the network cost matrix (if parallel)."""
+        if n_jobs < 2:
+            yield None
+            return
+        handle = shared
+        if handle is None:
+            arrays, attrs = _matrix_arrays(network_matrix)
+            handle = SharedNetwork(arrays, attrs=attrs)
+        try:
+            with _shared_pool([handle], n_jobs) as pool:
+                yield pool
+        finally:
+            if shared is None:
+                handle.close()
+
+    def _block(rows, pool):
+        """Calculate the cost matrix rows for the origins in ``rows``."""
+        if pool is None:
+            return _obs2obs_block(network_matrix, orig, dest, rows, *opts)
+        tasks = [(orig.loc[r], dest, r) + opts for r in _split(list(rows), n_jobs)]
+        return numpy.vstack(_pool_map(pool, _obs2obs_rows, tasks))
+
+    def _blocks():
+        """Yield ``(row_slice, block)`` tuples of (at most) ``chunksize`` rows."""
+        with _pool() as pool:
+            for start in range(0, orig.shape[0], chunksize):
+                stop = min(start + chunksize, orig.shape[0])
+                yield slice(start, stop), _block(orig.index[start:stop], pool)
+
+    # stream the matrix in blocks of rows
+    if chunksize:
+        return _blocks()
+
+    # instantiate and fill the full matrix
+    with _pool() as pool:
+        n2m_matrix = _block(orig.index, pool)
+
+    return n2m_matrix
+
+
+def _obs2obs_rows(net, orig, dest, rows, *opts):
+    """Calculate observation cost matrix rows with the cost matrix of an
+    attached network. See ``obs2obs_costs()``."""
+
+    return _obs2obs_block(net.n2n_matrix, orig, dest, rows, *opts)
+
+
+def _obs2obs_block(
+    network_matrix,
+    orig,
+    dest,
+    rows,
+    symmetric,
+    from_nodes,
+    snap_dist,
+    assoc_col,
+    dist_type,
+    xyid,
+):
+    """Calculate the observation cost matrix rows for the origins in ``rows``.
+    See ``obs2obs_costs()`` for the parameters.
+
+    Returns
+    -------
+    block : numpy.ndarray
+        ``(len(rows), dest.shape[0])`` costs.
+
+    """
+
+    # pairs missing from a sparse (cutoff) matrix are unreachable
+    if scipy.sparse.issparse(network_matrix):
+        network_matrix = SparseCosts(network_matrix)
+
+    def _cost(i, j):
+        """Calculate the cost from origin ``i`` to destination ``j``."""
+
+        # Euclidean observation nodes distance
+        if dist_type == "euclidean":
+            xi, xj = orig[xyid][i], dest[xyid][j]
+            if xi == xj and i == j:
+                euc_dist = 0.0
+            else:
+                p1, p2 = _return_coords(xi), _return_coords(xj)
+                euc_dist = _euc_dist(p1, p2)
+                if snap_dist:
+                    orig_snap = orig[snap_dist][i]
+                    dest_snap = dest[snap_dist][j]
+                    dist_snap = orig_snap + dest_snap
+                    euc_dist += dist_snap
+            return euc_dist
+
+        # if i and j are the same observation
+        # there is no distance
+        if i == j and symmetric:
+            return 0.0
+
+        # Network (from 'network nodes') distance
+        if from_nodes:
+            I = orig.loc[i, assoc_col]  # i network node ID
+            J = dest.loc[j, assoc_col]  # j network node ID
+            # network i to j dist
+            net_dist = network_matrix[I, J]
+
+            # add in distance from observation to network
+            if snap_dist:
+                # snapped i dist
+                from_i = orig[snap_dist][i]
+                # snapped j dist
+                from_j = dest[snap_dist][j]
+                net_dist = from_i + from_j + net_dist
+
+            return net_dist
+
+        # Network (from snapped point) distance
+        # complete distance
+        # start p1 --> snap point --> nearest node -->
+        # furtherst(closest) node --> snap point --> goal p2
+
+        # network segments associated with i and j
+        isegm, jsegm = orig[assoc_col][i], dest[assoc_col][j]
+
+        # calculate network distance from i to j
+        network_dist = _dist_calc(orig, i, isegm, dest, j, jsegm, network_matrix)
+        # add in distance from observation to network
+        if snap_dist:
+            orig_snap = orig[snap_dist][i]
+            dest_snap = dest[snap_dist][j]
+            dist_snap = orig_snap + dest_snap
+            network_dist += dist_snap
+
+        return network_dist
+
+    block = numpy.zeros((len(rows), dest.shape[0]))
+    for r, i in enumerate(rows):
+        for j in dest.index:
+            block[r, j] = _cost(i, j)
+
+    return block
+
+
+def _dist_calc(
+    o, i, isg, d, j, jsg, matrix, na="node_a", nb="node_b", da="dist_a", db="dist_b"
+):
+    """Get the cheapest cost route from snapped pt1 to snapped pt 2
+
+    Parameters
+    ----------
+    o : geopandas.GeoDataFrame
+        Origin observations.
+    i : int
+        Origin index.
+    isg : int
+        Segment associated with i.
+    d : geopandas.GeoDataFrame
+        Destination observations.
+    j : int
+        Destination index.
+    jsg : int
+        Segment associated with j.
+    matrix : {numpy.ndarray, TriangularMatrix}
+        All node-to-all node network cost matrix.
+    na : str
+        Right node label (may actually be to the visual left).
+        Default is ``'R_node'``.
+    nb : str
+        left node label (may actually be to the visual right).
+        Default is ``'L_node'``.
+    da : str
+        Distance label to ``'rn'``. Default is ``'R_dist'``.
+    db : str
+        Distance label to ``'ln'``. Default is ``'L_dist'``.
+
+    Returns
+    -------
+    initial_dist : float or int
+        Distance from snapped point to snapped point.
+
+    """
+
+    # get node indices
+    ai, bi = o[na][i], o[nb][i]
+    aj, bj = d[na][j], d[nb][j]
+
+    # origin right and left distance
+    ai_dist, bi_dist = o[da][i], o[db][i]
+
+    # destination right and left distance
+    aj_dist, bj_dist = d[da][j], d[db][j]
+
+    # if observation nodes are snapped to the same segment
+    if (ai, bi) == (aj, bj) and isg == jsg:
+
+        # if the ORIGIN 'right' distance is greater than
+        # (or equal to) the DESTINATION 'right' distance then
+        # subtract the DESTINATION from the ORIGIN distance...
+        if ai_dist >= aj_dist:
+            initial_dist = ai_dist - aj_dist
+
+        # ... otherwise subtract the 'right' ORIGIN from
+        # the DESTINATION distance
+        else:
+            initial_dist = aj_dist - ai_dist
+
+    # observation nodes are snapped to different segments
+    else:
+        # get all combinations of potential distance
+        a2a = matrix[ai, aj]
+        a2b = matrix[ai, bj]
+        b2b = matrix[bi, bj]
+        b2a = matrix[bi, aj]
+
+        # create distance lookup dictionary
+        lookup = {
+            (ai, aj, "ai", "aj"): a2a,
+            (ai, bj, "ai", "bj"): a2b,
+            (bi, bj, "bi", "bj"): b2b,
+            (bi, aj, "bj", "aj"): b2a,
+        }
+
+        # get minimum distances and associated nodes ids
+        (n1, n2, pos_i, pos_j) = min(lookup, key=lookup.get)
+        initial_dist = min(lookup.values())
+
+        # evaulate the cheapest cost
+        # if the lookup decides the 'right' node for ORIGIN and the
+        # 'right' distance is lower than the 'left' distance add the
+        #'right' distance to the initial distance
+        if pos_i == "ai":
+            initial_dist += ai_dist
+
+        # otherwise add the 'left' distance to the initial distance
+        else:
+            initial_dist += bi_dist
+
+        # if the lookup decides the 'right' node for DESTINATION and
+        # the 'right' distance is lower than the 'left' distance
+        # add the 'right' distance to the initial distance
+        if pos_j == "aj":
+            initial_dist += aj_dist
+
+        # otherwise add the left distance to the initial distance
+        else:
+            initial_dist += bj_dist
+
+    return initial_dist
+
+
+def _return_coords(xyid):
+    """Convert string (list) xyid into a tuple of (x,y) coordinates.
+
+    Parameters
+    ----------
+    xyid : str
+        String xy ID.
+
+    Returns
+    -------
+    coords : tuple
+        (x,y) coordinates.
+
+    """
+
+    # coerce the id into a plain string if in another text format
+    # and do literal evaluation to tease out ID from list (if list)
+    xyid = str(literal_eval(str(xyid))[0])
+
+    # characters to split by and ignore
+    chars = ["x", "y", ""]
+
+    # return numeric x and y coordinate split at 'x' and 'y'
+    coords = [float(c) for c in re.split("(x|y)", xyid) if c not in chars]
+    coords = tuple(coords)
+
+    return coords
+
+
+###############################################################################
+################ Shared memory functionality ##################################
+###############################################################################
+
+
+def _open_block(name):
+    """Attach to an existing shared memory block without tracking it for
+    clean up, which is left to the process that created the block."""
+
+    try:
+        block = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        block = shared_memory.SharedMemory(name=name)
+
+    return block
+
+
+class SharedArrays(object):
+    """Picklable handle to named arrays copied into ``multiprocessing``
+    shared memory blocks. Only the block names, shapes, and data types (and
+    ``attrs``) are pickled, so the handle is cheap to send to worker
+    processes, which ``attach()`` to the arrays without copying them. The
+    blocks are released by ``close()`` of the handle that created them, or
+    when leaving its ``with`` block.
+
+    Parameters
+    ----------
+    arrays : dict
+        Arrays by name.
+    attrs : dict
+        Additional (small) information sent along with the handle.
+        Default is ``None``.
+    readonly : bool
+        Attach to the arrays as read-only (``True``). Default is ``True``.
+
+    Examples
+    --------
+
+    >>> import numpy
+    >>> from tigernet.utils import SharedArrays
+    >>> with SharedArrays({"a": numpy.arange(3)}) as handle:
+    ...     handle.attach()["a"]
+    array([0, 1, 2])
+
+    """
+
+    def __init__(self, arrays, attrs=None, readonly=True):
+        self.attrs, self.readonly = dict(attrs or {}), readonly
+        self.specs, self._blocks, self._attached = {}, {}, None
+        self._owner = True
+        try:
+            for name, array in arrays.items():
+                array = numpy.ascontiguousarray(array)
+                size = max(array.nbytes, 1)
+                block = shared_memory.SharedMemory(create=True, size=size)
+                self._blocks[name] = block
+                shared = numpy.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+                shared[...] = array
+                self.specs[name] = (block.name, array.shape, array.dtype.str)
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def nbytes(self):
+        """The total size of the shared arrays in bytes."""
+
+        sizes = [
+            numpy.dtype(d).itemsize * math.prod(s) for _, s, d in self.specs.values()
+        ]
+
+        return sum(sizes)
+
+    def attach(self):
+        """Return the arrays by name (once attached, the same arrays are returned).
 
-    # update segm2node
-    net.segm2node = remove_adj(net.segm2node, restricted_segm_ids)
+        Returns
+        -------
+        arrays : dict
+            Arrays backed by the shared memory blocks.
 
-    # update segm2geom
-    net.segm2geom = remove_adj(net.segm2geom, restricted_segm_ids)
+        """
 
-    # remove restricted node ids from the node id list
-    unrestrict_node_ids = set()
-    for seg, nodes in list(net.segm2node.items()):
-        unrestrict_node_ids.update(nodes)
-    net.n_ids = sorted(list(unrestrict_node_ids))
+        if self._attached is None:
+            arrays = {}
+            for name, (block_name, shape, dtype) in self.specs.items():
+                block = self._blocks.get(name)
+                if block is None:
+                    block = self._blocks[name] = _open_block(block_name)
+                array = numpy.ndarray(shape, dtype=dtype, buffer=block.buf)
+                array.flags.writeable = not self.readonly
+                arrays[name] = array
+            self._attached = arrays
+
+        return self._attached
+
+    def close(self):
+        """Detach from the arrays, and release the shared memory blocks
+        when they were created by this handle."""
+
+        self._attached = None
+        for block in self._blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                # the arrays are still referenced, the block is
+                # unmapped once they are garbage collected
+                pass
+            if self._owner:
+                try:
+                    block.unlink()
+                except FileNotFoundError:
+                    pass
+        self._blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getstate__(self):
+        """Only the block names, shapes, and data types are pickled."""
+
+        state = self.__dict__.copy()
+        state.update({"_blocks": {}, "_attached": None, "_owner": False})
+
+        return state
+
+
+class SharedNetwork(SharedArrays):
+    """Picklable handle to a network in shared memory, which worker processes
+    ``attach()`` to as a read-only ``AttachedNetwork``. See ``share_network()``
+    and ``SharedArrays``.
+
+    Examples
+    --------
+
+    >>> import tigernet
+    >>> lat = tigernet.generate_lattice(n_hori_lines=1, n_vert_lines=1)
+    >>> net = tigernet.Network(s_data=lat)
+    >>> with net.share() as handle:
+    ...     handle.attach().node2segm[1]
+    [0, 1, 2, 3]
 
-    # record restricted nodes: these are nodes that fall ONLY on
-    # restricted segments (e.g. node incident with 2 restricted
-    # segments). Node that are incident with 1 restricted and 1
-    # unrestricted segment are NOT restricted but the node2segm
-    # adjacency for the restricted segment will be removed in below.
-    restricted_node_ids = [node for node in full_node_ids if node not in net.n_ids]
+    """
 
-    # update node2coords
-    net.node2coords = remove_adj(net.node2coords, restricted_node_ids)
+    def attach(self):
+        """Return the attached network (once attached, the same network is returned).
 
-    # update node2geom
-    net.node2geom = remove_adj(net.node2geom, restricted_node_ids)
+        Returns
+        -------
+        network : tigernet.utils.AttachedNetwork
+            The read-only network.
 
-    # update node2segm adjacency by removing restricted
-    # segments from nodes that are incident with both
-    # restricted and unrestricted segments
-    net.node2segm = _remove_segm_ids(net.node2segm, restricted_segm_ids)
+        """
 
-    return net
+        if self._attached is None:
+            arrays = SharedArrays.attach(self)
+            self._attached = AttachedNetwork(arrays, self.attrs)
 
+        return self._attached
 
-def get_obs2coords(obs):
-    """Create an observation to coordinate xwalk.
+
+class AttachedNetwork(object):
+    """Read-only network backed by the arrays of a ``SharedNetwork``. The
+    lookups used by searches, cost matrices, and snapping (``segm2node``,
+    ``node2segm``, ``segm2segm``, ``node2node``, ``segm2len``,
+    ``node2coords``, ``segm2coords``, ``segm2geom``, and ``node2geom``)
+    and the network cost matrix (``n2n_matrix``, when shared) are
+    available, so those functions are run on it unchanged.
 
     Parameters
     ----------
-    obs : tigernet.Observations
-
-    Returns
-    -------
-    o2c : dict
-        Observations to coordinates lookup.
+    arrays : dict
+        Shared arrays by name. See ``share_network()``.
+    attrs : dict
+        Network column names and the cost matrix storage.
 
     """
 
-    o2c = {
-        (ix, obs.df.loc[ix, obs.df_key]): (
-            obs.df.loc[ix, obs.geo_col].x,
-            obs.df.loc[ix, obs.geo_col].y,
-        )
-        for ix in obs.df.index
-    }
+    def __init__(self, arrays, attrs):
+        for name in ["sid_name", "nid_name", "geo_col", "len_col", "xyid"]:
+            setattr(self, name, attrs.get(name))
+        self._arrays = arrays
+        self._segm2geom, self._node2geom = None, None
+        self._adjacency, self._csr = None, None
+
+        # topology, coordinates, and lengths
+        if "segm_ids" in arrays:
+            store = AdjacencyStore.from_arrays(arrays)
+            set_topology(self, store)
+            self.s_ids, self.n_ids = store.segm_ids.tolist(), store.node_ids.tolist()
+            self.n_segm, self.n_node = len(self.s_ids), len(self.n_ids)
+            _segms, _nodes = store.segm_ids, store.node_ids
+            self.segm2len = ArrayLookup(_segms, values=arrays["segm_lengths"])
+            _coords = arrays["segm_coords"], arrays["segm_offsets"]
+            self.segm2coords = ArrayLookup(_segms, coords=_coords)
+            _coords = arrays["node_xy"], numpy.arange(_nodes.shape[0] + 1)
+            self.node2coords = ArrayLookup(_nodes, coords=_coords)
+
+        # network cost matrix
+        storage, shape = attrs.get("n2n_matrix"), attrs.get("n2n_shape")
+        if storage == "full":
+            self.n2n_matrix = arrays["n2n_matrix"]
+        elif storage == "triangular":
+            data = arrays["n2n_matrix"]
+            self.n2n_matrix = TriangularMatrix(shape[0], dtype=data.dtype, data=data)
+        elif storage == "sparse":
+            parts = [arrays["n2n_matrix_%s" % p] for p in ["data", "indices", "indptr"]]
+            self.n2n_matrix = scipy.sparse.csr_matrix(tuple(parts), shape=shape)
+
+    @property
+    def segm2geom(self):
+        """Segment ID to geometry lookup, created on first access."""
+
+        if self._segm2geom is None:
+            arrays = self._arrays
+            lines = _linestrings(arrays["segm_coords"], arrays["segm_offsets"])
+            lines = geopandas.GeoSeries(lines).values
+            self._segm2geom = ArrayLookup(self._topology.segm_ids, values=lines)
+
+        return self._segm2geom
+
+    @property
+    def node2geom(self):
+        """Node ID to geometry lookup, created on first access."""
+
+        if self._node2geom is None:
+            points = geopandas.points_from_xy(*self._arrays["node_xy"].T)
+            self._node2geom = ArrayLookup(self._topology.node_ids, values=points)
+
+        return self._node2geom
+
+
+def _matrix_arrays(mtx):
+    """Arrays and storage information of a network cost matrix."""
+
+    if isinstance(mtx, TriangularMatrix):
+        arrays, storage, shape = {"n2n_matrix": mtx.data}, "triangular", mtx.shape
+    elif scipy.sparse.issparse(mtx):
+        mtx = mtx.tocsr()
+        parts = ["data", "indices", "indptr"]
+        arrays = {"n2n_matrix_%s" % p: getattr(mtx, p) for p in parts}
+        storage, shape = "sparse", mtx.shape
+    else:
+        mtx = numpy.asarray(mtx)
+        arrays, storage, shape = {"n2n_matrix": mtx}, "full", mtx.shape
+    attrs = {"n2n_matrix": storage, "n2n_shape": shape}
 
-    return o2c
+    return arrays, attrs
 
 
-def snap_to_nearest(obs, net):
-    """Record the nearest network node then snap to either that
-    endpoint or the nearest line segment.
+def share_network(net, matrix=True):
+    """Copy the topology (see ``AdjacencyStore``), node and segment coordinates,
+    segment lengths, and (optionally) the cost matrix of a network into shared
+    memory for worker processes. See ``tigernet.Network.share()``.
 
     Parameters
     ----------
-    obs : tigernet.Observations
     net : tigernet.Network
+    matrix : bool
+        Share the network cost matrix (``n2n_matrix``), if calculated.
+        Default is ``True``.
 
     Returns
     -------
-    snp_pts_df : geopandas.GeoDataFrame
-        Dataframe of observations snapped to the network.
+    handle : tigernet.utils.SharedNetwork
+        Picklable handle to the shared network.
 
     """
 
-    def _get_k_nearest(obs, net):
-        """Record k nearest in the form: ``[[(idx, key), [dists, nodes], [segments]]]``.
+    # the underlying network of a restricted view
+    if isinstance(net, RestrictedNetwork):
+        net = net.network
 
-        Returns
-        -------
-        k_nearest : list
-            Information on the k-nearest neighbors.
+    store = topology(net)
+    segms, _, lengths = segment_arrays(net)
+    arrays = dict(store.arrays(), segm_lengths=lengths)
 
-        """
+    # node and (ragged) segment coordinates
+    nodes = store.node_ids.tolist()
+    node_xy = [net.node2coords[node][0] for node in nodes]
+    arrays["node_xy"] = numpy.array(node_xy, dtype=float).reshape(-1, 2)
+    segm_xy = [net.segm2coords[segm] for segm in segms.tolist()]
+    counts = numpy.array([len(xy) for xy in segm_xy], dtype=numpy.int64)
+    offsets = numpy.zeros(counts.shape[0] + 1, dtype=numpy.int64)
+    numpy.cumsum(counts, out=offsets[1:])
+    segm_xy = [xy for xys in segm_xy for xy in xys]
+    arrays["segm_coords"] = numpy.array(segm_xy, dtype=float).reshape(-1, 2)
+    arrays["segm_offsets"] = offsets
 
-        if obs.k > len(net.s_ids):
-            obs.k = len(net.s_ids)
+    names = ["sid_name", "nid_name", "geo_col", "len_col", "xyid"]
+    attrs = {name: getattr(net, name) for name in names}
 
-        k_nearest = []
+    mtx = getattr(net, "n2n_matrix", None)
+    if matrix and mtx is not None:
+        _arrays, _attrs = _matrix_arrays(mtx)
+        arrays.update(_arrays)
+        attrs.update(_attrs)
 
-        for (obidx, coords) in obs.obs2coords.items():
+    handle = SharedNetwork(arrays, attrs=attrs)
 
-            # query kdtree and return array-like list in the form:
-            # >>>    [[dist1, n1], [dist2, node2], ...[distn, noden]]
-            tree = numpy.array(obs.kd_tree.query(coords, k=obs.k)).T.tolist()
+    return handle
 
-            # convert id from float to int
-            tree = [[dist, net.n_ids[int(idx)]] for (dist, idx) in tree]
 
-            # get all segments associated with each k-nearest node
-            segms = [net.node2segm[idx] for (dist, idx) in tree]
-            segms = set([seg for segs in segms for seg in segs])
+# the handles attached to by a worker process (see ``_attach_worker()``)
+_WORKER_ATTACHED = []
 
-            # get node distances and nodes from tree query
-            nodes = [idx for (dist, idx) in tree]
-            node_dists = [dist for (dist, idx) in tree]
 
-            # append to nearest information list
-            k_nearest.append([obidx, [node_dists, nodes], segms])
+def _attach_worker(*handles):
+    """Attach a worker process to shared handles once, as the initializer
+    of a ``concurrent.futures.ProcessPoolExecutor``."""
 
-        return k_nearest
+    global _WORKER_ATTACHED
+    _WORKER_ATTACHED = [handle.attach() for handle in handles]
 
-    def _record_snapped_points(obs, net, kne):
-        """Find the nearest point along a line segment of the nearest
-        network node and records pertinent information.
 
-        Parameters
-        ----------
-        kne : list
-            Information on the k-nearest neighbors.
+def _run_attached(func, args):
+    """Call ``func`` with the attached handles of the worker process and ``args``."""
 
-        Returns
-        -------
-        snpts : dict
-            Information on the newly-snapped observations.
+    return func(*_WORKER_ATTACHED, *args)
 
-        """
 
-        def _unary2point(obs, net, sf, sgs, spinfo, opt):
-            """Find the nearest point along the lines of a unary union.
-
-            Parameters
-            ----------
-            sf : geopandas.GeoDataFrame
-                Network segments dataframe.
-            sgs : list
-                Unrestricted segment ids.
-            spinfo : dict
-                Snapped point information.
-            opt : shapely.geometry.Point
-                Original point geometry.
-
-            Returns
-            -------
-            spinfo : dict
-                Updated snapped point information.
-
-            """
-
-            # get line subset
-            segms_sub = sf[sf[obs.sid_name].isin(sgs)]
-            segms_uu = segms_sub.unary_union
-            near_points = []
-
-            segms_uu = sorted(segms_uu, key=lambda line: line.xy)
-
-            for line in segms_uu:
-                near_pt = line.interpolate(line.project(opt))
-                near_points.append(near_pt)
-
-            NEAREAST_POINT_DIST = numpy.inf
-            point = None
-            for near_p in near_points:
-                if near_p.distance(opt) < NEAREAST_POINT_DIST:
-                    NEAREAST_POINT_DIST = near_p.distance(opt)
-                    point = near_p
-
-            # get coords of new point
-            spinfo[obs.geo_col] = point
-
-            # tease out which exact segment
-            for ns in sgs:
-                if net.segm2geom[ns].intersects(point.buffer(obs.tol)):
-                    spinfo["assoc_segm"] = ns
-                    break
-            return spinfo
+def _shared_pool(handles, n_jobs):
+    """A pool of ``n_jobs`` worker processes attached to the shared ``handles``."""
 
-        # snapped points dictionary
-        snpts = {}
+    kws = {"max_workers": n_jobs, "initializer": _attach_worker}
+    pool = concurrent.futures.ProcessPoolExecutor(initargs=tuple(handles), **kws)
 
-        for (idx, key), (dists, nodes), (segms) in kne:
+    return pool
 
-            spinfo = {obs.df_key: key}
-            if obs.snap_to == "segments":
 
-                # original point geometry
-                opt = obs.df[obs.geo_col][idx]
-                spinfo = _unary2point(obs, net, sframe, segms, spinfo, opt)
+def _pool_map(pool, func, tasks):
+    """Call ``func(*attached, *task)`` for each of ``tasks`` in the worker
+    processes of a ``_shared_pool()``, returning the results in order."""
 
-                # associated segment
-                asc_seg = spinfo["assoc_segm"]
+    return list(pool.map(_run_attached, [func] * len(tasks), tasks))
 
-                # snapped point geometry
-                snp = spinfo[obs.geo_col]
-                line_length = net.segm2len[asc_seg]
 
-                # line segment geometry
-                asc_seg_geom = net.segm2geom[asc_seg]
+def _shared_map(func, tasks, handles, n_jobs):
+    """Call ``func(*attached, *task)`` for each of ``tasks`` in ``n_jobs``
+    worker processes attached to the shared ``handles``.
 
-                # endpoint of the associated line segment
-                line_ep1 = net.segm2node[asc_seg][0]
-                line_ep2 = net.segm2node[asc_seg][1]
+    Returns
+    -------
+    results : list
+        The result of each task (in the order of ``tasks``).
 
-                # line segment endpoint 1 geometry
-                line_ep1_geom = net.node2geom[line_ep1]
+    """
 
-                # set line endpoints 1 and 2 as node a and node b
-                # node a is determined as being 0.0 distance from the
-                # projected distance along the line segment
-                if asc_seg_geom.project(line_ep1_geom) == 0.0:
-                    node_a = line_ep1
-                    node_b = line_ep2
-                else:
-                    node_a = line_ep2
-                    node_b = line_ep1
-
-                # node a information ----------------------------------
-                #       * node a is the point which shapely chooses as
-                #         the base from which calculation occurs
-                #         for 'project' distance.
-                #       * node a is generally the 'smaller' of the
-                #         the two line segment endpoint in
-                #         euclidean space
-                dist_a = asc_seg_geom.project(snp)
-                spinfo["dist_a"] = dist_a
-                spinfo["node_a"] = node_a
-                # node b information ----------------------------------
-                dist_b = line_length - dist_a
-                spinfo["dist_b"] = dist_b
-                spinfo["node_b"] = node_b
-                spinfo["dist2line"] = snp.distance(opt)
-
-            # just to the nearest network vertex
-            # does not currently stipulate tha ti has to be the
-            # nearest vertex on the nearest line
-            # can add in functionality later
-            if obs.snap_to == "nodes":
-                nearest_node, nearest_dist = nodes[0], dists[0]
-                spinfo["assoc_node"] = nearest_node
-                spinfo["dist2node"] = nearest_dist
-                spinfo[net.geo_col] = net.node2geom[nearest_node]
-
-            # add to dictionary
-            snpts[idx] = spinfo
-
-        return snpts
-
-    sframe = net.s_data
+    with _shared_pool(handles, n_jobs) as pool:
+        results = _pool_map(pool, func, tasks)
 
-    k_near_elems = _get_k_nearest(obs, net)
+    return results
 
-    # snap points
-    snapped_pts = _record_snapped_points(obs, net, k_near_elems)
 
-    # make columns headers based on snap method
-    if obs.snap_to == "segments":
-        cols = [
-            obs.df_key,
-            "assoc_segm",
-            "dist2line",
-            "dist_a",
-            "node_a",
-            "dist_b",
-            "node_b",
-            obs.geo_col,
-        ]
+def _n_jobs(n_jobs, n_tasks):
+    """The number of worker processes (``None`` for all CPUs) for ``n_tasks``."""
 
-    if obs.snap_to == "nodes":
-        cols = [obs.df_key, "assoc_node", "dist2node", obs.geo_col]
+    return min(n_jobs or os.cpu_count() or 1, n_tasks)
 
-    # create dataframe
-    snp_pts_df = fill_frame(obs.df, snapped_pts, full=True, col=cols)
 
-    # add xyid
-    node2xyid = generate_xyid(df=snp_pts_df, geom_type="node", geo_col=obs.geo_col)
-    snp_pts_df = fill_frame(snp_pts_df, node2xyid, idx="index", col=obs.xyid)
+def _split(items, n):
+    """Split ``items`` into (at most) ``n`` non-empty contiguous lists."""
 
-    return snp_pts_df
+    splits = numpy.array_split(numpy.arange(len(items)), n)
+    splits = [[items[i] for i in split] for split in splits if split.size]
 
+    return splits
 
-def obs2obs_costs(
-    orig,
-    dest,
-    symmetric,
-    network_matrix,
-    from_nodes,
-    snap_dist,
-    assoc_col,
-    dist_type,
-    xyid,
-    numeric_cols,
-):
-    """Internal function to calculate a cost matrix
-    from (n) observations to (m) observations.
+
+###############################################################################
+################ Build profiling functionality ################################
+###############################################################################
+
+
+class BuildProfile(object):
+    """Record the wall time, CPU time, peak traced memory, and element counts
+    of (nested) build stages. Memory is traced with ``tracemalloc``, which is
+    started for the outermost stage when it is not already running, so
+    profiled builds are slower than unprofiled ones.
 
     Parameters
     ----------
-    orig : geopandas.GeoDataFrame
-        Origin observations.
-    dest : geopandas.GeoDataFrame
-        Destination observations.
-    symmetric : bool
-        Calculate an observation nXn cost matrix.
-    network_matrix : numpy.ndarray
-        'nXn' network nodes cost matrix.
-    from_nodes : bool
-        Calculate cost matrix from network nodes only.
-    snap_dist : str
-        Column name to use for distance to observation from the network.
-    assoc_col : str
-        Column name for network geometry snapping.
-    dist_type : str
-        Type of distance cost matrix.
-        Options are 'network_pp2n' and 'euclidean'. Default is None.
-    xyid : str
-        String xyID column name
-    numeric_cols : list
-        Columns to preprocess to ensure numeric values.
+    hook : callable
+        Called with the record of each stage, a ``dict`` keyed by
+        ``BuildProfile.columns``, once the stage completes. Default is ``None``.
 
-    Returns
-    -------
-    n2m_matrix : numpy.ndarray
-        'nXm' cost matrix.
+    Attributes
+    ----------
+    records : list
+        Stage records in the order the stages started.
+
+    Examples
+    --------
+
+    >>> import tigernet
+    >>> lat = tigernet.generate_lattice(n_hori_lines=1, n_vert_lines=1)
+    >>> net = tigernet.Network(s_data=lat, profile=True)
+    >>> list(net.build_profile["stage"])[:2]
+    ['build_network', 'build_network.build_base']
 
     """
 
-    def _ensure_numeric(o, d, cols):
-        """Make sure dataframe columns are in proper numeric format.
+    columns = [
+        "stage",
+        "depth",
+        "wall_time",
+        "cpu_time",
+        "peak_memory",
+        "n_segm",
+        "n_node",
+        "n_obs",
+    ]
+
+    def __init__(self, hook=None):
+        self.hook = hook
+        self.records = []
+        self._stack = []
+        self._tracing = False
+
+    def _reset_peak(self):
+        """Reset the peak traced memory. ``tracemalloc.reset_peak()`` is new in
+        Python 3.9, before which tracing (when started by the profile) is
+        restarted instead, forgetting the memory blocks traced so far. When
+        tracing was started elsewhere the peak is not reset, so the peak
+        memory of a stage is an upper bound."""
+
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        elif self._tracing:
+            tracemalloc.stop()
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name, obj=None):
+        """Profile the enclosed block as a stage, nested in any open stage.
 
         Parameters
         ----------
-        o : geopandas.GeoDataFrame
-            Origin observations.
-        d : geopandas.GeoDataFrame
-            Destination observations.
-        cols : list
-            Columns to preprocess to ensure numeric values.
-
-        Returns
-        -------
-        o : geopandas.GeoDataFrame
-            Origin observations.
-        d : geopandas.GeoDataFrame
-            Destination observations.
+        name : str
+            Stage name. Nested stages are recorded as ``'parent.name'``.
+        obj : {tigernet.Network, tigernet.Observations}
+            Object to count elements of (``n_segm``, ``n_node``, and the
+            number of snapped observations) when the stage completes.
+            Default is ``None``.
 
         """
 
-        # having trouble keeping the integers and floats in numeric form
-        types = [int, float, numpy.int64, numpy.float64]
+        if not self._stack and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+        # hand the peak so far to the enclosing stage before resetting it
+        if self._stack:
+            parent = self._stack[-1]
+            parent["peak"] = max(parent["peak"], tracemalloc.get_traced_memory()[1])
+        self._reset_peak()
+
+        if self._stack:
+            name = "%s.%s" % (self._stack[-1]["record"]["stage"], name)
+        record = dict.fromkeys(self.columns)
+        record.update({"stage": name, "depth": len(self._stack)})
+        self.records.append(record)
+        frame = {
+            "record": record,
+            "peak": 0,
+            "memory": tracemalloc.get_traced_memory()[0],
+        }
+        self._stack.append(frame)
+        wall, cpu = time.perf_counter(), time.process_time()
 
-        for col in cols:
+        try:
+            yield record
+        finally:
+            record["wall_time"] = time.perf_counter() - wall
+            record["cpu_time"] = time.process_time() - cpu
+            peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            record["peak_memory"] = max(peak - frame["memory"], 0)
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            elif self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+
+            if obj is not None:
+                record["n_segm"] = getattr(obj, "n_segm", None)
+                record["n_node"] = getattr(obj, "n_node", None)
+                snapped = getattr(obj, "snapped_points", None)
+                record["n_obs"] = None if snapped is None else snapped.shape[0]
+
+            if self.hook is not None:
+                self.hook(record)
+
+    def frame(self):
+        """Stage records as a ``pandas.DataFrame``."""
+        return pandas.DataFrame(self.records, columns=self.columns)
+
+    def __getstate__(self):
+        """Drop the hook, which may not be picklable, and any open stages."""
+        state = self.__dict__.copy()
+        state.update({"hook": None, "_stack": [], "_tracing": False})
+        return state
+
+    def __deepcopy__(self, memo):
+        """Copy the records but keep the same hook (e.g. for simplified networks)."""
+        profile = BuildProfile(hook=self.hook)
+        profile.records = copy.deepcopy(self.records, memo)
+        return profile
+
+
+def profile_stage(obj, name):
+    """Profile a stage of ``obj`` if it was created with ``profile`` set,
+    otherwise do nothing. See ``BuildProfile.stage()``.
 
-            if type(o[col][0]) not in types:
-                o[col] = o[col].apply(lambda x: literal_eval(x))
+    Parameters
+    ----------
+    obj : {tigernet.Network, tigernet.Observations}
+        Object being built.
+    name : str
+        Stage name.
 
-            if type(d[col][0]) not in types:
-                d[col] = d[col].apply(lambda x: literal_eval(x))
+    Returns
+    -------
+    context : contextlib.AbstractContextManager
+        Stage context.
 
-        return o, d
+    """
 
-    def _dist_calc(
-        o, i, isg, d, j, jsg, matrix, na="node_a", nb="node_b", da="dist_a", db="dist_b"
-    ):
-        """Get the cheapest cost route from snapped pt1 to snapped pt 2
+    profiler = getattr(obj, "_profiler", None)
+    if profiler is None:
+        return contextlib.nullcontext()
 
-        Parameters
-        ----------
-        o : geopandas.GeoDataFrame
-            Origin observations.
-        i : int
-            Origin index.
-        isg : int
-            Segment associated with i.
-        d : geopandas.GeoDataFrame
-            Destination observations.
-        j : int
-            Destination index.
-        jsg : int
-            Segment associated with j.
-        matrix : numpy.ndarray
-            All node-to-all node network cost matrix.
-        na : str
-            Right node label (may actually be to the visual left).
-            Default is ``'R_node'``.
-        nb : str
-            left node label (may actually be to the visual right).
-            Default is ``'L_node'``.
-        da : str
-            Distance label to ``'rn'``. Default is ``'R_dist'``.
-        db : str
-            Distance label to ``'ln'``. Default is ``'L_dist'``.
+    return profiler.stage(name, obj=obj)
 
-        Returns
-        -------
-        initial_dist : float or int
-            Distance from snapped point to snapped point.
 
-        """
+###############################################################################
+################ Build cache functionality ####################################
+###############################################################################
 
-        # get node indices
-        ai, bi = o[na][i], o[nb][i]
-        aj, bj = d[na][j], d[nb][j]
+# bump when the layout of a pickled ``Network`` changes
+CACHE_FORMAT = 4
 
-        # origin right and left distance
-        ai_dist, bi_dist = o[da][i], o[db][i]
 
-        # destination right and left distance
-        aj_dist, bj_dist = d[da][j], d[db][j]
+def hash_input(s_data, params, geo_col=None):
+    """Create a content-addressed key from the input segment geometries,
+    attribute columns, and ``Network`` constructor parameters.
 
-        # if observation nodes are snapped to the same segment
-        if (ai, bi) == (aj, bj) and isg == jsg:
+    Parameters
+    ----------
+    s_data : geopandas.GeoDataFrame
+        Segments dataframe.
+    params : dict
+        Constructor parameters in the form ``{parameter: value}``.
+    geo_col : str
+        Geometry column name. Default is ``None``.
 
-            # if the ORIGIN 'right' distance is greater than
-            # (or equal to) the DESTINATION 'right' distance then
-            # subtract the DESTINATION from the ORIGIN distance...
-            if ai_dist >= aj_dist:
-                initial_dist = ai_dist - aj_dist
+    Returns
+    -------
+    key : str
+        Hexadecimal SHA-256 digest.
 
-            # ... otherwise subtract the 'right' ORIGIN from
-            # the DESTINATION distance
-            else:
-                initial_dist = aj_dist - ai_dist
+    """
 
-        # observation nodes are snapped to different segments
-        else:
-            # get all combinations of potential distance
-            a2a = matrix[ai, aj]
-            a2b = matrix[ai, bj]
-            b2b = matrix[bi, bj]
-            b2a = matrix[bi, aj]
-
-            # create distance lookup dictionary
-            lookup = {
-                (ai, aj, "ai", "aj"): a2a,
-                (ai, bj, "ai", "bj"): a2b,
-                (bi, bj, "bi", "bj"): b2b,
-                (bi, aj, "bj", "aj"): b2a,
-            }
-
-            # get minimum distances and associated nodes ids
-            (n1, n2, pos_i, pos_j) = min(lookup, key=lookup.get)
-            initial_dist = min(lookup.values())
-
-            # evaulate the cheapest cost
-            # if the lookup decides the 'right' node for ORIGIN and the
-            # 'right' distance is lower than the 'left' distance add the
-            #'right' distance to the initial distance
-            if pos_i == "ai":
-                initial_dist += ai_dist
-
-            # otherwise add the 'left' distance to the initial distance
-            else:
-                initial_dist += bi_dist
+    h = hashlib.sha256()
+    h.update(("format%s" % CACHE_FORMAT).encode())
 
-            # if the lookup decides the 'right' node for DESTINATION and
-            # the 'right' distance is lower than the 'left' distance
-            # add the 'right' distance to the initial distance
-            if pos_j == "aj":
-                initial_dist += aj_dist
+    # constructor parameters
+    h.update(repr(sorted(params.items())).encode())
 
-            # otherwise add the left distance to the initial distance
-            else:
-                initial_dist += bj_dist
+    # coordinate reference system & column layout
+    h.update(str(s_data.crs).encode())
+    h.update(repr(list(s_data.columns)).encode())
 
-        return initial_dist
+    # geometries
+    for geom in s_data[geo_col]:
+        h.update(geom.wkb)
 
-    def _return_coords(xyid):
-        """Convert string (list) xyid into a tuple of (x,y) coordinates.
+    # attributes
+    attrs = s_data.drop(columns=geo_col)
+    try:
+        attr_hash = pandas.util.hash_pandas_object(attrs, index=True)
+    except TypeError:
+        # unhashable cell values (e.g. lists)
+        attr_hash = pandas.util.hash_pandas_object(attrs.astype(str), index=True)
+    h.update(attr_hash.values.tobytes())
 
-        Parameters
-        ----------
-        xyid : str
-            String xy ID.
+    key = h.hexdigest()
 
-        Returns
-        -------
-        coords : tuple
-            (x,y) coordinates.
+    return key
 
-        """
 
-        # coerce the id into a plain string if in another text format
-        # and do literal evaluation to tease out ID from list (if list)
-        xyid = str(literal_eval(str(xyid))[0])
+def hash_network(net):
+    """Create a key from the network topology and segment lengths.
+
+    Parameters
+    ----------
+    net : tigernet.Network
+
+    Returns
+    -------
+    key : str
+        Hexadecimal SHA-256 digest.
+
+    """
 
-        # characters to split by and ignore
-        chars = ["x", "y", ""]
+    h = hashlib.sha256()
+    h.update(("format%s" % CACHE_FORMAT).encode())
+    h.update(repr(net.n_ids).encode())
+    topo = [(k, v, net.segm2len[k]) for k, v in net.segm2node.items()]
+    h.update(repr(topo).encode())
 
-        # return numeric x and y coordinate split at 'x' and 'y'
-        coords = [float(c) for c in re.split("(x|y)", xyid) if c not in chars]
-        coords = tuple(coords)
+    key = h.hexdigest()
 
-        return coords
+    return key
 
-    # set matrix style
-    if symmetric:
-        dest = copy.deepcopy(orig)
 
-    # instantiate empty matrix
-    n2m_matrix = numpy.zeros((orig.shape[0], dest.shape[0]))
+def _cache_path(cache_dir, key, kind):
+    """Path of a cache entry."""
+    return os.path.join(cache_dir, "%s.%s.pkl" % (key, kind))
 
-    # Euclidean observation nodes distance matrix
-    if dist_type == "euclidean":
-        for ix in orig.index:
-            for jx in dest.index:
-                i, j = orig[xyid][ix], dest[xyid][jx]
-                if i == j and ix == jx:
-                    euc_dist = 0.0
-                else:
-                    p1, p2 = _return_coords(i), _return_coords(j)
-                    euc_dist = _euc_dist(p1, p2)
-                    if snap_dist:
-                        orig_snap = orig[snap_dist][ix]
-                        dest_snap = dest[snap_dist][jx]
-                        dist_snap = orig_snap + dest_snap
-                        euc_dist += dist_snap
-                n2m_matrix[ix, jx] = euc_dist
-
-    # network-style cost matrices
-    else:
 
-        # make sure node indices and distances are set to
-        # numeric values in dataframe columns
-        orig, dest = _ensure_numeric(orig, dest, numeric_cols)
+def read_cache(cache_dir, key, kind="network"):
+    """Load an entry from the cache and mark it as recently used.
 
-        # Network (from 'network nodes') distance matrix
-        if from_nodes:
+    Parameters
+    ----------
+    cache_dir : str
+        Cache directory.
+    key : str
+        Entry key.
+    kind : str
+        Entry type. Either ``'network'`` or ``'cost_matrix'``.
+        Default is ``'network'``.
+
+    Returns
+    -------
+    obj : {None, object}
+        The cached object or ``None`` if there is no (readable) entry.
+
+    """
 
-            for i in orig.index:
+    path = _cache_path(cache_dir, key, kind)
+    if not os.path.exists(path):
+        return None
 
-                for j in dest.index:
+    try:
+        with open(path, "rb") as f:
+            obj = pickle.load(f)
+    except (EOFError, pickle.UnpicklingError):
+        # corrupt or partially written entry
+        return None
 
-                    # if i and j are the same observation
-                    # there is no distance
-                    if i == j and symmetric:
-                        n2m_matrix[i, j] = 0.0
+    # refresh the modification time for LRU eviction
+    os.utime(path, None)
 
-                    else:
-                        I = orig.loc[i, assoc_col]  # i network node ID
-                        J = dest.loc[j, assoc_col]  # j network node ID
-                        # network i to j dist
-                        net_dist = network_matrix[I, J]
+    return obj
 
-                        # add in distance from observation to network
-                        if snap_dist:
-                            # snapped i dist
-                            from_i = orig[snap_dist][i]
-                            # snapped j dist
-                            from_j = dest[snap_dist][j]
-                            net_dist = from_i + from_j + net_dist
 
-                        n2m_matrix[i, j] = net_dist
+def write_cache(obj, cache_dir, key, kind="network", cache_size=None):
+    """Write an entry to the cache and evict old entries if needed.
 
-        # Network (from snapped point) distance matrix
-        else:
+    Parameters
+    ----------
+    obj : object
+        Picklable object to store.
+    cache_dir : str
+        Cache directory.
+    key : str
+        Entry key.
+    kind : str
+        Entry type. Either ``'network'`` or ``'cost_matrix'``.
+        Default is ``'network'``.
+    cache_size : int
+        Maximum size of the cache directory in bytes. Default is ``None``,
+        in which case entries are never evicted.
 
-            # complete distance
-            # start p1 --> snap point --> nearest node -->
-            # furtherst(closest) node --> snap point --> goal p2
-            for i in orig.index:
+    """
 
-                for j in dest.index:
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(cache_dir, key, kind)
 
-                    # if i and j are the same observation
-                    # there is no distance
-                    if i == j and symmetric:
-                        n2m_matrix[i, j] = 0.0
+    # write to a temporary file first so readers never see partial entries
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
 
-                    else:
-                        # network segments associated with i and j
-                        isegm, jsegm = orig[assoc_col][i], dest[assoc_col][j]
+    if cache_size is not None:
+        evict_cache(cache_dir, cache_size, keep=path)
 
-                        # calculate network distance from i to j
-                        network_dist = _dist_calc(
-                            orig, i, isegm, dest, j, jsegm, network_matrix
-                        )
-                        # add in distance from observation to network
-                        if snap_dist:
-                            orig_snap = orig[snap_dist][i]
-                            dest_snap = dest[snap_dist][j]
-                            dist_snap = orig_snap + dest_snap
-                            network_dist += dist_snap
 
-                        n2m_matrix[i, j] = network_dist
+def evict_cache(cache_dir, cache_size, keep=None):
+    """Remove least recently used entries until the
+    cache directory is no larger than ``cache_size``.
 
-    return n2m_matrix
+    Parameters
+    ----------
+    cache_dir : str
+        Cache directory.
+    cache_size : int
+        Maximum size of the cache directory in bytes.
+    keep : str
+        Path of an entry that is never evicted. Default is ``None``.
+
+    """
+
+    entries = []
+    for fname in os.listdir(cache_dir):
+        if not fname.endswith(".pkl"):
+            continue
+        path = os.path.join(cache_dir, fname)
+        stat = os.stat(path)
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    # oldest first
+    entries.sort()
+    total_size = sum([size for (mtime, size, path) in entries])
+    for mtime, size, path in entries:
+        if total_size <= cache_size:
+            break
+        if path == keep:
+            continue
+        os.remove(path)
+        total_size -= size